@@ -19,3 +19,25 @@ from TG.metaObserving import MetaObservableType, OBFactoryMap
 class DataHostObject(object):
     __metaclass__ = MetaObservableType
 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MetaSlotDataHostType(MetaObservableType):
+    """Adds a __slots__ entry for each data property declared in the class body"""
+    def __new__(mklass, name, bases, ns):
+        slots = list(ns.get('__slots__', ()))
+        for key, value in ns.items():
+            slotNameFor = getattr(value, 'slotNameFor', None)
+            if slotNameFor is not None and not isinstance(value, type):
+                slots.append(slotNameFor(key))
+        ns['__slots__'] = tuple(slots)
+        return MetaObservableType.__new__(mklass, name, bases, ns)
+
+class SlotDataHostObject(object):
+    """DataHostObject without a per-instance __dict__
+
+    Subclasses declare their plain attributes in __slots__; storage for data
+    properties is added automatically.
+    """
+    __metaclass__ = MetaSlotDataHostType
+    __slots__ = ('__weakref__',)
+
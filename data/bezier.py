@@ -11,13 +11,73 @@
 #~ Imports 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+from collections import OrderedDict
+
 import numpy
-from numpy import ndarray, array, vander, dot
+from numpy import ndarray, array, asarray, vander, dot
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+class LRUCache(object):
+    """Dictionary holding at most maxSize entries, discarding the least recently used"""
+    def __init__(self, maxSize=64):
+        self.maxSize = maxSize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        entries = self._entries
+        value = entries.pop(key, self)
+        if value is self:
+            return default
+        entries[key] = value
+        return value
+    def __setitem__(self, key, value):
+        entries = self._entries
+        entries.pop(key, None)
+        entries[key] = value
+        while len(entries) > self.maxSize:
+            entries.popitem(False)
+
+    def clear(self):
+        self._entries.clear()
+
+def uKey(u):
+    """Returns a hashable key for a parameter sample set"""
+    return (u.shape, u.dtype.char, u.tostring())
+
+def asUSamples(u):
+    u = asarray(u, float)
+    if u.ndim == 0:
+        u = u[None]
+    return u
+
+# sample sets smaller than this are rebuilt on every call; keying and
+# storing them costs more than vander saves when u changes every frame
+uCacheMinSize = 8
+
+vanderCache = LRUCache(256)
+def vanderFor(u, n):
+    """Returns the vander(u, n) matrix, cached read-only per (n, u) for larger sample sets"""
+    u = asUSamples(u)
+    if u.size < uCacheMinSize:
+        return vander(u, n)
+    key = (n, uKey(u))
+    uM = vanderCache.get(key)
+    if uM is None:
+        uM = vander(u, n)
+        uM.flags.writeable = False
+        vanderCache[key] = uM
+    return uM
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
 class Bezier(ndarray):
     __array_priority__ = -1
 
@@ -34,7 +94,7 @@ class Bezier(ndarray):
         if isinstance(pts, list):
             pts = numpy.asarray(pts)
         Bp = dot(self, pts)
-        uM = vander(u, len(self))
+        uM = vanderFor(u, len(self))
         return dot(uM, Bp)
     __call__ = at
 
@@ -47,7 +107,7 @@ class Bezier(ndarray):
     dot = atP
 
     def atU(self, u):
-        uM = vander(u, len(self))
+        uM = vanderFor(u, len(self))
         uB = dot(uM, self)
         return uB.view(UBezier)
 
@@ -66,9 +126,7 @@ class BezierP(ndarray):
     __array_priority__ = -1
 
     def atU(self, u):
-        try: uM = vander(u, len(self))
-        except TypeError:
-            uM = vander([u], len(self))
+        uM = vanderFor(u, len(self))
         return dot(uM, self)
     __call__ = at = atU
 
@@ -113,6 +171,256 @@ groups = {
     '~slow': bCubic.atP([1., 1., 1., 0.]),
     }
 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Batched curve evaluation
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+basisCache = LRUCache(256)
+def basisFor(order, u):
+    """Returns the (len(u), order+1) matrix of Bernstein weights at u, cached read-only per (order, u)
+
+    Rows sum to one; basisFor(order, u).dot(cpts) evaluates a curve with
+    (order+1, dim) control points at every u.  Like vanderFor, sample sets
+    smaller than uCacheMinSize are not cached.
+    """
+    u = asUSamples(u)
+    if u.size < uCacheMinSize:
+        return dot(vander(u, order+1), Bezier.order[order])
+    key = (order, uKey(u))
+    uB = basisCache.get(key)
+    if uB is None:
+        uB = dot(vanderFor(u, order+1), Bezier.order[order])
+        uB.flags.writeable = False
+        basisCache[key] = uB
+    return uB
+
+def evalCurves(cpts, u, out=None):
+    """Evaluates K curves of (K, order+1, dim) control points at u, returning (K, len(u), dim)
+
+    u is one sample set shared by all curves; the basis for it comes from
+    basisFor, so repeated calls with the same u skip building it.
+    """
+    cpts = asarray(cpts)
+    uB = basisFor(cpts.shape[-2]-1, u)
+    return numpy.matmul(uB, cpts, out)
+
+def evalCurvesPerU(cpts, u, out=None):
+    """Evaluates curve k of (K, order+1, dim) control points at its own samples u[k] of a (K, n) array"""
+    cpts = asarray(cpts)
+    u = asarray(u, float)
+    order = cpts.shape[-2]-1
+    uPow = u[..., None] ** numpy.arange(order, -1, -1)
+    uB = dot(uPow, Bezier.order[order])
+    return numpy.matmul(uB, cpts, out)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Adaptive flattening
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def splitCurves(cpts, t=.5):
+    """Splits (M, order+1, dim) curves at t by de Casteljau; returns (left, right) control points"""
+    cpts = asarray(cpts)
+    left = [cpts[:, 0]]; right = [cpts[:, -1]]
+    pts = cpts
+    while pts.shape[1] > 1:
+        pts = pts[:, :-1] + t*(pts[:, 1:] - pts[:, :-1])
+        left.append(pts[:, 0]); right.append(pts[:, -1])
+    right.reverse()
+    return numpy.stack(left, 1), numpy.stack(right, 1)
+
+def curveFlatness(cpts):
+    """Returns an (M,) bound on how far each curve strays from its chord
+
+    The curve minus the evenly parameterized chord is itself a Bezier
+    curve, so the largest control point offset from the chord bounds it.
+    """
+    cpts = asarray(cpts)
+    n = cpts.shape[1]-1
+    w = numpy.linspace(0, 1, n+1)[None, :, None]
+    chord = cpts[:, :1] + w*(cpts[:, -1:] - cpts[:, :1])
+    offsets = cpts - chord
+    return numpy.sqrt((offsets*offsets).sum(-1).max(-1))
+
+def flattenCurves(cpts, tolerance=.25, maxDepth=16, out=None):
+    """Flattens (K, order+1, dim) curves to polylines within tolerance of the curves
+
+    Returns (vertices, offsets): the polyline of curve k is
+    vertices[offsets[k]:offsets[k+1]], including both end points.  Curves
+    are subdivided at u=.5 only where they are not yet flat, so straight
+    spans get a single segment and tight turns get many.  When out is
+    given, vertices are written into it and a view of the used rows is
+    returned; ValueError is raised if out is too small.
+    """
+    cpts = asarray(cpts, float)
+    K = len(cpts); dim = cpts.shape[-1]
+    if not K:
+        return numpy.zeros((0, dim)), numpy.zeros(1, int)
+
+    segs = cpts; curveIdx = numpy.arange(K); u0 = numpy.zeros(K)
+    du = 1.
+    doneIdx = []; doneU = []; donePts = []
+    for depth in xrange(maxDepth+1):
+        if not len(segs):
+            break
+        if depth < maxDepth:
+            flat = curveFlatness(segs) <= tolerance
+        else: flat = numpy.ones(len(segs), bool)
+
+        doneIdx.append(curveIdx[flat]); doneU.append(u0[flat]); donePts.append(segs[flat, 0])
+
+        split = ~flat
+        segs = segs[split]; curveIdx = curveIdx[split]; u0 = u0[split]
+        if len(segs):
+            du *= .5
+            left, right = splitCurves(segs)
+            segs = numpy.concatenate([left, right])
+            curveIdx = numpy.concatenate([curveIdx, curveIdx])
+            u0 = numpy.concatenate([u0, u0 + du])
+
+    curveIdx = numpy.concatenate(doneIdx)
+    u0 = numpy.concatenate(doneU)
+    startPts = numpy.concatenate(donePts)
+
+    order = numpy.lexsort((u0, curveIdx))
+    curveIdx = curveIdx[order]; startPts = startPts[order]
+
+    counts = numpy.bincount(curveIdx, minlength=K) + 1
+    offsets = numpy.zeros(K+1, int)
+    numpy.cumsum(counts, out=offsets[1:])
+    total = offsets[-1]
+
+    if out is None:
+        out = numpy.empty((total, dim), cpts.dtype)
+    elif len(out) < total:
+        raise ValueError("Vertex buffer too small: %d vertices required, %d available" % (total, len(out)))
+    vertices = out[:total]
+
+    rank = numpy.arange(len(curveIdx)) - numpy.searchsorted(curveIdx, curveIdx)
+    vertices[offsets[curveIdx] + rank] = startPts
+    vertices[offsets[1:]-1] = cpts[:, -1]
+    return vertices, offsets
+
+def flattenCurve(cpts, tolerance=.25, maxDepth=16):
+    """Returns the (n, dim) polyline of one curve of (order+1, dim) control points"""
+    vertices, offsets = flattenCurves(asarray(cpts)[None], tolerance, maxDepth)
+    return vertices
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Arc length parameterization
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ArcLengthTable(object):
+    """Lookup table between u and arc length for one curve, or a batch of K curves
+
+    Built from resolution+1 evenly spaced samples of the curve; lengths
+    between samples are chord lengths and lookups interpolate linearly, so
+    the error falls with the square of the resolution.  Arc lengths passed
+    to and returned from uAt, sAt and atS are fractions of the total length
+    unless normalized is False.
+    """
+    def __init__(self, cpts, resolution=256):
+        cpts = asarray(cpts, float)
+        self.cpts = cpts
+        self.resolution = resolution
+        self.u = numpy.linspace(0., 1., resolution+1)
+
+        pts = evalCurves(cpts, self.u)
+        seg = numpy.diff(pts, axis=-2)
+        seg = numpy.sqrt((seg*seg).sum(-1))
+        s = numpy.zeros(pts.shape[:-1])
+        numpy.cumsum(seg, -1, out=s[..., 1:])
+        self.s = s
+        self.length = s[..., -1]
+
+        length = numpy.asarray(self.length)[..., None]
+        # a zero length curve keeps its u parameterization
+        self.sNorm = numpy.where(length > 0, s / numpy.where(length > 0, length, 1.), self.u)
+
+        if self.isBatch():
+            # offset each curve's table so one interp covers the whole batch
+            rowOffset = 2.*numpy.arange(len(cpts))
+            self._rowOffset = rowOffset
+            self._sOffset = (self.sNorm + rowOffset[:, None]).ravel()
+            self._uOffset = (self.u + rowOffset[:, None]).ravel()
+            self._uTiled = numpy.tile(self.u, len(cpts))
+
+    def isBatch(self):
+        return self.cpts.ndim == 3
+
+    def __len__(self):
+        return len(self.cpts) if self.isBatch() else 1
+
+    def _asFraction(self, s, normalized):
+        s = asarray(s, float)
+        if not normalized:
+            length = numpy.asarray(self.length)
+            if self.isBatch():
+                length = length.reshape(length.shape + (1,)*(s.ndim-1))
+            s = s / numpy.where(length > 0, length, 1.)
+        return s.clip(0., 1.)
+
+    def uAt(self, s, normalized=True):
+        """Returns u at arc length s
+
+        For a batch, s is (K,) or (K, n) with a row per curve.
+        """
+        s = self._asFraction(s, normalized)
+        if not self.isBatch():
+            return numpy.interp(s, self.sNorm, self.u)
+
+        rowOffset = self._rowOffset.reshape((-1,) + (1,)*(s.ndim-1))
+        return numpy.interp(s + rowOffset, self._sOffset, self._uTiled)
+
+    def sAt(self, u, normalized=True):
+        """Returns the arc length from the start of the curve to u"""
+        u = asarray(u, float).clip(0., 1.)
+        if not self.isBatch():
+            s = numpy.interp(u, self.u, self.sNorm)
+        else:
+            rowOffset = self._rowOffset.reshape((-1,) + (1,)*(u.ndim-1))
+            s = numpy.interp(u + rowOffset, self._uOffset, self.sNorm.ravel())
+        if not normalized:
+            length = numpy.asarray(self.length)
+            s = s * length.reshape(length.shape + (1,)*(s.ndim - length.ndim))
+        return s
+
+    def atS(self, s, normalized=True):
+        """Returns curve points at arc length s, evenly spaced along the curve for evenly spaced s"""
+        u = self.uAt(s, normalized)
+        if not self.isBatch():
+            u = asUSamples(u)
+            pts = dot(basisFor(len(self.cpts)-1, u), self.cpts)
+            return pts if numpy.ndim(s) else pts[0]
+        if u.ndim == 1:
+            return evalCurvesPerU(self.cpts, u[:, None])[:, 0]
+        return evalCurvesPerU(self.cpts, u)
+
+    def afn(self, av, dtv, dts):
+        """Interval animation function mapping elapsed time fraction to u at constant speed"""
+        return float(self.uAt(min(1., max(0., dts))))
+
+arcLengthCache = LRUCache(64)
+def arcLengthFor(cpts, resolution=256):
+    """Returns the ArcLengthTable for cpts, cached per control points and resolution
+
+    The cache keeps the most recently used tables, bounding memory when
+    many paths are animated over time.
+    """
+    cpts = asarray(cpts, float)
+    key = (resolution, uKey(cpts))
+    table = arcLengthCache.get(key)
+    if table is None:
+        table = ArcLengthTable(cpts, resolution)
+        arcLengthCache[key] = table
+    return table
+
+def constantSpeed(cpts, resolution=256):
+    """Returns an Interval afn that moves along the curve of cpts at constant speed
+
+    Use as animator.interval(td, bezier.constantSpeed(cpts)); the animated
+    value is the curve parameter u to evaluate the path at.
+    """
+    return arcLengthFor(cpts, resolution).afn
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Main 
@@ -4,6 +4,7 @@
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 import numpy
+from numpy.lib.stride_tricks import as_strided
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -32,7 +33,88 @@ def p(t, av, pMat=pMat):
     vm = vtMat(t, pMat)
     return numpy.dot(vm, av)
 
+def dvtMat(t, pMat=pMat):
+    """Returns the basis of the tangent dp/dt at samples t"""
+    t = numpy.asarray(t, 'double')
+    vt = numpy.array([t*0., t*0.+1., 2.*t, 3.*t*t], 'double')
+    vt *= 0.5
+    return numpy.dot(vt.T, pMat)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Batched splines
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def segmentWindows(pts):
+    """Returns a (..., n-3, 4, dim) sliding window view of (..., n, dim) control points
+
+    Window i holds the four control points of segment i; the view shares
+    memory with pts, so no point is copied.
+    """
+    pts = numpy.asarray(pts)
+    n = pts.shape[-2]
+    if n < 4:
+        raise ValueError("A Catmull-Rom spline requires at least 4 control points, not %d" % (n,))
+    shape = pts.shape[:-2] + (n-3, 4) + pts.shape[-1:]
+    strides = pts.strides[:-1] + pts.strides[-2:]
+    return as_strided(pts, shape, strides, writeable=False)
+
+def _asPoints(pts):
+    pts = numpy.asarray(pts, 'double')
+    if pts.ndim == 1:
+        return pts[:, None], True
+    return pts, False
+
+def splineSegments(pts, t, tangents=False, pMat=pMat):
+    """Evaluates every segment of (..., n, dim) control points at samples t
+
+    Returns (..., n-3, len(t), dim) points, or (points, tangents) when
+    tangents is true.  A leading batch shape evaluates many sequences at
+    once; 1-d control points are treated as scalar values.
+    """
+    pts, scalar = _asPoints(pts)
+    windows = segmentWindows(pts)
+    result = numpy.matmul(vtMat(t, pMat), windows)
+    if tangents:
+        result = result, numpy.matmul(dvtMat(t, pMat), windows)
+        if scalar:
+            result = tuple(r[..., 0] for r in result)
+    elif scalar:
+        result = result[..., 0]
+    return result
+
+def spline(pts, t, tangents=False, pMat=pMat):
+    """Like splineSegments, with the segments joined into one (..., (n-3)*len(t), dim) sequence"""
+    result = splineSegments(pts, t, tangents, pMat)
+    if tangents:
+        return tuple(_joinSegments(r, numpy.ndim(pts)) for r in result)
+    return _joinSegments(result, numpy.ndim(pts))
+
+def _joinSegments(r, ptsNdim):
+    if ptsNdim == 1:
+        return r.reshape(r.shape[:-2] + (-1,))
+    return r.reshape(r.shape[:-3] + (-1,) + r.shape[-1:])
+
+def splineAt(pts, s, tangents=False, pMat=pMat):
+    """Evaluates (n, dim) control points at spline positions s in [0, n-3]
+
+    The integer part of s selects the segment and the fraction is t within
+    it, so samples need not be evenly spaced or sorted.
+    """
+    pts, scalar = _asPoints(pts)
+    windows = segmentWindows(pts)
+    s = numpy.asarray(s, 'double')
+    idx = numpy.clip(numpy.floor(s).astype(int), 0, len(windows)-1)
+    t = s - idx
+    w = windows[idx]
 
+    result = numpy.matmul(vtMat(t.ravel(), pMat).reshape(t.shape + (1, 4)), w)[..., 0, :]
+    if tangents:
+        result = result, numpy.matmul(dvtMat(t.ravel(), pMat).reshape(t.shape + (1, 4)), w)[..., 0, :]
+        if scalar:
+            result = tuple(r[..., 0] for r in result)
+    elif scalar:
+        result = result[..., 0]
+    return result
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Main 
@@ -16,6 +16,7 @@ import numpy
 from numpy import ndarray, asarray
 
 from .dataDescriptors import dataProperty
+from .precision import PrecisionDtype, precisionFor
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Transforms used in Box object
@@ -74,14 +75,127 @@ xfrmTable = {
 #~ Definitions 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-def asBlend(host, rel, xfrm=_xfrmSize_f[:,None], xoff=_xfrmOff_f[:,None]):
+class XfrmGather(object):
+    """Evaluates a 0/1 box xfrm table as a gather of corner coordinates.
+
+    Equivalent to (xfrm * boxData[..., None, :, :]).sum(-2), but indexes the
+    selected corner for each output coordinate instead of multiplying by the
+    weights.  Coordinates with no selected corner, like the z of planar 3d
+    tables, are zeroed.
+    """
+    def __init__(self, weights):
+        weights = asarray(weights)
+        wsum = weights.sum(-2)
+        if ((weights != 0) & (weights != 1)).any() or (wsum > 1).any():
+            raise ValueError("XfrmGather requires 0/1 weights selecting at most one corner per coordinate")
+
+        self.weights = weights
+        nVerts, nCorners, dim = weights.shape
+        self.cornerIdx = weights.argmax(-2)
+        self.coordIdx = numpy.arange(dim)[None, :].repeat(nVerts, 0)
+        self.flatIdx = self.cornerIdx*dim + self.coordIdx
+        self.zeroMask = (wsum == 0)
+        if not self.zeroMask.any():
+            self.zeroMask = None
+
+    def __len__(self):
+        return len(self.weights)
+
+    def __repr__(self):
+        return '<%s %r>' % (self.__class__.__name__, self.cornerIdx.tolist())
+
+    def gather(self, boxData, out=None):
+        boxData = asarray(boxData)
+        if out is None:
+            result = boxData[..., self.cornerIdx, self.coordIdx]
+        elif out.dtype != boxData.dtype:
+            return xfrmInto(self.weights, boxData, out)
+        else:
+            flatData = boxData.reshape(boxData.shape[:-2] + (-1,))
+            result = numpy.take(flatData, self.flatIdx, -1, out, 'clip')
+
+        if self.zeroMask is not None:
+            result[..., self.zeroMask] = 0
+        return result
+    __call__ = gather
+
+xfrmGatherTable = dict((key, XfrmGather(weights)) for key, weights in xfrmTable.iteritems())
+
+
+_blendXfrm = _xfrmSize_f[:,None]
+_blendXoff = _xfrmOff_f[:,None]
+
+def computeBlend(rel, xfrm=_blendXfrm, xoff=_blendXoff):
+    return asarray(rel)*xfrm + xoff
+
+# precomputed, read-only blend matrices for the common rel values 0, .5 and 1
+blendCache = {}
+def _initBlendCache(rels=(0, .5, 1)):
+    from itertools import product
+    keys = list(rels)
+    keys.extend(product(rels, repeat=2))
+    keys.extend(product(rels, repeat=3))
+    for rel in keys:
+        ar = computeBlend(rel)
+        ar.flags.writeable = False
+        blendCache[rel] = ar
+_initBlendCache()
+
+def asBlend(host, rel, xfrm=_blendXfrm, xoff=_blendXoff):
     if rel is None: rel = host.at_rel_default
+    if xfrm is _blendXfrm and xoff is _blendXoff:
+        try: 
+            return blendCache[rel]
+        except (KeyError, TypeError): 
+            pass
     return asarray(rel)*xfrm + xoff
 def boxBlend(alpha, boxData):
     ar = asBlend(None, alpha)[:,None]
     return (boxData*ar).sum(-3)
 
+def xfrmInto(xfrm, boxData, out):
+    """Evaluates (xfrm * boxData).sum(-2) directly into out, without the broadcast product"""
+    return numpy.einsum('vcd,...cd->...vd', xfrm, boxData, out=out, casting='same_kind')
+
+def asVertexBuffer(buffer, dim, dtype=None):
+    """Returns a (nVertices, dim) view of buffer; raises if a copy would be required"""
+    if not isinstance(buffer, ndarray):
+        if dtype is None:
+            buffer = asarray(buffer)
+        else: buffer = numpy.frombuffer(buffer, dtype)
+    vtx = buffer.view()
+    vtx.shape = (-1, dim)
+    return vtx
+
+def geoXfrmInto(boxData, buffer, offset=0, xfrm='quads', xfrmTable=xfrmGatherTable, dtype=None):
+    """Writes geoXfrm vertices for all boxes in boxData into buffer, starting at vertex offset.
+
+    buffer may be any ndarray (including numpy.memmap) or an object exposing
+    the buffer interface, such as a ctypes array.  Returns the vertex offset
+    following the last vertex written.
+    """
+    boxData = asarray(boxData)
+    dim = boxData.shape[-1]
+    xfrm = xfrmTable[xfrm, dim]
+    boxData = boxData.reshape((-1,) + boxData.shape[-2:])
+
+    vtx = asVertexBuffer(buffer, dim, dtype)
+    end = offset + len(boxData)*len(xfrm)
+    if end > len(vtx):
+        raise ValueError("Vertex buffer too small: %d vertices required, %d available" % (end, len(vtx)))
+
+    out = vtx[offset:end]
+    out.shape = (len(boxData), len(xfrm), dim)
+    gather = getattr(xfrm, 'gather', None)
+    if gather is not None:
+        gather(boxData, out)
+    else: xfrmInto(xfrm, boxData, out)
+    return end
+
 def toAspect(size, aspect, nidx=0, didx=1, grow=None):
+    if numpy.ndim(size) > 1:
+        return toAspectArray(size, aspect, nidx, didx, grow)
+
     # interpret aspect parameter
     if isinstance(aspect, tuple):
         if isinstance(aspect[1], bool):
@@ -110,6 +224,166 @@ def toAspect(size, aspect, nidx=0, didx=1, grow=None):
         size[..., nidx] = aspect * size[..., didx]
     return size
 
+aspectFitModes = {
+    'letterbox': False, 'contain': False,
+    'cover': True, 'fill': True,
+}
+
+def toAspectArray(sizes, aspect, nidx=0, didx=1, grow=None):
+    """Vectorized toAspect over (..., dim) sizes, returning a new array of sizes
+
+    A tuple or list aspect is a (num, den) pair shared by all sizes, as with
+    toAspect.  An ndarray aspect with the same ndim as sizes holds one pair
+    per size; otherwise it holds one ratio per size.  grow may be a flag, a
+    boolean array broadcasting against sizes.shape[:-1], or a name from
+    aspectFitModes: 'letterbox' fits inside the size, 'cover' fills it.
+    Where toAspect would return 0, the corresponding size is zeroed.
+    """
+    if isinstance(aspect, tuple) and len(aspect) == 2:
+        if isinstance(aspect[1], (bool, numpy.bool_)):
+            aspect, grow = aspect
+    if isinstance(grow, basestring):
+        grow = aspectFitModes[grow]
+
+    sizes = numpy.array(sizes, float)
+    isPair = hasattr(aspect, '__len__') and not isinstance(aspect, ndarray)
+    aspect = asarray(aspect, float)
+
+    if isPair or (aspect.ndim and aspect.ndim == sizes.ndim):
+        num = aspect[..., nidx]; den = aspect[..., didx]
+        zeroDen = (den == 0)
+        zeroed = zeroDen & (num != 0)
+        aspect = numpy.where(zeroDen, 1., num / numpy.where(zeroDen, 1., den))
+    else: zeroed = False
+
+    w = sizes[..., nidx].copy(); h = sizes[..., didx].copy()
+    active = (aspect > 0)
+    zeroed = zeroed | (active & (sizes == 0).any(-1))
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        fitHeight = numpy.logical_xor(asarray(grow, bool), aspect > (w / h))
+        sizes[..., didx] = numpy.where(active & fitHeight, w / aspect, h)
+        sizes[..., nidx] = numpy.where(active & ~fitHeight, aspect * h, w)
+
+    zeroed = numpy.broadcast_to(zeroed, sizes.shape[:-1])
+    if zeroed.any():
+        sizes[zeroed] = 0
+    return sizes
+
+def boxDataFromCorners(p0, p1, dtype):
+    """Builds one (..., 2, dim) block of box data from broadcastable (..., dim) corner arrays"""
+    p0 = asarray(p0); p1 = asarray(p1)
+    shape = numpy.broadcast(p0, p1).shape
+    data = numpy.empty(shape[:-1] + (2,) + shape[-1:], dtype)
+    data[..., 0, :] = p0
+    data[..., 1, :] = p1
+    return data
+
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Change batching
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_activeChangeBatches = []
+_boxChangeBatches = {}
+
+def activeChangeBatch():
+    if _activeChangeBatches:
+        return _activeChangeBatches[-1]
+
+def changeBatchFor(box):
+    """Returns the batch deferring changes of box, or None to publish immediately"""
+    if _boxChangeBatches:
+        batch = _boxChangeBatches.get(id(box))
+        if batch is not None:
+            return batch
+    if _activeChangeBatches:
+        return _activeChangeBatches[-1]
+
+class BoxChangeBatch(object):
+    """Coalesces box change notifications until the batch exits.
+
+    Used as a context manager.  Boxes changed inside the batch are recorded
+    once and published once on exit, in the order they first changed.  When
+    publish is given, it is called once with the list of changed boxes
+    instead of publishing each box, and returns the count of notifications
+    it sent.  A batch bound to a single box only
+    captures that box's changes; otherwise every box defers to the innermost
+    active batch.
+    """
+    box = None
+    _outer = None
+
+    def __init__(self, box=None, publish=None):
+        if box is not None:
+            self.box = box
+        if publish is not None:
+            self.publish = publish
+        self.deferred = 0
+        self.published = 0
+        self._dirty = []
+        self._dirtyIds = set()
+
+    def __enter__(self):
+        box = self.box
+        if box is None:
+            _activeChangeBatches.append(self)
+        else: 
+            self._outer = _boxChangeBatches.get(id(box))
+            _boxChangeBatches[id(box)] = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        box = self.box
+        if box is None:
+            _activeChangeBatches.remove(self)
+        elif self._outer is not None:
+            _boxChangeBatches[id(box)] = self._outer
+            self._outer = None
+        else: del _boxChangeBatches[id(box)]
+        self.flush()
+
+    @property
+    def suppressed(self):
+        """Count of notifications absorbed by coalescing"""
+        return self.deferred - self.published
+
+    def stats(self):
+        return dict(deferred=self.deferred, published=self.published, suppressed=self.suppressed)
+
+    def isDirty(self, box):
+        return id(box) in self._dirtyIds
+    def dirtyBoxes(self):
+        return list(self._dirty)
+
+    def defer(self, box):
+        self.deferred += 1
+        if id(box) not in self._dirtyIds:
+            self._dirtyIds.add(id(box))
+            self._dirty.append(box)
+
+    def flush(self):
+        boxes = self._dirty
+        self._dirty = []
+        self._dirtyIds = set()
+        if not boxes:
+            return
+
+        if self.box is not None:
+            outer = changeBatchFor(self.box)
+        else: outer = activeChangeBatch()
+        if outer is not None:
+            # nested batches coalesce into the enclosing one
+            for box in boxes:
+                outer.defer(box)
+            self.published += len(boxes)
+        else: 
+            self.published += self.publish(boxes)
+
+    def publish(self, boxes):
+        for box in boxes:
+            box._publishDataChanged()
+        return len(boxes)
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Box accessors
@@ -131,12 +405,14 @@ class BoxItemProperty(object):
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class _BoxIndexSyntaxBase(object):
+    __slots__ = ('box',)
     def __init__(self, box):
         self.box = box
     def __repr__(self):
         return '<%s of %s>' % (self.__class__.__name__, self.box.__class__.__name__)
 
 class AtSyntax(_BoxIndexSyntaxBase):
+    __slots__ = ()
     def __getitem__(self, key):
         box = self.box
         if isinstance(key, slice):
@@ -176,6 +452,7 @@ class AtSyntax(_BoxIndexSyntaxBase):
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class BlendAtSyntax(_BoxIndexSyntaxBase):
+    __slots__ = ()
     _boxBlendData = staticmethod(boxBlend)
     def __init__(self, box):
         if not box.isBoxVector():
@@ -185,12 +462,14 @@ class BlendAtSyntax(_BoxIndexSyntaxBase):
     def __getitem__(self, alpha):
         box = self.box
         idx0, ialpha = divmod(alpha, 1)
+        idx0 = int(idx0)
         boxData = box._data[..., idx0:idx0+2, :, :]
         return box.fromArray(self._boxBlendData(ialpha, boxData))
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class AtAspectSyntax(_BoxIndexSyntaxBase):
+    __slots__ = ()
     def __getitem__(self, aspect):
         if isinstance(aspect, tuple):
             aspect, at = aspect
@@ -209,9 +488,11 @@ class AtAspectSyntax(_BoxIndexSyntaxBase):
 #~ Box class -- the subject of the module
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-class Box(object):
+class BoxBase(object):
+    __slots__ = ()
     at_rel_default = 0 # our default relative should be p0... could be .5, or 1, or something more esoteric
-    dtype_default = numpy.float
+    precision = None # policy name or PrecisionPolicy; None follows the global policy
+    dtype_default = PrecisionDtype()
 
     DataFactory = lambda self, dtype: numpy.zeros((2,2), dtype)
     _asDataArray = staticmethod(asarray)
@@ -269,6 +550,12 @@ class Box(object):
     def copy(self, dim=None):
         return self.fromArray(self._data[...,:dim].copy())
 
+    @classmethod
+    def fromShared(klass, handle, mode='r+'):
+        """Attaches shared box data from its SharedHandle"""
+        from .sharedGeometry import attachShared
+        return klass.fromArray(asarray(attachShared(handle, mode)))
+
     def astype(self, t):
         return self.fromArray(self._data.astype(t))
 
@@ -279,7 +566,7 @@ class Box(object):
         if aspect is not None:
             size = klass.toAspect(size, aspect)
 
-        data = klass._asDataArray([numpy.zeros_like(size), size], dtype)
+        data = boxDataFromCorners(0, size, dtype)
         return klass.fromArray(data)
 
     @classmethod
@@ -289,14 +576,14 @@ class Box(object):
         if aspect is not None:
             size = klass.toAspect(size, aspect)
 
-        data = klass._asDataArray([pos, size], dtype)
-        data[1] += data[0]
+        data = boxDataFromCorners(pos, size, dtype)
+        data[..., 1, :] += data[..., 0, :]
         return klass.fromArray(data)
 
     @classmethod
     def fromCorners(klass, p0, p1, dtype=None):
         if dtype is None: dtype = klass.dtype_default
-        data = klass._asDataArray([p0, p1], dtype)
+        data = boxDataFromCorners(p0, p1, dtype)
         return klass.fromArray(data)
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -352,6 +639,10 @@ class Box(object):
         return self._data.ndim
     ndim = property(getNdim)
 
+    def computeData(self):
+        """Returns the box data in the compute dtype of its precision policy"""
+        return precisionFor(self).asCompute(self._data)
+
     def getDataRef(self):
         return self._data
     def setDataRef(self, dataRef):
@@ -362,6 +653,12 @@ class Box(object):
     def isBoxVector(self):
         return self.ndim > 2
 
+    def batchChanges(self, publish=None):
+        """Returns a context coalescing this box's change notifications into one on exit"""
+        return BoxChangeBatch(self, publish)
+    def _publishDataChanged(self):
+        pass
+
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     #~ Box methods
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -502,14 +799,24 @@ class Box(object):
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    def geoXfrm(self, xfrm='quads', xfrmTable=xfrmTable):
+    def geoXfrm(self, xfrm='quads', xfrmTable=xfrmGatherTable, out=None):
         xfrm = xfrmTable[xfrm, self.shape[-1]]
-        return self.xfrm(xfrm)
-    def xfrm(self, xfrm=None, sumIdx=-2):
+        return self.xfrm(xfrm, out=out)
+    def xfrm(self, xfrm=None, sumIdx=-2, out=None):
+        gather = getattr(xfrm, 'gather', None)
+        if gather is not None:
+            return gather(self._data, out)
+        if out is not None:
+            return xfrmInto(xfrm, self._data, out)
+
         # change the shape so we can broadcast the xfrm across the boxes
         vecDataM = self._data[..., None, :, :]
         return (xfrm * vecDataM).sum(sumIdx)
 
+    def geoXfrmInto(self, buffer, offset=0, xfrm='quads', xfrmTable=xfrmGatherTable):
+        """Writes geoXfrm vertices into buffer at vertex offset; returns the next free vertex offset"""
+        return geoXfrmInto(self._data, buffer, offset, xfrm, xfrmTable)
+
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     #~ Array and Numeric overrides 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -571,10 +878,22 @@ class Box(object):
     def __pos__(self, other, *modulo):  return self._data.__pos__(other)
     def __abs__(self, other, *modulo):  return self._data.__abs__(other)
 
-Box.property = classmethod(dataProperty)
+BoxBase.property = classmethod(dataProperty)
 
-#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class Box(BoxBase):
+    pass
 
 class CenterBox(Box):
     at_rel_default = 0.5
 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Slotted boxes -- no per-instance __dict__
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class SlotBox(BoxBase):
+    __slots__ = ('_data', '__weakref__')
+
+class SlotCenterBox(SlotBox):
+    __slots__ = ()
+    at_rel_default = CenterBox.at_rel_default
+
@@ -0,0 +1,239 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Batched boxes
+
+BoxArray holds many boxes in one (N, 2, dim) buffer, and applies the Box
+vocabulary to all of them at once.  Individual boxes are available as Box
+views sharing the same memory.
+"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import numpy
+from numpy import asarray
+
+from .dataDescriptors import dataProperty
+from . import boxQuery
+from . import boxReduce
+from .box import Box, CenterBox, asBlend, toAspectArray, aspectFitModes, _xfrmSize
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def asBoxVec(v):
+    """Arranges per-box vectors of shape (N, dim) to broadcast against (N, 2, dim) box data"""
+    v = asarray(v)
+    if v.ndim > 1:
+        v = v[..., None, :]
+    return v
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ BoxArray
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class BoxArray(Box):
+    """Collection of boxes stored as one (N, 2, dim) array.
+
+    Offsets, sizes and relative `at` values may be given once for all
+    boxes, or as (N, dim) arrays to supply one value per box.  The Box
+    constructors fromSize, fromPosSize and fromCorners accept (N, dim)
+    arrays, building all N boxes in one pass.
+    """
+    BoxFactory = Box
+
+    DataFactory = lambda self, dtype: numpy.zeros((0,2,2), dtype)
+
+    def __init__(self, data=None, p1=None, dtype=None):
+        Box.__init__(self, data, p1, dtype)
+        if self._data.ndim == 2:
+            self._data = self._data[None]
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Instance construction
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    @classmethod
+    def fromArray(klass, data):
+        if data.ndim == 2:
+            data = data[None]
+        return super(BoxArray, klass).fromArray(data)
+
+    @classmethod
+    def fromCount(klass, count, dim=2, dtype=None, shared=False):
+        if dtype is None: dtype = klass.dtype_default
+        if shared:
+            from .sharedGeometry import allocShared
+            return allocShared(klass, (count, 2, dim), dtype)
+        return klass.fromArray(numpy.zeros((count, 2, dim), dtype))
+
+    @classmethod
+    def fromBoxes(klass, boxes, dtype=None):
+        data = [asarray(b) for b in boxes]
+        if dtype is None and data:
+            dtype = data[0].dtype
+        return klass.fromArray(numpy.array(data, dtype))
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Box views
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        BoxFactory = self.BoxFactory
+        for boxData in self._data:
+            yield BoxFactory.fromArray(boxData)
+
+    def box(self, idx):
+        """Returns a Box view of the box at idx sharing memory with this array"""
+        return self.BoxFactory.fromArray(self._data[idx])
+
+    def boxes(self):
+        return list(self)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, long, numpy.integer)):
+            return self.box(key)
+        return Box.__getitem__(self, key)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Box methods
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def inset(self, delta, xfrm=-_xfrmSize):
+        self._data += xfrm*asBoxVec(delta)
+        self._data_changed_
+    def offset(self, delta):
+        self._data += asBoxVec(delta)
+        self._data_changed_
+
+    def scaleToSizeAt(self, size, at=None, sidx=Ellipsis, fn=numpy.amin):
+        scale = fn(size / self.size, -1)[..., None]
+        return self.scaleAt(scale, at, sidx)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Aspect fitting
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def fitAspect(self, aspect, mode='letterbox', at=.5, nidx=0, didx=1):
+        """Resizes every box to aspect within its current bounds
+
+        aspect is a ratio or (num, den) pair, shared or given per box.  mode
+        is 'letterbox' to fit inside each box, 'cover' to fill it, or a grow
+        flag or per-box boolean array as with toAspect.
+        """
+        asize = toAspectArray(self.size, aspect, nidx, didx, mode)
+        self.setSize(asize, at)
+
+    def fittedToAspect(self, aspect, mode='letterbox', at=.5, nidx=0, didx=1):
+        """Returns a new BoxArray with the boxes fitted to aspect, leaving these boxes untouched"""
+        result = self.copy()
+        result.fitAspect(aspect, mode, at, nidx, didx)
+        return result
+
+    def scaleToFit(self, size, mode='letterbox', at=None, sidx=Ellipsis):
+        """Uniformly scales each box to fit (letterbox) or cover size"""
+        if isinstance(mode, basestring):
+            mode = aspectFitModes[mode]
+        fn = mode and numpy.amax or numpy.amin
+        return self.scaleToSizeAt(size, at, sidx, fn)
+
+    def _asBlend(self, rel):
+        if rel is None: rel = self.at_rel_default
+        return asBlend(self, asBoxVec(rel))
+
+    def posForSizeAt(self, rel, size, sidx=Ellipsis, xfrm=-_xfrmSize):
+        ar = self._asBlend(rel)
+        v = (self._data[sidx]*ar).sum(-2)[..., None, :] + xfrm*(ar*asBoxVec(size))
+        v.sort(-2)
+        return v
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def vInside(self, pt):
+        return (self.p0[:,1]<=pt[1]) & (self.p1[:,1]>=pt[1])
+    def vOutside(self, pt):
+        return (self.p0[:,1]>pt[1]) | (self.p1[:,1]<pt[1])
+    def vInsideY(self, y):
+        return (self.p0[:,1]<=y) & (self.p1[:,1]>=y)
+    def vOutsideY(self, y):
+        return (self.p0[:,1]>y) | (self.p1[:,1]<y)
+
+    def hInside(self, pt):
+        return (self.p0[:,0]<=pt[0]) & (self.p1[:,0]>=pt[0])
+    def hOutside(self, pt):
+        return (self.p0[:,0]>pt[0]) | (self.p1[:,0]<pt[0])
+    def hInsideX(self, x):
+        return (self.p0[:,0]<=x) & (self.p1[:,0]>=x)
+    def hOutsideX(self, x):
+        return (self.p0[:,0]>x) | (self.p1[:,0]<x)
+
+    def inside(self, pt):
+        """Returns a boolean mask of the boxes containing pt"""
+        return ((self.p0<=pt) & (self.p1>=pt)).all(-1)
+    def outside(self, pt):
+        return ((self.p0>pt) | (self.p1<pt)).any(-1)
+
+    def insideMask(self, pts, chunkSize=None):
+        """Returns the (M, N) mask of M points against the N boxes"""
+        return boxQuery.pointsInBoxesMask(pts, self._data, chunkSize)
+    def pointsInside(self, pts, chunkSize=None):
+        """Returns (ptIdx, boxIdx) index arrays for points contained by boxes"""
+        return boxQuery.pointsInBoxes(pts, self._data, chunkSize)
+    def pick(self, pts, chunkSize=None, topmost=True):
+        """Returns the index of the box hit by each point, or -1"""
+        return boxQuery.pickBoxes(pts, self._data, chunkSize, topmost)
+    def overlapping(self, other, chunkSize=None, closed=True):
+        """Returns (selfIdx, otherIdx) index arrays of overlapping boxes"""
+        return boxQuery.boxesOverlap(self._data, other, chunkSize, closed)
+
+    def merge(self, other):
+        d = self._data; o = asarray(other)
+        numpy.minimum(d[..., 0, :], o[..., 0, :], d[..., 0, :])
+        numpy.maximum(d[..., 1, :], o[..., 1, :], d[..., 1, :])
+        self._data_changed_
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Reductions
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def union(self):
+        """Returns a Box bounding all the boxes"""
+        return self.BoxFactory.fromArray(boxReduce.unionAll(self._data))
+    def intersection(self):
+        """Returns the Box common to all the boxes; see boxReduce.isEmpty"""
+        return self.BoxFactory.fromArray(boxReduce.intersectAll(self._data))
+
+    def unionBy(self, segIds, count=None):
+        """Returns a BoxArray of the bounds of the boxes sharing each segment id"""
+        return self.fromArray(boxReduce.segmentUnion(self._data, segIds, count))
+    def intersectionBy(self, segIds, count=None):
+        return self.fromArray(boxReduce.segmentIntersect(self._data, segIds, count))
+
+    def subtreeUnion(self, parentIdx):
+        """Returns a BoxArray of each box merged with its descendants in the parentIdx tree"""
+        return self.fromArray(boxReduce.subtreeUnion(self._data, parentIdx))
+    def clipToAncestors(self, parentIdx):
+        """Returns a BoxArray of each box clipped by its ancestors in the parentIdx tree"""
+        return self.fromArray(boxReduce.clipToAncestors(self._data, parentIdx))
+
+    def emptyMask(self):
+        return boxReduce.isEmpty(self._data)
+
+BoxArray.property = classmethod(dataProperty)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class CenterBoxArray(BoxArray):
+    BoxFactory = CenterBox
+    at_rel_default = CenterBox.at_rel_default
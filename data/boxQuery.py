@@ -0,0 +1,184 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Bulk containment and overlap queries
+
+Tests M points or boxes against N boxes.  Work is split into chunks of rows
+so the boolean temporaries stay near `chunkSize` elements, regardless of
+how large M and N grow.  Box data is anything with (..., 2, dim) corners --
+a Box, a BoxArray, or a raw ndarray.
+"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import numpy
+from numpy import asarray
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Constants
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+defaultChunkSize = 1<<18
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def asBoxData(boxes):
+    boxes = asarray(boxes)
+    return boxes.reshape((-1,) + boxes.shape[-2:])
+
+def asPointData(pts, dim):
+    pts = asarray(pts)
+    return pts.reshape(-1, pts.shape[-1])[:, :dim]
+
+def iterChunks(count, width, chunkSize=None):
+    """Yields row slices over count rows such that rows*width stays under chunkSize"""
+    if chunkSize is None:
+        chunkSize = defaultChunkSize
+    step = max(1, chunkSize // max(1, width))
+    for i0 in xrange(0, count, step):
+        yield slice(i0, min(count, i0+step))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Chunk kernels
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def pointsInBoxesChunk(pts, boxes):
+    """Returns the (len(pts), len(boxes)) containment mask; boundaries are inclusive"""
+    p0 = boxes[:, 0]; p1 = boxes[:, 1]
+    mask = None
+    for d in xrange(boxes.shape[-1]):
+        ptd = pts[:, d, None]
+        maskd = (p0[:, d] <= ptd)
+        maskd &= (p1[:, d] >= ptd)
+        if mask is None: mask = maskd
+        else: mask &= maskd
+    return mask
+
+def boxesOverlapChunk(boxesA, boxesB, closed=True):
+    """Returns the (len(boxesA), len(boxesB)) overlap mask
+
+    With closed=False, boxes that only share an edge do not overlap.
+    """
+    if closed:
+        lessEq = numpy.less_equal
+    else: lessEq = numpy.less
+
+    mask = None
+    for d in xrange(boxesB.shape[-1]):
+        maskd = lessEq(boxesB[:, 0, d], boxesA[:, 1, d, None])
+        maskd &= lessEq(boxesA[:, 0, d, None], boxesB[:, 1, d])
+        if mask is None: mask = maskd
+        else: mask &= maskd
+    return mask
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Points against boxes
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def iterPointsInBoxes(pts, boxes, chunkSize=None):
+    """Yields (ptIdx, boxIdx) index array pairs of contained points, one pair per chunk"""
+    boxes = asBoxData(boxes)
+    pts = asPointData(pts, boxes.shape[-1])
+    for sl in iterChunks(len(pts), len(boxes), chunkSize):
+        ptIdx, boxIdx = pointsInBoxesChunk(pts[sl], boxes).nonzero()
+        if len(ptIdx):
+            yield ptIdx + sl.start, boxIdx
+
+def pointsInBoxes(pts, boxes, chunkSize=None):
+    """Returns (ptIdx, boxIdx) index arrays for every point contained by a box"""
+    return _concatIdxPairs(iterPointsInBoxes(pts, boxes, chunkSize))
+
+def pointsInBoxesMask(pts, boxes, chunkSize=None, out=None):
+    """Returns the (M, N) containment mask of M points against N boxes"""
+    boxes = asBoxData(boxes)
+    pts = asPointData(pts, boxes.shape[-1])
+    if out is None:
+        out = numpy.empty((len(pts), len(boxes)), bool)
+    for sl in iterChunks(len(pts), len(boxes), chunkSize):
+        out[sl] = pointsInBoxesChunk(pts[sl], boxes)
+    return out
+
+def pointsInAnyBox(pts, boxes, chunkSize=None):
+    """Returns an (M,) mask of points contained by at least one box"""
+    boxes = asBoxData(boxes)
+    pts = asPointData(pts, boxes.shape[-1])
+    result = numpy.zeros(len(pts), bool)
+    for sl in iterChunks(len(pts), len(boxes), chunkSize):
+        result[sl] = pointsInBoxesChunk(pts[sl], boxes).any(-1)
+    return result
+
+def pickBoxes(pts, boxes, chunkSize=None, topmost=True):
+    """Returns an (M,) array with the index of the box hit by each point, or -1
+
+    When boxes overlap, the last (topmost) box wins unless topmost is False.
+    """
+    boxes = asBoxData(boxes)
+    pts = asPointData(pts, boxes.shape[-1])
+    n = len(boxes)
+    if not n:
+        return -numpy.ones(len(pts), int)
+    result = numpy.empty(len(pts), int)
+    result.fill(-1)
+    for sl in iterChunks(len(pts), n, chunkSize):
+        mask = pointsInBoxesChunk(pts[sl], boxes)
+        if topmost: mask = mask[:, ::-1]
+        idx = mask.argmax(-1)
+        hit = mask[numpy.arange(len(idx)), idx]
+        if topmost: idx = (n-1) - idx
+        result[sl] = numpy.where(hit, idx, -1)
+    return result
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Boxes against boxes
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def iterBoxesOverlap(boxesA, boxesB, chunkSize=None, closed=True):
+    """Yields (aIdx, bIdx) index array pairs of overlapping boxes, one pair per chunk"""
+    boxesA = asBoxData(boxesA); boxesB = asBoxData(boxesB)
+    for sl in iterChunks(len(boxesA), len(boxesB), chunkSize):
+        aIdx, bIdx = boxesOverlapChunk(boxesA[sl], boxesB, closed).nonzero()
+        if len(aIdx):
+            yield aIdx + sl.start, bIdx
+
+def boxesOverlap(boxesA, boxesB, chunkSize=None, closed=True):
+    """Returns (aIdx, bIdx) index arrays for every overlapping pair of boxes"""
+    return _concatIdxPairs(iterBoxesOverlap(boxesA, boxesB, chunkSize, closed))
+
+def boxesOverlapMask(boxesA, boxesB, chunkSize=None, closed=True, out=None):
+    """Returns the (M, N) overlap mask of M boxes against N boxes"""
+    boxesA = asBoxData(boxesA); boxesB = asBoxData(boxesB)
+    if out is None:
+        out = numpy.empty((len(boxesA), len(boxesB)), bool)
+    for sl in iterChunks(len(boxesA), len(boxesB), chunkSize):
+        out[sl] = boxesOverlapChunk(boxesA[sl], boxesB, closed)
+    return out
+
+def boxesOverlapAny(boxesA, boxesB, chunkSize=None, closed=True):
+    """Returns an (N,) mask of the boxes in boxesB overlapping any box in boxesA
+
+    Useful for culling boxesB against a handful of view rectangles.
+    """
+    boxesA = asBoxData(boxesA); boxesB = asBoxData(boxesB)
+    result = numpy.zeros(len(boxesB), bool)
+    for sl in iterChunks(len(boxesA), len(boxesB), chunkSize):
+        result |= boxesOverlapChunk(boxesA[sl], boxesB, closed).any(0)
+    return result
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def _concatIdxPairs(iIdxPairs):
+    idxPairs = list(iIdxPairs)
+    if not idxPairs:
+        empty = numpy.zeros(0, int)
+        return empty, empty.copy()
+    aIdx, bIdx = zip(*idxPairs)
+    return numpy.concatenate(aIdx), numpy.concatenate(bIdx)
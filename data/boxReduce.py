@@ -0,0 +1,173 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Union and intersection reductions over collections of boxes
+
+Reduces (N, 2, dim) box data as a whole, by segment id, or along a tree
+given as a parent index array (-1 for roots).  Tree reductions loop once
+per tree level rather than once per box.
+
+Unions start from an inverted empty box and intersections from the
+unbounded box, so segments with no members come back as those identities.
+Use isEmpty() to find boxes that ended up with p0 > p1.
+"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import numpy
+from numpy import asarray
+
+from .boxQuery import asBoxData
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def dtypeBounds(dtype):
+    """Returns the (lowest, highest) representable values of dtype"""
+    dtype = numpy.dtype(dtype)
+    if dtype.kind == 'f':
+        return -numpy.inf, numpy.inf
+    info = numpy.iinfo(dtype)
+    return info.min, info.max
+
+def emptyBoxData(count, dim, dtype):
+    """Returns count inverted boxes; the identity for union"""
+    lo, hi = dtypeBounds(dtype)
+    data = numpy.empty((count, 2, dim), dtype)
+    data[:, 0] = hi; data[:, 1] = lo
+    return data
+
+def unboundedBoxData(count, dim, dtype):
+    """Returns count boxes spanning every representable value; the identity for intersection"""
+    lo, hi = dtypeBounds(dtype)
+    data = numpy.empty((count, 2, dim), dtype)
+    data[:, 0] = lo; data[:, 1] = hi
+    return data
+
+def isEmpty(boxData):
+    """Returns a mask of boxes with p0 > p1 along any axis"""
+    boxData = asarray(boxData)
+    return (boxData[..., 0, :] > boxData[..., 1, :]).any(-1)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Whole collection reductions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def unionAll(boxData):
+    """Returns the (2, dim) bounds of every box"""
+    boxData = asBoxData(boxData)
+    if not len(boxData):
+        return emptyBoxData(1, boxData.shape[-1], boxData.dtype)[0]
+    return numpy.array([boxData[:, 0].min(0), boxData[:, 1].max(0)])
+
+def intersectAll(boxData):
+    """Returns the (2, dim) box common to every box; inverted when they do not all overlap"""
+    boxData = asBoxData(boxData)
+    if not len(boxData):
+        return unboundedBoxData(1, boxData.shape[-1], boxData.dtype)[0]
+    return numpy.array([boxData[:, 0].max(0), boxData[:, 1].min(0)])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Segmented reductions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def _segmentReduce(boxData, segIds, out, fn0, fn1):
+    segIds = asarray(segIds).ravel()
+    valid = (segIds >= 0)
+    if not valid.all():
+        boxData = boxData[valid]; segIds = segIds[valid]
+    if not len(segIds):
+        return out
+
+    order = segIds.argsort(kind='mergesort')
+    segIds = segIds[order]
+    starts = numpy.flatnonzero(numpy.r_[True, segIds[1:] != segIds[:-1]])
+    ids = segIds[starts]
+
+    sortedData = boxData[order]
+    out[ids, 0] = fn0(out[ids, 0], fn0.reduceat(sortedData[:, 0], starts, 0))
+    out[ids, 1] = fn1(out[ids, 1], fn1.reduceat(sortedData[:, 1], starts, 0))
+    return out
+
+def segmentCount(segIds):
+    segIds = asarray(segIds)
+    if not segIds.size:
+        return 0
+    return max(0, segIds.max() + 1)
+
+def segmentUnion(boxData, segIds, count=None, out=None):
+    """Returns (count, 2, dim) bounds of the boxes sharing each segment id
+
+    Boxes with a negative segment id are ignored.  When out is given, the
+    segment bounds are merged into it.
+    """
+    boxData = asBoxData(boxData)
+    if count is None:
+        count = segmentCount(segIds)
+    if out is None:
+        out = emptyBoxData(count, boxData.shape[-1], boxData.dtype)
+    return _segmentReduce(boxData, segIds, out, numpy.minimum, numpy.maximum)
+
+def segmentIntersect(boxData, segIds, count=None, out=None):
+    """Returns (count, 2, dim) intersections of the boxes sharing each segment id"""
+    boxData = asBoxData(boxData)
+    if count is None:
+        count = segmentCount(segIds)
+    if out is None:
+        out = unboundedBoxData(count, boxData.shape[-1], boxData.dtype)
+    return _segmentReduce(boxData, segIds, out, numpy.maximum, numpy.minimum)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Tree reductions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def treeDepths(parentIdx):
+    """Returns the depth of each node of the tree given by parentIdx; roots have depth 0"""
+    parentIdx = asarray(parentIdx)
+    depth = numpy.zeros(len(parentIdx), int)
+    anc = parentIdx.copy()
+    for i in xrange(len(parentIdx)):
+        hasAnc = (anc >= 0)
+        if not hasAnc.any():
+            return depth
+        depth += hasAnc
+        anc[hasAnc] = parentIdx[anc[hasAnc]]
+    raise ValueError("parentIdx contains a cycle")
+
+def treeLevels(parentIdx):
+    """Returns a list of node index arrays, one per depth, starting at the roots"""
+    depth = treeDepths(parentIdx)
+    order = depth.argsort(kind='mergesort')
+    bounds = numpy.searchsorted(depth[order], numpy.arange(depth.max()+2 if len(depth) else 1))
+    return [order[i0:i1] for i0, i1 in zip(bounds[:-1], bounds[1:])]
+
+def subtreeUnion(boxData, parentIdx, levels=None):
+    """Returns (N, 2, dim) bounds of each node's box merged with all of its descendants"""
+    parentIdx = asarray(parentIdx)
+    result = asBoxData(boxData).copy()
+    if levels is None:
+        levels = treeLevels(parentIdx)
+    for nodes in reversed(levels[1:]):
+        _segmentReduce(result[nodes], parentIdx[nodes], result, numpy.minimum, numpy.maximum)
+    return result
+
+def clipToAncestors(boxData, parentIdx, levels=None):
+    """Returns (N, 2, dim) boxes clipped by every ancestor's box, as nested clip rects are"""
+    parentIdx = asarray(parentIdx)
+    result = asBoxData(boxData).copy()
+    if levels is None:
+        levels = treeLevels(parentIdx)
+    for nodes in levels[1:]:
+        clip = result[parentIdx[nodes]]
+        numpy.maximum(result[nodes, 0], clip[:, 0], clip[:, 0])
+        numpy.minimum(result[nodes, 1], clip[:, 1], clip[:, 1])
+        result[nodes] = clip
+    return result
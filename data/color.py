@@ -157,7 +157,7 @@ class ColorVector(Vector):
         if isinstance(data[0], basestring):
             return klass.fromHex(data, None, dtype)
 
-        return Vector.fromData(data, dtype, copy, order, subok, ndmin)
+        return super(ColorVector, klass).fromData(data, dtype, copy, order, subok, ndmin)
 
     @classmethod
     def fromHex(klass, hexData, shape=None, dtype=None):
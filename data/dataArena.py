@@ -0,0 +1,203 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Arena storage for data properties
+
+A DataArena lays out the data properties of a host class as the fields of
+one structured record array.  Each host instance owns a row, and its
+property values are views into that row, so a whole population of hosts
+can be read, updated, serialized or uploaded with single array operations
+on DataArena.field() or DataArena.records.
+
+Opt in per class with DataArena.install(klass).
+"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import weakref
+
+import numpy
+from numpy import asarray, ndarray
+
+from .dataDescriptors import DataProperty
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def iterDataProperties(klass):
+    seen = set()
+    for base in klass.__mro__:
+        for name, value in vars(base).items():
+            if name in seen: continue
+            seen.add(name)
+            if isinstance(value, DataProperty) and value.data is not None:
+                yield name, value
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class DataArena(object):
+    """Growable pool of records, one row per host, one field per data property.
+
+    Rows are allocated on first property access.  The row of a collected
+    host is not handed to a new host, since values taken from the old host
+    may still view it; compact() reclaims those rows.  When the pool grows
+    or is compacted, Box values are rebound to the new buffer in place;
+    other values are replaced on the host, so references to them held
+    elsewhere go stale.  Use reserve() to size the pool up front for large
+    populations.
+    """
+    minCapacity = 16
+
+    def __init__(self, klass, capacity=0):
+        self.klass = klass
+        self._props = dict(iterDataProperties(klass))
+
+        fields = []
+        for name, prop in sorted(self._props.items()):
+            t = asarray(prop.data)
+            fields.append((name, t.dtype, t.shape))
+        self.dtype = numpy.dtype(fields, align=True)
+
+        self.records = numpy.zeros(0, self.dtype)
+        self._template = numpy.zeros((), self.dtype)
+        for name, prop in self._props.items():
+            self._template[name] = asarray(prop.data)
+
+        self._top = 0
+        self._rows = {}
+        self._hosts = {}
+        self.reserve(capacity)
+
+    @classmethod
+    def install(klass, hostKlass, capacity=0):
+        """Enables arena storage for the data properties of hostKlass"""
+        self = klass(hostKlass, capacity)
+        hostKlass._data_arena_ = self
+        return self
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, host):
+        return id(host) in self._rows
+
+    @property
+    def capacity(self):
+        return len(self.records)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Population access
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def field(self, name):
+        """Returns the (rows, ...) array of one property across every allocated row"""
+        return self.records[name][:self._top]
+
+    def aliveMask(self):
+        mask = numpy.zeros(self._top, bool)
+        mask[self._rows.values()] = True
+        return mask
+
+    def rowOf(self, host):
+        return self._rows[id(host)]
+
+    def hosts(self):
+        """Returns (row, host) pairs for the live hosts, ordered by row"""
+        rows = self._rows; hosts = self._hosts
+        result = [(rows[k], hosts[k]()) for k in rows]
+        return sorted((r, h) for r, h in result if h is not None)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Row management
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def reserve(self, capacity):
+        old = self.records
+        if capacity <= len(old):
+            return
+        records = numpy.zeros(capacity, self.dtype)
+        records[:self._top] = old[:self._top]
+        self.records = records
+        self._rebindHosts()
+
+    def compact(self, capacity=None):
+        """Moves the live rows to the front of a new buffer, reclaiming the rows of collected hosts
+
+        Values taken from collected hosts keep the old buffer, so they are
+        detached from every live host rather than aliasing one.
+        """
+        live = self.hosts()
+        if capacity is None: 
+            capacity = len(self.records)
+        capacity = max(capacity, len(live))
+
+        records = numpy.zeros(capacity, self.dtype)
+        if live:
+            records[:len(live)] = self.records[[row for row, host in live]]
+        self.records = records
+        self._top = len(live)
+
+        rows = {}
+        for row, (oldRow, host) in enumerate(live):
+            rows[id(host)] = row
+        self._rows = rows
+        self._rebindHosts()
+
+    def _rebindHosts(self):
+        for row, host in self.hosts():
+            for name, prop in self._props.items():
+                value = getattr(host, prop.private, None)
+                if value is not None:
+                    self._rebind(host, prop, value, self.records[name][row])
+
+    def _rebind(self, host, prop, value, fieldView):
+        if getattr(value, 'setDataRef', None) is not None:
+            # the row holds the same values, so skip setDataRef and its change notification
+            value._data = fieldView
+        else: setattr(host, prop.private, self._wrap(prop, fieldView))
+
+    def _wrap(self, prop, fieldView):
+        template = prop.data
+        fromArray = getattr(template, 'fromArray', None)
+        if fromArray is not None:
+            return fromArray(fieldView)
+        elif isinstance(template, ndarray):
+            return fieldView.view(type(template))
+        return fieldView
+
+    def _allocRow(self, host):
+        row = self._top
+        if row >= len(self.records):
+            self.reserve(max(self.minCapacity, 2*len(self.records)))
+        self._top += 1
+
+        key = id(host)
+        self.records[row] = self._template
+        self._rows[key] = row
+        self._hosts[key] = weakref.ref(host, lambda wr, key=key: self._releaseRow(key))
+        return row
+
+    def _releaseRow(self, key):
+        # the row stays allocated until compact(); views of it may outlive the host
+        self._rows.pop(key, None)
+        self._hosts.pop(key, None)
+
+    def viewFor(self, host, prop):
+        """Returns the value for prop on host as a view into the host's row"""
+        name = prop.public
+        if self._props.get(name) is not prop:
+            # declared after the arena was installed, e.g. by a subclass
+            return prop.data.copy()
+
+        row = self._rows.get(id(host))
+        if row is None:
+            row = self._allocRow(host)
+        return self._wrap(prop, self.records[name][row])
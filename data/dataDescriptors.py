@@ -10,7 +10,11 @@
 #~ Imports 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+import inspect
+from numpy import ndarray
+
 from . import DataHostObject
+from .precision import asPrecision
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -21,10 +25,14 @@ class DataProperty(object):
     public = None
     private = None
     _private_fmt = '__ob_%s'
+    _slot_fmt = '_ob_%s'
+    # only templates built without an explicit dtype follow the host's precision
+    defaultDtype = False
 
-    def __init__(self, data, publish=None):
+    def __init__(self, data, publish=None, defaultDtype=False):
         self._setPublishName(publish)
         self.data = data
+        self.defaultDtype = defaultDtype
 
     def _setPublishName(self, publish):
         if publish is None or isinstance(self.public, str):
@@ -33,6 +41,12 @@ class DataProperty(object):
         self.public = publish
         self.private = self._private_fmt % (publish,)
 
+    def slotNameFor(self, propertyName):
+        """Switches storage to a __slots__ compatible name, since slot names are mangled"""
+        self._setPublishName(propertyName)
+        self.private = self._slot_fmt % (self.public,)
+        return self.private
+
     def propertyNameTuple(self):
         return (self.public, self.private)
 
@@ -54,16 +68,34 @@ class DataProperty(object):
     def setWithFactory(self, obInst):
         data = self.data
         if data is not None:
-            result = data.copy()
+            arena = getattr(obInst, '_data_arena_', None)
+            if arena is not None:
+                result = arena.viewFor(obInst, self)
+            else:
+                result = data.copy()
+                precision = getattr(obInst, 'precision', None)
+                if precision is not None and self.defaultDtype:
+                    result = self._asPrecision(result, precision)
             self.__set_factory__(obInst, result)
             return (True, result)
+
+    def _asPrecision(self, result, precision):
+        """Converts floating point template copies to the host's storage dtype"""
+        storage = asPrecision(precision).storage
+        dtype = getattr(result, 'dtype', None)
+        if dtype is None or dtype.kind != 'f' or dtype == storage:
+            return result
+        return result.astype(storage)
+
     def set(self, obInst, value):
         setattr(obInst, self.private, value)
         self._modified_(obInst)
 
     def __set__(self, obInst, value):
         if isinstance(value, self.data.__class__):
-            return self.set(obInst, value) 
+            # arena hosts keep their row view and copy the value into it
+            if getattr(obInst, '_data_arena_', None) is None:
+                return self.set(obInst, value) 
 
         item = self.__get__(obInst, None)
         itemSetValue = getattr(item, '__setvalue__', None)
@@ -75,10 +107,27 @@ class DataProperty(object):
     def _modified_(self, obInst):
         pass
 
+def isDefaultDtype(klass, *args, **kw):
+    """True when klass(*args, **kw) picks its dtype from the precision policy
+
+    As in Vector.fromData, an explicit dtype argument or ndarray data keeps
+    its own dtype.
+    """
+    init = getattr(klass.__init__, 'im_func', None)
+    if init is None:
+        return False
+    try: 
+        callArgs = inspect.getcallargs(init, None, *args, **kw)
+    except TypeError: 
+        return False
+    if callArgs.get('dtype') is not None:
+        return False
+    return not isinstance(callArgs.get('data'), ndarray)
+
 def dataProperty(klass, *args, **kw):
     publish = kw.pop('publish', None)
     data = klass(*args, **kw)
-    return DataProperty(data, publish)
+    return DataProperty(data, publish, isDefaultDtype(klass, *args, **kw))
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ KV Data Property
@@ -86,6 +135,7 @@ def dataProperty(klass, *args, **kw):
 
 class KVDataProperty(DataProperty):
     _private_fmt = '__kv_%s'
+    _slot_fmt = '_kv_%s'
 
     def _modified_(self, obInst):
         obInst.kvpub.publishProp(self.public, obInst)
@@ -93,5 +143,5 @@ class KVDataProperty(DataProperty):
 def kvDataProperty(klass, *args, **kw):
     publish = kw.pop('publish', None)
     data = klass(*args, **kw)
-    return KVDataProperty(data, publish)
+    return KVDataProperty(data, publish, isDefaultDtype(klass, *args, **kw))
 
@@ -21,10 +21,16 @@ from .import box
 class KVBox(KVObject, box.Box):
     @property
     def _data_changed_(self):
+        batch = box.changeBatchFor(self)
+        if batch is None:
+            self.kvpub('*')
+        else: batch.defer(self)
+
+    def _publishDataChanged(self):
         self.kvpub('*')
 
     def _onViewDataChange(self, kvhost, key):
-        self.kvpub('*')
+        self._data_changed_
 
     @classmethod
     def new(klass):
@@ -21,69 +21,129 @@ from numpy import array, asmatrix, identity, outer, cos, sin, radians
 #~ Definitions 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+class MatrixStackData(object):
+    """Preallocated (depth, 4, 4) storage for one matrix stack"""
+    def __init__(self, depth, dtype):
+        self.data = numpy.zeros((depth, 4, 4), dtype)
+        self.data[0] = identity(4)
+        self.idx = 0
+
+    def push(self):
+        data = self.data
+        idx = self.idx + 1
+        if idx >= len(data):
+            self.data = numpy.concatenate([data, numpy.zeros_like(data)])
+            data = self.data
+        data[idx] = data[idx-1]
+        self.idx = idx
+
+    def pop(self):
+        if self.idx <= 0:
+            raise IndexError("pop from an empty matrix stack")
+        self.idx -= 1
+
 class MatrixStack(object):
+    """Stacks of 4x4 transforms held in preallocated float32 arrays
+
+    Compose operations right multiply the top matrix in place, as OpenGL
+    does, without allocating a new matrix.  transformPoints and
+    transformBoxes apply the top matrix to whole vertex or box arrays.
+    """
+    dtype = numpy.float32
+    depth = 32
+
     def __init__(self, key=None):
         self.initMatrixStacks(key)
 
     def initMatrixStacks(self, key=None):
         self._matStacks = defaultdict(self._newStack)
+        self._matScratch = numpy.zeros((4, 4), self.dtype)
         self.changeStack(key)
 
     def _newStack(self):
-        return [asmatrix(identity(4))]
+        return MatrixStackData(self.depth, self.dtype)
     def changeStack(self, key):
         self._matCurrent = self._matStacks[key]
 
+    def getTopArray(self):
+        """Returns the (4, 4) top matrix as a view into the stack storage"""
+        MC = self._matCurrent
+        return MC.data[MC.idx]
+    topArray = property(getTopArray)
+
     @property
     def top(self):
-        return self._matCurrent[-1]
+        return asmatrix(self.getTopArray())
     @top.setter
     def top(self, m):
-        self._matCurrent[-1] = asmatrix(m)
+        self.getTopArray()[...] = m
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     def push(self):
-        MC = self._matCurrent
-        MC.append(MC[-1].copy())
+        self._matCurrent.push()
         return self
     def pop(self):
         self._matCurrent.pop()
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+    def multMatrix(self, m):
+        """Right multiplies the top matrix by m in place"""
+        top = self.getTopArray()
+        scratch = self._matScratch
+        numpy.dot(top, numpy.asarray(m, self.dtype), scratch)
+        top[...] = scratch
+        return self
+
+    def multTransform(self, xf):
+        """Right multiplies the top matrix by an Affine2D, Quaternion or RigidTransform in place"""
+        composeOnto = getattr(xf, 'composeOnto', None)
+        if composeOnto is not None:
+            composeOnto(self.getTopArray())
+            return self
+        return self.multMatrix(xf.toMatrix(self.dtype))
+
     def ortho(self, x0, x1, y0, y1, z0, z1):
         w = (x1-x0); tx = (x1+x0)/w;
         h = (y1-y0); ty = (y1+y0)/h;
         d = (z1-z0); tz = (z1+z0)/d;
 
-        m = asmatrix(
+        m = array(
            [[2./w,   0.,    0., -tx],
             [  0., 2./h,    0., -ty],
             [  0.,   0., -2./d, -tz],
-            [  0.,   0.,    0.,  1.]], 'd')
+            [  0.,   0.,    0.,  1.]], self.dtype)
 
-        self.top *= m
-        return self
+        return self.multMatrix(m)
 
     def identity(self):
         self.top = identity(4)
         return self
 
     def scale(self, sx=1., sy=1., sz=1.):
-        m = identity(4)
-        m *= [sx,sy,sz,1.]
-        self.top *= m
+        top = self.getTopArray()
+        top[:, 0] *= sx
+        top[:, 1] *= sy
+        top[:, 2] *= sz
         return self
 
     def translate(self, tx=0., ty=0., tz=0.):
-        m = identity(4)
-        m[:,3] = [tx,ty,tz,1.]
-        self.top *= m
+        top = self.getTopArray()
+        top[:, 3] += top[:, 0]*tx + top[:, 1]*ty + top[:, 2]*tz
         return self
 
     def rotate(self, a=0., vx=0., vy=0., vz=1.):
         a = radians(a)
+        if vz == 1. and not (vx or vy):
+            # rotation in the xy plane only mixes the x and y columns
+            top = self.getTopArray()
+            ca = cos(a); sa = sin(a)
+            c0 = top[:, 0].copy(); c1 = top[:, 1]
+            top[:, 0] = c0*ca + c1*sa
+            top[:, 1] = c1*ca - c0*sa
+            return self
+
         u = array([vx,vy,vz,0], 'd')
 
         uut = outer(u,u)
@@ -95,8 +155,81 @@ class MatrixStack(object):
 
         R = uut + numpy.cos(a)*M + numpy.sin(a)*S
         R[3,3] = 1.
-        self.top *= R
-        return self
+        return self.multMatrix(R)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Geometry transforms
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def transformPoints(self, pts, out=None):
+        """Applies the top matrix to (..., 2|3) points, returning (..., 2|3) points
+
+        2d points are taken to lie on z=0.  out may be pts itself to
+        transform in place; the points are otherwise not copied.
+        """
+        return transformPoints(self.getTopArray(), pts, out)
+
+    def transformBoxes(self, boxes, out=None):
+        """Returns the axis aligned bounds of boxes under the top matrix
+
+        boxes is a Box, BoxArray or (..., 2, dim) box data; a Box class
+        input returns the same class.
+        """
+        return transformBoxes(self.getTopArray(), boxes, out)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def isAffine(m):
+    return not (m[3, :3].any() or m[3, 3] != 1)
+
+def transformPoints(m, pts, out=None):
+    """Applies the 4x4 matrix m to (..., 2|3) points"""
+    pts = numpy.asarray(pts)
+    dim = pts.shape[-1]
+    if dim not in (2, 3):
+        raise ValueError("Points must be 2 or 3 dimensional, not %r" % (dim,))
+    if out is None:
+        out = numpy.empty(pts.shape, numpy.result_type(pts.dtype, m.dtype, numpy.float32))
+
+    w = None
+    if not isAffine(m):
+        w = numpy.dot(pts, m[3, :dim]) + m[3, 3]
+    numpy.matmul(pts, m[:dim, :dim].T, out=out)
+    out += m[:dim, 3]
+    if w is not None:
+        out /= w[..., None]
+    return out
+
+def transformBoxes(m, boxes, out=None):
+    """Returns the axis aligned bounds of (..., 2, dim) boxes transformed by the 4x4 matrix m"""
+    getDataRef = getattr(boxes, 'getDataRef', None)
+    data = numpy.asarray(getDataRef() if getDataRef is not None else boxes)
+    dim = data.shape[-1]
+    if out is None:
+        out = numpy.empty(data.shape, numpy.result_type(data.dtype, m.dtype, numpy.float32))
+
+    mdim = m[:dim, :dim]
+    if isAffine(m) and not (mdim - numpy.diag(mdim.diagonal())).any():
+        # scale and translate only: the corners stay corners
+        transformPoints(m, data, out)
+        flip = mdim.diagonal() < 0
+        if flip.any():
+            out[..., flip] = out[..., ::-1, :][..., flip]
+    else:
+        corners = data[..., cornerIndex[dim], numpy.arange(dim)]
+        corners = transformPoints(m, corners)
+        corners.min(-2, out=out[..., 0, :])
+        corners.max(-2, out=out[..., 1, :])
+
+    if getDataRef is not None:
+        return boxes.fromArray(out)
+    return out
+
+cornerIndex = {
+    2: numpy.array([[0, 0], [1, 0], [0, 1], [1, 1]]),
+    3: numpy.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0],
+                    [0, 0, 1], [1, 0, 1], [0, 1, 1], [1, 1, 1]]),
+    }
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Main 
@@ -0,0 +1,183 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Memory mapped storage for Vector, ColorVector and Box data
+
+Files hold a small header followed by the raw C-ordered payload:
+
+    magic           'TGGEO\\x01\\n'
+    header size     4 byte little endian unsigned int
+    header          json: class, dtype, shape, offset
+    padding         up to `offset`, aligned to `payloadAlignment`
+    payload         raw array data
+
+load() maps the payload with numpy.memmap and wraps it in the recorded
+class without reading or copying it, so large files open immediately and
+processes mapping the same file share its pages.
+"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import json
+import struct
+
+import numpy
+from numpy import ndarray
+
+from .vector import Vector
+from .box import BoxBase
+from .boxArray import BoxArray
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Constants
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+magic = 'TGGEO\x01\n'
+payloadAlignment = 64
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def className(klass):
+    return '%s:%s' % (klass.__module__, klass.__name__)
+
+# headers may name classes from modules under this package, or classes
+# registered here; nothing else is imported when loading a file
+packagePrefix = __name__.rsplit('.', 2)[0] + '.'
+storableClasses = {}
+
+def registerStorable(klass):
+    """Allows load() to return klass, for Vector and Box classes defined outside this package"""
+    if not issubclass(klass, (Vector, BoxBase, ndarray)):
+        raise TypeError("Only Vector, Box and ndarray classes can be stored")
+    storableClasses[className(klass)] = klass
+    return klass
+
+def classFromName(name):
+    """Returns the class recorded in a header; only Vector and Box classes are accepted"""
+    klass = storableClasses.get(name)
+    if klass is None:
+        moduleName, sep, klassName = name.partition(':')
+        if not sep or not moduleName.startswith(packagePrefix):
+            raise TypeError("Class %r cannot be loaded from geometry storage" % (name,))
+        module = __import__(str(moduleName), {}, {}, [str(klassName)])
+        klass = getattr(module, klassName, None)
+    if not isinstance(klass, type) or not issubclass(klass, (Vector, BoxBase, ndarray)):
+        raise TypeError("Class %r cannot be loaded from geometry storage" % (name,))
+    return klass
+
+registerStorable(ndarray)
+
+def asStorable(obj):
+    """Returns (klass, ndarray data) for a Vector, Box, ndarray or sequence of Boxes"""
+    if isinstance(obj, BoxBase):
+        return type(obj), obj.getDataRef()
+    elif isinstance(obj, ndarray):
+        return type(obj), obj.view(ndarray)
+    elif obj and isinstance(obj[0], BoxBase):
+        return BoxArray, BoxArray.fromBoxes(obj).getDataRef()
+    else:
+        raise TypeError("Expected a Vector, Box, ndarray or sequence of Boxes")
+
+def wrapData(klass, data):
+    if issubclass(klass, BoxBase):
+        return klass.fromArray(data.view(ndarray))
+    elif klass is not ndarray:
+        return data.view(klass)
+    return data
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Header
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def writeHeader(f, klass, dtype, shape):
+    header = {'class': className(klass), 'dtype': numpy.dtype(dtype).str, 'shape': [int(n) for n in shape]}
+
+    # offset is part of the header, so size the header with a placeholder of the final width
+    prefix = len(magic) + 4
+    header['offset'] = 0
+    size = len(json.dumps(header)) + 16
+    offset = -(-(prefix + size) // payloadAlignment) * payloadAlignment
+    header['offset'] = offset
+    headerData = json.dumps(header).ljust(offset - prefix)
+
+    f.write(magic)
+    f.write(struct.pack('<I', len(headerData)))
+    f.write(headerData)
+    return header
+
+def readHeader(f):
+    """Returns the header dict of an open file or filename"""
+    if isinstance(f, basestring):
+        f = open(f, 'rb')
+        try: return readHeader(f)
+        finally: f.close()
+
+    if f.read(len(magic)) != magic:
+        raise ValueError("Not a geometry storage file")
+    size, = struct.unpack('<I', f.read(4))
+    header = json.loads(f.read(size))
+    header['shape'] = tuple(header['shape'])
+    return header
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Save, load and create
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def save(filename, obj):
+    """Writes obj to filename; returns the header written"""
+    klass, data = asStorable(obj)
+    f = open(filename, 'wb')
+    try:
+        header = writeHeader(f, klass, data.dtype, data.shape)
+        numpy.ascontiguousarray(data).tofile(f)
+    finally:
+        f.close()
+    return header
+
+def load(filename, mode='r'):
+    """Maps filename and returns its data wrapped in the recorded class
+
+    mode follows numpy.memmap: 'r' is read only, 'r+' writes through to the
+    file, and 'c' is copy on write.
+    """
+    header = readHeader(filename)
+    klass = classFromName(header['class'])
+    if not numpy.prod(header['shape']):
+        # mmap cannot map an empty region
+        return wrapData(klass, numpy.zeros(header['shape'], header['dtype']))
+    data = numpy.memmap(filename, header['dtype'], mode, header['offset'], header['shape'])
+    return wrapData(klass, data)
+
+def create(filename, klass, shape, dtype=None):
+    """Creates filename sized for shape and returns a writable mapped instance of klass"""
+    if dtype is None:
+        if issubclass(klass, BoxBase):
+            dtype = klass.dtype_default
+        else: dtype = getattr(klass, 'default_dtype', numpy.float)
+    f = open(filename, 'wb')
+    try:
+        header = writeHeader(f, klass, dtype, shape)
+        size = header['offset'] + numpy.dtype(dtype).itemsize * int(numpy.prod(shape))
+        if size > f.tell():
+            f.seek(size-1)
+            f.write('\0')
+    finally:
+        f.close()
+    return load(filename, 'r+')
+
+def flush(obj):
+    """Flushes pending writes of a mapped Vector or Box to its file"""
+    data = obj.getDataRef() if isinstance(obj, BoxBase) else obj
+    while data is not None and not isinstance(data, numpy.memmap):
+        data = data.base
+    if data is not None:
+        data.flush()
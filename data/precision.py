@@ -0,0 +1,98 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Floating point precision policies
+
+A policy names the dtype floating point data is stored in, and the dtype
+computations on that data should be carried out in.  Vector, Box and data
+property templates store untyped floating point data using the policy of
+their class, or the global policy when the class does not set `precision`.
+
+Explicit dtypes always win; the policy only replaces the float64 that
+numpy would otherwise pick.
+"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import numpy
+from numpy import asanyarray
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class PrecisionPolicy(object):
+    def __init__(self, name, storage, compute=None):
+        self.name = name
+        self.storage = numpy.dtype(storage)
+        if compute is None:
+            compute = storage
+        self.compute = numpy.dtype(compute)
+
+    def __repr__(self):
+        return '<%s %s storage:%s compute:%s>' % (self.__class__.__name__, self.name, self.storage, self.compute)
+
+    def asStorage(self, data):
+        """Returns floating point data in the storage dtype; other data is returned unchanged"""
+        data = asanyarray(data)
+        if data.dtype.kind == 'f' and data.dtype != self.storage:
+            data = data.astype(self.storage)
+        return data
+
+    def asCompute(self, data):
+        """Returns floating point data in the compute dtype, without copying when it already is"""
+        data = asanyarray(data)
+        if data.dtype.kind == 'f' and data.dtype != self.compute:
+            data = data.astype(self.compute)
+        return data
+
+precisionPolicies = {
+    'float64': PrecisionPolicy('float64', 'd'),
+    'float32': PrecisionPolicy('float32', 'f'),
+    'float16': PrecisionPolicy('float16', 'e', 'f'),
+    }
+
+_globalPolicy = [precisionPolicies['float64']]
+
+def asPrecision(policy):
+    """Resolves a policy name, policy, or None (the global policy)"""
+    if policy is None:
+        return _globalPolicy[0]
+    if isinstance(policy, basestring):
+        return precisionPolicies[policy]
+    return policy
+
+def getPrecision():
+    return _globalPolicy[0]
+def setPrecision(policy):
+    """Sets the global policy and returns the previous one.
+
+    Affects data created afterwards; data property templates keep the
+    policy in effect when their class was defined, unless the host class
+    sets `precision`.
+    """
+    previous = _globalPolicy[0]
+    _globalPolicy[0] = asPrecision(policy)
+    return previous
+
+def precisionFor(klass):
+    """Returns the policy for a class (or instance) from its `precision` attribute"""
+    return asPrecision(getattr(klass, 'precision', None))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class PrecisionDtype(object):
+    """Class attribute resolving to the storage dtype of the owning class's policy
+
+    Used for Vector.default_dtype and Box.dtype_default; subclasses may
+    still assign a fixed dtype in their place.
+    """
+    def __get__(self, obj, klass):
+        return precisionFor(klass).storage
@@ -0,0 +1,114 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Shared memory Vector and Box buffers for process pools
+
+Shared buffers are mmapStore files in /dev/shm (or the temp directory
+where there is no /dev/shm), mapped write-through by every process that
+attaches them.  A SharedHandle names the buffer and pickles to a few bytes,
+so a pool worker can attach it and write its results in place instead of
+pickling them back.
+
+The allocating process unlinks its buffers at exit; call
+SharedHandle.unlink() to release them sooner.
+"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import os
+import atexit
+import tempfile
+
+import numpy
+
+from . import mmapStore
+from .box import BoxBase
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Constants
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if os.path.isdir('/dev/shm'):
+    sharedDir = '/dev/shm'
+else: sharedDir = tempfile.gettempdir()
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class SharedHandle(object):
+    """Picklable reference to a shared buffer"""
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.filename)
+
+    def __eq__(self, other):
+        return isinstance(other, SharedHandle) and self.filename == other.filename
+    def __ne__(self, other):
+        return not self.__eq__(other)
+    def __hash__(self):
+        return hash(self.filename)
+
+    def header(self):
+        return mmapStore.readHeader(self.filename)
+
+    def attach(self, mode='r+'):
+        """Maps the buffer into this process as its Vector or Box class"""
+        return mmapStore.load(self.filename, mode)
+
+    def unlink(self):
+        """Removes the buffer; processes already attached keep their mapping"""
+        _owned.pop(self.filename, None)
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_owned = {}
+
+def _unlinkOwned():
+    pid = os.getpid()
+    for filename, ownerPid in _owned.items():
+        if ownerPid == pid and os.path.exists(filename):
+            os.remove(filename)
+atexit.register(_unlinkOwned)
+
+def allocShared(klass, shape, dtype=None, prefix='tggeo-'):
+    """Returns a zeroed instance of klass (a Vector or Box class) backed by shared memory"""
+    fd, filename = tempfile.mkstemp('.geo', prefix, sharedDir)
+    os.close(fd)
+    _owned[filename] = os.getpid()
+    return mmapStore.create(filename, klass, shape, dtype)
+
+def shareCopy(obj):
+    """Returns a shared memory copy of a Vector, Box or sequence of Boxes"""
+    klass, data = mmapStore.asStorable(obj)
+    result = allocShared(klass, data.shape, data.dtype)
+    if isinstance(result, BoxBase):
+        result.getDataRef()[...] = data
+    else: result[...] = data
+    return result
+
+def sharedHandleOf(obj):
+    """Returns the SharedHandle for a shared Vector or Box, or a view of one"""
+    data = obj.getDataRef() if isinstance(obj, BoxBase) else obj
+    while data is not None and not isinstance(data, numpy.memmap):
+        data = getattr(data, 'base', None)
+    if data is None or data.filename is None:
+        raise ValueError("Object is not backed by a shared buffer")
+    return SharedHandle(data.filename)
+
+def attachShared(handle, mode='r+'):
+    if not isinstance(handle, SharedHandle):
+        handle = SharedHandle(handle)
+    return handle.attach(mode)
@@ -0,0 +1,350 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Spatial index over box corner data
+
+BoxGridIndex buckets boxes into a uniform grid of cells, so point picks
+and rectangle queries only test the boxes sharing cells with the query
+instead of scanning every box.  Box data is anything with (..., 2, dim)
+corners -- a Box, a BoxArray, or a raw ndarray.
+"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import numpy
+from numpy import asarray
+
+from . import boxQuery
+from .precision import PrecisionDtype
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def boxDistance(pt, boxes):
+    """Returns the euclidean distance from pt to each box; zero inside the box"""
+    boxes = asarray(boxes)
+    delta = numpy.maximum(boxes[..., 0, :] - pt, pt - boxes[..., 1, :])
+    delta = numpy.maximum(delta, 0)
+    return numpy.sqrt((delta*delta).sum(-1))
+
+def expandCellRanges(c0, c1):
+    """Expands inclusive (N, dim) cell ranges into (owner, cells) rows
+
+    owner indexes the range each row of cells came from.
+    """
+    span = (c1 - c0) + 1
+    counts = span.prod(-1)
+    owner = numpy.repeat(numpy.arange(len(c0)), counts)
+    local = numpy.arange(counts.sum()) - numpy.repeat(counts.cumsum() - counts, counts)
+
+    cells = numpy.empty((len(owner), c0.shape[-1]), int)
+    for d in xrange(c0.shape[-1]-1, -1, -1):
+        spand = span[owner, d]
+        cells[:, d] = c0[owner, d] + (local % spand)
+        local //= spand
+    return owner, cells
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Uniform Grid Index
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class BoxGridIndex(object):
+    """Uniform grid of cells, each holding the set of box ids overlapping it.
+
+    Box ids are small integers handed out by insert() and bulkLoad(); an
+    optional item may be stored with each box, for example the LayoutCell
+    the box belongs to.
+
+    Boxes spanning more than maxBoxCells cells, such as the root window of
+    a nested layout, are kept in a separate set that every query tests
+    directly instead of being registered in each of their cells.
+    """
+    precision = None
+    dtype_default = PrecisionDtype()
+    minCapacity = 16
+    maxBoxCells = 256
+
+    def __init__(self, cellSize=1., dim=2, origin=None, dtype=None):
+        if dtype is None: dtype = self.dtype_default
+        self.cellSize = numpy.ones(dim, float) * cellSize
+        if origin is None:
+            origin = numpy.zeros(dim, float)
+        self.origin = asarray(origin, float)
+        self.clear(dtype)
+
+    @classmethod
+    def fromBoxes(klass, boxes, items=None, cellSize=None, origin=None):
+        """Bulk loads (N, 2, dim) box data; cellSize defaults to the mean box size
+
+        A few large boxes inflate the mean; boxes that still end up covering
+        more than maxBoxCells cells are held outside the grid.
+        """
+        boxes = boxQuery.asBoxData(boxes)
+        if cellSize is None:
+            cellSize = klass.cellSizeFor(boxes)
+        if origin is None and len(boxes):
+            origin = boxes[:, 0].min(0)
+        self = klass(cellSize, boxes.shape[-1], origin, boxes.dtype)
+        self.bulkLoad(boxes, items)
+        return self
+
+    @staticmethod
+    def cellSizeFor(boxes):
+        if not len(boxes):
+            return 1.
+        size = (boxes[:, 1] - boxes[:, 0]).mean(0)
+        return numpy.where(size > 0, size, 1.)
+
+    def clear(self, dtype=None):
+        if dtype is None: dtype = self._boxes.dtype
+        self._boxes = numpy.zeros((0, 2, len(self.cellSize)), dtype)
+        self._alive = numpy.zeros(0, bool)
+        self._cellRanges = numpy.zeros((0, 2, len(self.cellSize)), int)
+        self._free = []
+        self._top = 0
+        self._cells = {}
+        self._large = set()
+        # grows as boxes are added and is never shrunk, so it always covers
+        # every live box; nearest() stops widening once it reaches these
+        self._bounds = numpy.array([[numpy.inf]*len(self.cellSize), [-numpy.inf]*len(self.cellSize)])
+        self.items = {}
+
+    def __len__(self):
+        return int(self._alive.sum())
+
+    def __contains__(self, boxId):
+        return 0 <= boxId < len(self._alive) and bool(self._alive[boxId])
+
+    def ids(self):
+        return self._alive.nonzero()[0]
+
+    def boxOf(self, boxId):
+        return self._boxes[boxId]
+
+    def itemOf(self, boxId, default=None):
+        return self.items.get(boxId, default)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Grid cells
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def cellOf(self, pts):
+        pts = asarray(pts)
+        return numpy.floor((pts - self.origin) / self.cellSize).astype(int)
+
+    def cellRangeOf(self, boxes):
+        return self.cellOf(boxes)
+
+    def _isLarge(self, cellRanges):
+        return ((cellRanges[..., 1, :] - cellRanges[..., 0, :]) + 1).prod(-1) > self.maxBoxCells
+
+    def _addToCells(self, ids, cellRanges):
+        large = self._isLarge(cellRanges)
+        if large.any():
+            self._large.update(ids[large].tolist())
+            ids = ids[~large]; cellRanges = cellRanges[~large]
+
+        owner, cells = expandCellRanges(cellRanges[:, 0], cellRanges[:, 1])
+        owner = ids[owner]
+        cellMap = self._cells
+        for key, boxId in zip(map(tuple, cells.tolist()), owner.tolist()):
+            entry = cellMap.get(key)
+            if entry is None:
+                cellMap[key] = set([boxId])
+            else: entry.add(boxId)
+
+    def _removeFromCells(self, boxId):
+        if boxId in self._large:
+            self._large.discard(boxId)
+            return
+        cr = self._cellRanges[boxId:boxId+1]
+        owner, cells = expandCellRanges(cr[:, 0], cr[:, 1])
+        cellMap = self._cells
+        for key in map(tuple, cells.tolist()):
+            entry = cellMap[key]
+            entry.discard(boxId)
+            if not entry:
+                del cellMap[key]
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Storage
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def _allocIds(self, count):
+        free = self._free
+        nReuse = min(count, len(free))
+        ids = [free.pop() for i in xrange(nReuse)]
+
+        n = self._top
+        nNew = count - nReuse
+        if nNew:
+            self._growTo(n + nNew)
+            ids.extend(xrange(n, n + nNew))
+            self._top = n + nNew
+        return numpy.array(ids, int)
+
+    def _growTo(self, n):
+        capacity = len(self._alive)
+        if n <= capacity:
+            return
+        n = max(n, 2*capacity, self.minCapacity)
+        def grow(a):
+            r = numpy.zeros((n,) + a.shape[1:], a.dtype)
+            r[:capacity] = a
+            return r
+        self._boxes = grow(self._boxes)
+        self._alive = grow(self._alive)
+        self._cellRanges = grow(self._cellRanges)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Mutation
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def bulkLoad(self, boxes, items=None):
+        """Adds (N, 2, dim) box data and returns the (N,) array of new box ids"""
+        boxes = boxQuery.asBoxData(boxes)
+        ids = self._allocIds(len(boxes))
+        if not len(ids):
+            return ids
+
+        cellRanges = self.cellRangeOf(boxes)
+        self._boxes[ids] = boxes
+        self._cellRanges[ids] = cellRanges
+        self._alive[ids] = True
+        self._addToCells(ids, cellRanges)
+        self._extendBounds(boxes)
+
+        if items is not None:
+            self.items.update(zip(ids.tolist(), items))
+        return ids
+
+    def insert(self, box, item=None):
+        """Adds a single box and returns its id"""
+        boxId = int(self.bulkLoad(box)[0])
+        if item is not None:
+            self.items[boxId] = item
+        return boxId
+
+    def remove(self, boxId):
+        if boxId not in self:
+            raise KeyError(boxId)
+        self._removeFromCells(boxId)
+        self._alive[boxId] = False
+        self._free.append(boxId)
+        self.items.pop(boxId, None)
+
+    def _extendBounds(self, boxes):
+        bounds = self._bounds
+        numpy.minimum(bounds[0], boxes[..., 0, :].reshape(-1, bounds.shape[-1]).min(0), bounds[0])
+        numpy.maximum(bounds[1], boxes[..., 1, :].reshape(-1, bounds.shape[-1]).max(0), bounds[1])
+
+    def update(self, boxId, box):
+        """Moves boxId to the new box corners; cells are only touched when they change"""
+        if boxId not in self:
+            raise KeyError(boxId)
+        box = asarray(box)
+        cellRange = self.cellRangeOf(box)
+        if (cellRange != self._cellRanges[boxId]).any():
+            self._removeFromCells(boxId)
+            self._cellRanges[boxId] = cellRange
+            self._addToCells(numpy.array([boxId]), cellRange[None])
+        self._boxes[boxId] = box
+        self._extendBounds(box)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Queries
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def _candidatesInCellRange(self, cellRange):
+        cellMap = self._cells
+        span = (cellRange[1] - cellRange[0]) + 1
+        if span.prod() > len(cellMap):
+            # cheaper to walk the populated cells than the empty ones
+            c0, c1 = cellRange
+            keys = [k for k in cellMap if (c0 <= k).all() and (k <= c1).all()]
+        else:
+            owner, cells = expandCellRanges(cellRange[None, 0], cellRange[None, 1])
+            keys = map(tuple, cells.tolist())
+
+        result = set(self._large)
+        for key in keys:
+            entry = cellMap.get(key)
+            if entry: result.update(entry)
+        return numpy.fromiter(result, int, len(result))
+
+    def queryPoint(self, pt):
+        """Returns the sorted ids of the boxes containing pt"""
+        pt = asarray(pt)
+        entry = self._cells.get(tuple(self.cellOf(pt).tolist()))
+        if self._large:
+            entry = self._large.union(entry or ())
+        if not entry:
+            return numpy.zeros(0, int)
+        cand = numpy.fromiter(entry, int, len(entry))
+        boxes = self._boxes[cand]
+        hit = ((boxes[:, 0] <= pt) & (boxes[:, 1] >= pt)).all(-1)
+        return numpy.sort(cand[hit])
+
+    def queryPoints(self, pts):
+        """Returns (ptIdx, boxId) index arrays of every box containing each point"""
+        pts = asarray(pts).reshape(-1, len(self.cellSize))
+        cells = self.cellOf(pts)
+
+        order = numpy.lexsort(cells.T[::-1])
+        cells = cells[order]
+        change = (cells[1:] != cells[:-1]).any(-1)
+        starts = numpy.concatenate([[0], change.nonzero()[0]+1, [len(cells)]])
+
+        results = []
+        cellMap = self._cells
+        for i0, i1 in zip(starts[:-1], starts[1:]):
+            entry = cellMap.get(tuple(cells[i0].tolist()))
+            if not entry: continue
+            cand = numpy.fromiter(entry, int, len(entry))
+            ptIdx = order[i0:i1]
+            pi, bi = boxQuery.pointsInBoxes(pts[ptIdx], self._boxes[cand])
+            results.append((ptIdx[pi], cand[bi]))
+
+        if self._large:
+            cand = numpy.fromiter(self._large, int, len(self._large))
+            pi, bi = boxQuery.pointsInBoxes(pts, self._boxes[cand])
+            results.append((pi, cand[bi]))
+        return boxQuery._concatIdxPairs(results)
+
+    def queryRect(self, box, closed=True):
+        """Returns the sorted ids of the boxes overlapping box"""
+        box = asarray(box)
+        cand = self._candidatesInCellRange(self.cellRangeOf(box))
+        if not len(cand):
+            return cand
+        hit = boxQuery.boxesOverlapChunk(box[None], self._boxes[cand], closed)[0]
+        return numpy.sort(cand[hit])
+
+    def nearest(self, pt):
+        """Returns (boxId, distance) of the box closest to pt, or (None, inf) when empty"""
+        pt = asarray(pt, float)
+        if not len(self):
+            return None, numpy.inf
+
+        reach = self.cellSize.min()
+        boundsMin, boundsMax = self._bounds
+        while True:
+            query = numpy.array([pt - reach, pt + reach])
+            # once the query covers the bounds, every live box is a candidate
+            covered = (query[0] <= boundsMin).all() and (query[1] >= boundsMax).all()
+            cand = self.queryRect(query)
+            if len(cand):
+                dist = boxDistance(pt, self._boxes[cand])
+                i = dist.argmin()
+                # any box closer than reach must overlap the query rect
+                if covered or dist[i] <= reach:
+                    return int(cand[i]), float(dist[i])
+            reach *= 2
@@ -16,9 +16,12 @@ through numpy.
 #~ Imports 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+import re
+import keyword
+import operator as opmodule
+
 import numpy
 from numpy import ndarray
-import operator as opmodule
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -150,6 +153,12 @@ class Operator(SymbolicMathMixin):
     def eval(self, values=(), **kwvalues):
         return evalExpr(self, values, **kwvalues)
 
+    def compile(self):
+        return compileExpr(self)
+
+    def simplify(self):
+        return simplifyExpr(self)
+
 def vop2(op, a, b):
     return ufunc_op2(Operator(op, a), b)
 
@@ -179,6 +188,9 @@ class Symbol(SymbolicMathMixin):
     def eval(self, values=(), **kwvalues):
         return evalExpr(self, values, **kwvalues)
 
+    def compile(self):
+        return compileExpr(self)
+
 class SymbolFactory(object):
     def __getattr__(self, name):
         return Symbol(name)
@@ -240,13 +252,16 @@ class ExprEvaluator(object):
 
         ('**', 2): opmodule.pow,
         ('pow', 2): opmodule.pow,
-        ('pow', 3): opmodule.pow,
+        ('pow', 3): pow,
 
         ('+', 1): opmodule.pos,
         ('-', 1): opmodule.neg,
         ('abs', 1): opmodule.abs,
     }
 
+    # operator results of the outermost visit() in progress; None between calls
+    _memo = None
+
     def __init__(self, values=(), **kwvalues):
         self.values = dict(values)
         self.values.update(kwvalues)
@@ -262,6 +277,14 @@ class ExprEvaluator(object):
 
     def visit(self, item, **kwvalues):
         self.update(kwvalues)
+        if self._memo is None:
+            # values may change between calls, so results are only shared within one
+            self._memo = {}
+            try: 
+                return self.visit(item)
+            finally: 
+                self._memo = None
+
         accept = getattr(item, 'accept', None)
         if accept is None:
             return self.visitBasic(item)
@@ -282,12 +305,600 @@ class ExprEvaluator(object):
         return self.values.get(symbol.name, symbol)
 
     def visitOperator(self, operator):
+        # operators shared by several parents, as after simplifyExpr, are evaluated once
+        memo = self._memo
+        if memo is None:
+            return self.visit(operator)
+        result = memo.get(id(operator), memo)
+        if result is not memo:
+            return result
+
         operands = [self.visit(opand) for opand in operator.operands]
         opfn = self.opTable[operator.op, len(operands)]
-        return opfn(*operands)
+        result = opfn(*operands)
+        memo[id(operator)] = result
+        return result
 ExprEval = ExprEvaluator
 evalExpr = ExprEval.evaluate
 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Expression Simplifier
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def exprNodeCounts(expr):
+    """Returns (total, unique) operator counts of expr
+
+    total is the number of operators a tree walk such as ExprEvaluator
+    without sharing visits; unique counts each shared operator once, as
+    the compiled or memoized evaluation does.
+    """
+    totals = {}
+    def total(item):
+        if isinstance(item, Operator):
+            entry = totals.get(id(item))
+            if entry is None:
+                entry = totals[id(item)] = 1 + sum(total(e) for e in item.operands)
+            return entry
+        elif isinstance(item, ndarray) and item.dtype.kind == 'O':
+            return sum(total(e) for e in item.flat)
+        elif isinstance(item, (list, tuple)):
+            return sum(total(e) for e in item)
+        return 0
+    return total(expr), len(totals)
+
+class ExprSimplifier(object):
+    """Rewrites an expression as a DAG of unique operators
+
+    Operators are hash-consed on their op and operands, so equal subterms
+    anywhere in the expression, including across the elements of a
+    symbolic array, become one shared node.  Operators on constants are
+    folded, as are the identities SymbolicMathMixin folds while building
+    (x+0, x*1, x*0, x/1, x**1, x**0) and double negation.  After
+    simplify(), `stats` holds the node counts before and after.
+    """
+    opTable = ExprEvaluator.opTable
+
+    def __init__(self):
+        self._nodes = {}
+        self._symbols = {}
+        self._memo = {}
+        self.folded = 0
+        self.stats = {}
+
+    @classmethod
+    def simplifyExpr(klass, expr):
+        return klass().simplify(expr)
+
+    def simplify(self, expr):
+        nodes, uniqueNodes = exprNodeCounts(expr)
+        result = self.visit(expr)
+        simplifiedNodes, sharedNodes = exprNodeCounts(result)
+        self.stats = dict(nodes=nodes, uniqueNodes=uniqueNodes,
+                simplifiedNodes=simplifiedNodes, sharedNodes=sharedNodes,
+                folded=self.folded)
+        return result
+
+    def visit(self, item):
+        accept = getattr(item, 'accept', None)
+        if accept is None:
+            return self.visitBasic(item)
+        else: return accept(self)
+    __call__ = visit
+
+    def visitBasic(self, item):
+        if isinstance(item, ndarray) and item.dtype.kind == 'O':
+            r = numpy.empty(item.shape, 'object')
+            for i, e in enumerate(item.flat):
+                r.flat[i] = self.visit(e)
+            return r
+        if isinstance(item, list):
+            return [self.visit(e) for e in item]
+        if isinstance(item, tuple):
+            return tuple(self.visit(e) for e in item)
+        return item
+
+    def visitSymbol(self, symbol):
+        return self._symbols.setdefault(symbol.name, symbol)
+
+    def visitOperator(self, operator):
+        entry = self._memo.get(id(operator))
+        if entry is not None and entry[0] is operator:
+            return entry[1]
+
+        operands = tuple(self.visit(opand) for opand in operator.operands)
+        result = self.fold(operator.op, operands)
+        self._memo[id(operator)] = (operator, result)
+        return result
+
+    #~ folding and hash-consing ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def fold(self, op, operands):
+        if all(_isNumber(e) for e in operands):
+            opfn = self.opTable.get((op, len(operands)))
+            if opfn is not None:
+                try: 
+                    result = opfn(*operands)
+                except (ArithmeticError, ValueError, TypeError):
+                    pass
+                else:
+                    self.folded += 1
+                    return result
+
+        result = self.foldIdentity(op, operands)
+        if result is not None:
+            self.folded += 1
+            return result[0]
+        return self.intern(op, operands)
+
+    def foldIdentity(self, op, operands):
+        """Returns (replacement,) when op on operands reduces to something simpler, or None"""
+        if len(operands) == 1:
+            a, = operands
+            if op == '+':
+                return (a,)
+            if op == '-' and isinstance(a, Operator) and a.op == '-' and len(a.operands) == 1:
+                return (a.operands[0],)
+            return None
+
+        if len(operands) != 2:
+            return None
+        a, b = operands
+        if op == '+':
+            if _isValue(a, 0): return (b,)
+            if _isValue(b, 0): return (a,)
+        elif op == '-':
+            if _isValue(b, 0): return (a,)
+            if _isValue(a, 0): return (self.fold('-', (b,)),)
+        elif op == '*':
+            if _isValue(a, 1): return (b,)
+            if _isValue(b, 1): return (a,)
+            if _isValue(a, 0): return (a,)
+            if _isValue(b, 0): return (b,)
+        elif op in ('/', '/!'):
+            if _isValue(b, 1): return (a,)
+        elif op == '**':
+            if _isValue(b, 1): return (a,)
+            if _isValue(b, 0): return (1,)
+        return None
+
+    def intern(self, op, operands):
+        key = (op,) + tuple(self.operandKey(e) for e in operands)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Operator(op, *operands)
+            self._nodes[key] = node
+        return node
+
+    def operandKey(self, item):
+        if isinstance(item, Symbol):
+            return ('sym', item.name)
+        if _isNumber(item):
+            return ('num', type(item), item)
+        # operators are already interned, so identity is structural equality
+        return ('id', id(item))
+
+def _isNumber(item):
+    return isinstance(item, numbers) and not isinstance(item, bool)
+def _isValue(item, value):
+    return _isNumber(item) and item == value
+
+def simplifyExpr(expr):
+    """Returns expr with constants folded and common subexpressions shared"""
+    return ExprSimplifier.simplifyExpr(expr)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Expression Compiler
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def _asArray(items, shape):
+    r = numpy.array(items)
+    return r.reshape(shape + r.shape[1:])
+
+def _stackBatch(items, shape):
+    """Stacks per element results of broadcast batch shape B into a B + shape array"""
+    if not items:
+        return numpy.zeros(shape)
+    arrays = numpy.broadcast_arrays(*[numpy.asarray(e) for e in items])
+    r = numpy.stack(arrays, -1)
+    return r.reshape(r.shape[:-1] + shape)
+
+def _stackNested(result, batchShape, shape):
+    """Stacks the nested list results of a compiled list into a batchShape + shape array"""
+    if not isinstance(result, list):
+        return numpy.broadcast_to(numpy.asarray(result), batchShape + shape)
+    if not result:
+        return numpy.zeros(batchShape + shape)
+    parts = [_stackNested(e, batchShape, shape[1:]) for e in result]
+    return numpy.stack(parts, len(batchShape))
+
+def _broadcastShape(arrays):
+    shape = ()
+    for a in arrays:
+        shape = numpy.broadcast(numpy.broadcast_to(0, shape), a).shape
+    return shape
+
+class CompiledExpr(object):
+    """An expression compiled to a Python function
+
+    fn takes the values of `symbols` as positional arguments, or by name
+    for symbols named like identifiers, so repeated evaluation costs one
+    function call.  Symbols left unbound evaluate to themselves, as with
+    evalExpr.
+    """
+    def __init__(self, source, namespace, symbols, defaults, shape=()):
+        self.source = source
+        self.namespace = namespace
+        self.symbols = symbols
+        self.defaults = defaults
+        self.shape = shape
+        self.fn = self._define(_asArray)
+        self._batchFn = None
+
+    def _define(self, asArray):
+        ns = dict(self.namespace)
+        ns['_asArray'] = asArray
+        exec compile(self.source, '<compiled expression>', 'exec', 0, True) in ns
+        return ns['_compiled']
+
+    def __repr__(self):
+        return '<%s (%s)>' % (self.__class__.__name__, ', '.join(self.symbols))
+
+    def _args(self, values, kwvalues):
+        if values:
+            values = dict(values)
+            values.update(kwvalues)
+        else: values = kwvalues
+        get = values.get
+        return [get(name, default) for name, default in zip(self.symbols, self.defaults)]
+
+    def __call__(self, values=(), **kwvalues):
+        return self.fn(*self._args(values, kwvalues))
+    eval = __call__
+
+    def batch(self, values=(), **kwvalues):
+        """Evaluates against arrays of bindings in one call
+
+        Bindings broadcast against each other to a batch shape B, such as
+        (N,) for N sets of values; the result is a B + shape array, with
+        shape the shape of the symbolic array or list compiled, so each
+        leading index holds the result for one set of values.
+        """
+        if self.shape is None:
+            raise ValueError("Expressions of ragged nested lists cannot be batched")
+        args = self._args(values, kwvalues)
+        arrays = []
+        for i, v in enumerate(args):
+            if isinstance(v, (list, tuple)):
+                v = args[i] = numpy.asarray(v)
+            if isinstance(v, ndarray):
+                arrays.append(v)
+        batchShape = _broadcastShape(arrays)
+
+        fn = self._batchFn
+        if fn is None:
+            fn = self._batchFn = self._define(_stackBatch)
+        shape = batchShape + self.shape
+        result = fn(*args)
+        if isinstance(result, list):
+            return _stackNested(result, batchShape, self.shape).copy()
+
+        result = numpy.asarray(result)
+        if result.shape != shape:
+            # parts independent of the bindings are broadcast to the batch
+            result = numpy.broadcast_to(result, shape).copy()
+        return result
+
+class ExprCompiler(object):
+    """Compiles an expression tree to Python source, and the source to a function
+
+    Operators reached more than once through the tree are computed once
+    into a local variable.  Operators without a source template call
+    their ExprEvaluator.opTable function.
+    """
+    opSource = {
+        ('+', 2): '(%s + %s)',
+        ('-', 2): '(%s - %s)',
+        ('*', 2): '(%s * %s)',
+        ('%', 2): '(%s %% %s)',
+        ('/', 2): '(%s / %s)',
+        ('//', 2): '(%s // %s)',
+        ('**', 2): '(%s ** %s)',
+        ('pow', 2): 'pow(%s, %s)',
+        ('pow', 3): 'pow(%s, %s, %s)',
+
+        ('+', 1): '(+%s)',
+        ('-', 1): '(-%s)',
+        ('abs', 1): 'abs(%s)',
+    }
+    opTable = ExprEvaluator.opTable
+    # None, True and False are not keywords under Python 2 but still can not be argument names
+    reserved = set(['pow', 'abs', 'numpy', 'None', 'True', 'False'])
+
+    def __init__(self):
+        self.consts = {}
+        self.lines = []
+        self.symbols = []
+        self.defaults = []
+        self.argNames = {}
+        self.nodeVars = {}
+        self.refCounts = {}
+
+    @classmethod
+    def compileExpr(klass, expr):
+        return klass().compile(expr)
+
+    def compile(self, expr):
+        self.countRefs(expr)
+        result = self.visit(expr)
+
+        args = ['%s=_d%d' % (self.argNames[name], i) for i, name in enumerate(self.symbols)]
+        source = ['def _compiled(%s):' % (', '.join(args),)]
+        source.extend('    ' + line for line in self.lines)
+        source.append('    return %s' % (result,))
+        source = '\n'.join(source) + '\n'
+
+        ns = dict(self.consts)
+        ns.update(('_d%d' % i, d) for i, d in enumerate(self.defaults))
+        ns['numpy'] = numpy
+        return CompiledExpr(source, ns, tuple(self.symbols), tuple(self.defaults), self.exprShape(expr))
+
+    def exprShape(self, expr):
+        """Returns the result shape of expr, or None for ragged nested lists"""
+        if isinstance(expr, ndarray) and expr.dtype.kind == 'O':
+            return expr.shape
+        if isinstance(expr, (list, tuple)):
+            shapes = set(self.exprShape(e) for e in expr)
+            if len(shapes) > 1 or None in shapes:
+                return None
+            return (len(expr),) + (shapes.pop() if shapes else ())
+        return ()
+
+    def countRefs(self, expr):
+        refCounts = self.refCounts
+        work = [expr]
+        while work:
+            item = work.pop()
+            if isinstance(item, Operator):
+                key = id(item)
+                n = refCounts.get(key, 0)
+                refCounts[key] = n + 1
+                if not n:
+                    work.extend(item.operands)
+            elif isinstance(item, ndarray) and item.dtype.kind == 'O':
+                work.extend(item.flat)
+            elif isinstance(item, (list, tuple)):
+                work.extend(item)
+
+    def const(self, value):
+        name = '_k%d' % (len(self.consts),)
+        self.consts[name] = value
+        return name
+
+    def visit(self, item):
+        accept = getattr(item, 'accept', None)
+        if accept is None:
+            return self.visitBasic(item)
+        else: return accept(self)
+    __call__ = visit
+
+    def visitBasic(self, item):
+        if isinstance(item, numbers) and not isinstance(item, bool):
+            if isinstance(item, float) and not numpy.isfinite(item):
+                return self.const(item)
+            return '(%r)' % (item,)
+        if isinstance(item, ndarray):
+            if item.dtype.kind != 'O':
+                return self.const(item)
+            items = ', '.join(self.visit(e) for e in item.flat)
+            return '_asArray([%s], %r)' % (items, item.shape)
+        if isinstance(item, (list, tuple)):
+            return '[%s]' % (', '.join(self.visit(e) for e in item),)
+        return self.const(item)
+
+    def visitSymbol(self, symbol):
+        name = symbol.name
+        argName = self.argNames.get(name)
+        if argName is None:
+            if isinstance(name, basestring) and _identifier(name) and name not in self.reserved:
+                argName = name
+            else: argName = '_a%d' % (len(self.symbols),)
+            self.argNames[name] = argName
+            self.symbols.append(name)
+            self.defaults.append(symbol)
+        return argName
+
+    def visitOperator(self, operator):
+        key = id(operator)
+        var = self.nodeVars.get(key)
+        if var is not None:
+            return var
+
+        operands = [self.visit(opand) for opand in operator.operands]
+        opKey = (operator.op, len(operands))
+        template = self.opSource.get(opKey)
+        if template is not None:
+            src = template % tuple(operands)
+        else:
+            src = '%s(%s)' % (self.const(self.opTable[opKey]), ', '.join(operands))
+
+        if self.refCounts.get(key, 0) > 1:
+            var = '_t%d' % (len(self.nodeVars),)
+            self.lines.append('%s = %s' % (var, src))
+            self.nodeVars[key] = var
+            return var
+        return src
+
+_identifier = re.compile(r'[A-Za-z][A-Za-z0-9_]*$').match
+def _identifier(name, _match=_identifier):
+    return _match(name) is not None and not keyword.iskeyword(name)
+
+def compileExpr(expr, simplify=True):
+    """Returns the CompiledExpr for expr, cached on Operator and Symbol roots
+
+    Unless simplify is false, expr is first passed through simplifyExpr so
+    common subexpressions are computed once.
+    """
+    if not simplify:
+        return ExprCompiler.compileExpr(expr)
+
+    compiled = getattr(expr, '_compiled_', None)
+    if compiled is None:
+        compiled = ExprCompiler.compileExpr(simplifyExpr(expr))
+        if isinstance(expr, (Operator, Symbol)):
+            expr._compiled_ = compiled
+    return compiled
+
+def evalExprBatch(expr, values=(), **kwvalues):
+    """Evaluates expr against arrays of bindings, stacking the results on the leading axes
+
+    See CompiledExpr.batch.  Keep the compileExpr() result when
+    evaluating a symbolic array repeatedly; only Operator and Symbol roots
+    cache their compiled form.
+    """
+    return compileExpr(expr).batch(values, **kwvalues)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Incremental Evaluation
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class IncrementalEvaluator(object):
+    """Evaluates an expression once, then only the operators affected by changed symbols
+
+    Every operator node keeps its last value and the names of the symbols
+    it depends on.  update() recomputes just the nodes depending on
+    symbols whose values changed, in dependency order, and records in
+    `stats` how many nodes were recomputed and how many reused.  Values
+    are compared by identity, or equality for numbers; call invalidate()
+    after changing a bound array in place.
+
+    Nodes are the operators of expr as given; pass simplifyExpr(expr) to
+    also share equal subterms built separately.
+    """
+    opTable = ExprEvaluator.opTable
+
+    def __init__(self, expr, values=(), **kwvalues):
+        self.expr = expr
+        self.values = dict(values)
+        self.values.update(kwvalues)
+
+        self._index = {}
+        self._nodes = []
+        self._deps = []
+        self._symbols = {}
+        self._symbolNodes = {}
+        self._root = self._build(expr)
+
+        self._values = [None]*len(self._nodes)
+        self.totals = dict(recomputed=0, reused=0)
+        self._recompute(xrange(len(self._nodes)))
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def symbols(self):
+        return self._symbols.keys()
+
+    def dependencies(self, operator):
+        """Returns the names of the symbols operator depends on"""
+        return self._deps[self._index[id(operator)]]
+
+    def result(self):
+        return self._refValue(self._root)
+
+    #~ updates ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def update(self, values=(), **kwvalues):
+        """Binds new values, recomputes the nodes they affect, and returns the result"""
+        changed = []
+        current = self.values
+        for items in (dict(values).iteritems(), kwvalues.iteritems()):
+            for name, value in items:
+                if not _sameValue(current.get(name, _unbound), value):
+                    current[name] = value
+                    changed.append(name)
+        return self.invalidate(*changed)
+
+    def invalidate(self, *names):
+        """Recomputes the nodes depending on the named symbols, and returns the result"""
+        symbolNodes = self._symbolNodes
+        dirty = set()
+        for name in names:
+            dirty.update(symbolNodes.get(name, ()))
+        self._recompute(sorted(dirty))
+        return self.result()
+
+    def _recompute(self, dirty):
+        nodes = self._nodes; values = self._values; refValue = self._refValue
+        count = 0
+        for idx in dirty:
+            opfn, refs = nodes[idx]
+            values[idx] = opfn(*[refValue(r) for r in refs])
+            count += 1
+
+        self.stats = dict(recomputed=count, reused=len(nodes)-count)
+        self.totals['recomputed'] += count
+        self.totals['reused'] += len(nodes)-count
+
+    #~ node graph ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def _build(self, item):
+        if isinstance(item, Operator):
+            idx = self._index.get(id(item))
+            if idx is not None:
+                return ('n', idx)
+
+            refs = [self._build(opand) for opand in item.operands]
+            deps = frozenset().union(*[self._refDeps(r) for r in refs])
+            opfn = self.opTable[item.op, len(refs)]
+
+            idx = len(self._nodes)
+            self._index[id(item)] = idx
+            self._nodes.append((opfn, refs))
+            self._deps.append(deps)
+            for name in deps:
+                self._symbolNodes.setdefault(name, []).append(idx)
+            return ('n', idx)
+
+        elif isinstance(item, Symbol):
+            self._symbols.setdefault(item.name, item)
+            return ('s', item.name)
+        elif isinstance(item, ndarray) and item.dtype.kind == 'O':
+            return ('a', [self._build(e) for e in item.flat], item.shape)
+        elif isinstance(item, (list, tuple)):
+            return ('l', [self._build(e) for e in item])
+        return ('c', item)
+
+    def _refDeps(self, ref):
+        kind = ref[0]
+        if kind == 'n':
+            return self._deps[ref[1]]
+        elif kind == 's':
+            return frozenset([ref[1]])
+        elif kind in ('a', 'l'):
+            return frozenset().union(*[self._refDeps(r) for r in ref[1]])
+        return frozenset()
+
+    def _refValue(self, ref):
+        kind = ref[0]
+        if kind == 'n':
+            return self._values[ref[1]]
+        elif kind == 's':
+            return self.values.get(ref[1], self._symbols[ref[1]])
+        elif kind == 'a':
+            return _asArray([self._refValue(r) for r in ref[1]], ref[2])
+        elif kind == 'l':
+            return [self._refValue(r) for r in ref[1]]
+        return ref[1]
+
+_unbound = object()
+def _sameValue(a, b):
+    if a is b:
+        return True
+    # 3 == 3.0 and True == 1, but they compute differently, e.g. under classic division
+    if type(a) is type(b) and _isNumber(a):
+        return a == b
+    return False
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Main 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import sys
+from numpy import ndarray
+
+from TG.geomath.data import DataHostObject, SlotDataHostObject
+from TG.geomath.data.box import Box, SlotBox
+from TG.geomath.data.vector import Vector
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class DictCell(DataHostObject):
+    box = Box.property()
+    weight = Vector.property([0,0], 'f')
+    minSize = Vector.property([0,0], 'f')
+
+class SlotCell(SlotDataHostObject):
+    box = SlotBox.property()
+    weight = Vector.property([0,0], 'f')
+    minSize = Vector.property([0,0], 'f')
+
+def sizeOf(obj, seen):
+    """Approximate deep size of obj, following instance dicts, slots and boxes"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    total = sys.getsizeof(obj)
+    if isinstance(obj, ndarray):
+        if obj.base is not None:
+            total += sizeOf(obj.base, seen)
+        return total
+
+    d = getattr(obj, '__dict__', None)
+    if d is not None:
+        total += sys.getsizeof(d)
+        for v in d.itervalues():
+            total += sizeOf(v, seen)
+    for klass in type(obj).__mro__:
+        for name in klass.__dict__.get('__slots__', ()):
+            v = getattr(obj, name, None)
+            if v is not None and name != '__weakref__':
+                total += sizeOf(v, seen)
+    return total
+
+def bytesPerInstance(factory, count=1000):
+    seen = set()
+    instances = [factory() for x in xrange(count)]
+    return sum(sizeOf(i, seen) for i in instances) / float(count)
+
+def touchCell(klass):
+    def factory():
+        cell = klass()
+        cell.box; cell.weight; cell.minSize
+        return cell
+    return factory
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    print
+    print 'Bytes per instance:'
+    for name, before, after in [
+            ('box', Box, SlotBox),
+            ('layout cell', touchCell(DictCell), touchCell(SlotCell)),
+            ]:
+        b0 = bytesPerInstance(before)
+        b1 = bytesPerInstance(after)
+        print '  %-12s dict: %7.1f  slots: %7.1f  saved: %5.1f%%' % (name, b0, b1, 100.*(b0-b1)/b0)
+    print
+
+if __name__=='__main__':
+    main()
+
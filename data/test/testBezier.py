@@ -12,6 +12,7 @@
 
 import unittest
 
+import numpy
 from numpy import allclose
 from TG.geomath.data import bezier
 from TG.geomath.data.color import Color
@@ -171,6 +172,150 @@ class TestCubicBezier(unittest.TestCase):
         self.doCVTestFor(bm.atP(cpts).atU(u), result)
         self.doCVTestFor(bm.at(cpts, u), result)
     
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBezierEngine(unittest.TestCase):
+    u = [0, .125, .25, .375, .5, .625, .75, .875, 1]
+
+    def testBasisCached(self):
+        for order in (1, 2, 3):
+            uB = bezier.basisFor(order, self.u)
+            self.failUnless(uB is bezier.basisFor(order, list(self.u)))
+            self.failUnless(allclose(uB.sum(-1), 1.))
+            self.failIf(uB.flags.writeable)
+        self.failUnless(bezier.vanderFor(self.u, 4) is bezier.vanderFor(numpy.array(self.u), 4))
+
+    def testSmallUUncached(self):
+        u = self.u[:bezier.uCacheMinSize-1]
+        self.failIf(bezier.vanderFor(u, 4) is bezier.vanderFor(u, 4))
+        self.failUnless(allclose(bezier.vanderFor(u, 4), numpy.vander(u, 4)))
+        uB = bezier.basisFor(3, u)
+        self.failUnless(allclose(uB, bezier.basisFor(3, self.u)[:len(u)]))
+
+    def testScalarU(self):
+        bp = bezier.b3.atP([0., 1., 2., 3.])
+        self.failUnless(allclose(bp.atU(.5), [1.5]))
+
+    def testEvalCurves(self):
+        for order in (2, 3):
+            cpts = numpy.random.uniform(-10, 10, (20, order+1, 2))
+            result = bezier.evalCurves(cpts, self.u)
+            self.assertEqual(result.shape, (20, len(self.u), 2))
+            bm = bezier.Bezier.order[order]
+            for c, r in zip(cpts, result):
+                self.failUnless(allclose(bm.at(c, self.u), r))
+
+            out = numpy.empty_like(result)
+            self.failUnless(bezier.evalCurves(cpts, self.u, out) is out)
+            self.failUnless(allclose(out, result))
+
+    def testEvalCurvesPerU(self):
+        cpts = numpy.random.uniform(-10, 10, (5, 4, 3))
+        u = numpy.random.uniform(0, 1, (5, 7))
+        result = bezier.evalCurvesPerU(cpts, u)
+        for c, uk, r in zip(cpts, u, result):
+            self.failUnless(allclose(bezier.b3.at(c, uk), r))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBezierFlatten(unittest.TestCase):
+    def polylineError(self, cpts, poly):
+        pts = bezier.evalCurves(cpts[None], numpy.linspace(0, 1, 257))[0]
+        a = poly[:-1]; d = poly[1:] - a
+        dd = (d*d).sum(-1)
+        t = ((pts[:, None] - a)*d).sum(-1) / numpy.where(dd, dd, 1)
+        t = t.clip(0, 1)
+        nearest = a + t[..., None]*d
+        return numpy.sqrt(((pts[:, None] - nearest)**2).sum(-1)).min(-1).max()
+
+    def testLine(self):
+        poly = bezier.flattenCurve([[0., 0.], [1., 1.], [2., 2.], [3., 3.]])
+        self.failUnless(allclose(poly, [[0., 0.], [3., 3.]]))
+
+    def testSplit(self):
+        cpts = numpy.random.uniform(0, 10, (3, 4, 2))
+        left, right = bezier.splitCurves(cpts, .3)
+        u = numpy.linspace(0, 1, 5)
+        self.failUnless(allclose(bezier.evalCurves(left, u), bezier.evalCurves(cpts, .3*u)))
+        self.failUnless(allclose(bezier.evalCurves(right, u), bezier.evalCurves(cpts, .3 + .7*u)))
+
+    def testTolerance(self):
+        cpts = numpy.array([[0., 0.], [0., 100.], [100., 100.], [100., 0.]])
+        coarse = bezier.flattenCurve(cpts, 2.)
+        fine = bezier.flattenCurve(cpts, .1)
+        self.failUnless(len(fine) > len(coarse) > 2)
+        self.failUnless(self.polylineError(cpts, coarse) <= 2.)
+        self.failUnless(self.polylineError(cpts, fine) <= .1)
+        self.failUnless(allclose(fine[[0, -1]], cpts[[0, -1]]))
+
+    def testBatch(self):
+        cpts = numpy.random.uniform(0, 50, (10, 3, 2))
+        cpts[3] = [[0., 0.], [1., 0.], [2., 0.]]
+        out = numpy.zeros((10000, 2))
+        vertices, offsets = bezier.flattenCurves(cpts, .5, out=out)
+        self.assertEqual(len(offsets), 11)
+        self.assertEqual(len(vertices), offsets[-1])
+        self.assertEqual(offsets[4] - offsets[3], 2)
+        for k in xrange(10):
+            poly = vertices[offsets[k]:offsets[k+1]]
+            self.failUnless(allclose(poly, bezier.flattenCurve(cpts[k], .5)))
+            self.failUnless(self.polylineError(cpts[k], poly) <= .5)
+        self.assertRaises(ValueError, bezier.flattenCurves, cpts, .5, 16, out[:3])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestArcLength(unittest.TestCase):
+    cpts = numpy.array([[0., 0.], [0., 100.], [10., 100.], [200., 0.]])
+
+    def testLine(self):
+        # uneven control points on a line move at uneven speed in u
+        table = bezier.ArcLengthTable([[0., 0.], [9., 0.], [10., 0.]])
+        self.failUnless(allclose(table.length, 10.))
+        self.failUnless(allclose(table.atS([0., .25, .5, 1.]), [[0., 0.], [2.5, 0.], [5., 0.], [10., 0.]], atol=1e-3))
+        self.failUnless(allclose(table.atS(5., False), [5., 0.], atol=1e-3))
+
+    def testConstantSpeed(self):
+        table = bezier.ArcLengthTable(self.cpts, 128)
+        reference = bezier.ArcLengthTable(self.cpts, 20000)
+        s = numpy.linspace(0, 1, 21)
+        self.failUnless(allclose(reference.sAt(table.uAt(s)), s, atol=1e-4))
+
+    def testInverse(self):
+        table = bezier.ArcLengthTable(self.cpts)
+        u = numpy.linspace(0, 1, 11)
+        self.failUnless(allclose(table.uAt(table.sAt(u)), u))
+        self.failUnless(allclose(table.sAt(1., False), table.length))
+
+    def testBatch(self):
+        cpts = numpy.random.uniform(0, 100, (5, 4, 2))
+        cpts[2] = 0.
+        batch = bezier.ArcLengthTable(cpts)
+        s = numpy.random.uniform(0, 1, (5, 7))
+        u = batch.uAt(s)
+        for k in xrange(5):
+            single = bezier.ArcLengthTable(cpts[k])
+            self.failUnless(allclose(batch.length[k], single.length))
+            self.failUnless(allclose(u[k], single.uAt(s[k])))
+            self.failUnless(allclose(batch.sAt(u)[k], single.sAt(u[k])))
+        self.failUnless(allclose(batch.atS(s[:, 0]), [bezier.ArcLengthTable(c).atS(x) for c, x in zip(cpts, s[:, 0])]))
+        self.failUnless(allclose(u[2], s[2]))
+
+    def testCache(self):
+        bezier.arcLengthCache.clear()
+        table = bezier.arcLengthFor(self.cpts)
+        self.failUnless(bezier.arcLengthFor(self.cpts.tolist()) is table)
+        self.failIf(bezier.arcLengthFor(self.cpts, 64) is table)
+        for k in xrange(bezier.arcLengthCache.maxSize + 10):
+            bezier.arcLengthFor(self.cpts + k)
+        self.assertEqual(len(bezier.arcLengthCache), bezier.arcLengthCache.maxSize)
+
+    def testAfn(self):
+        afn = bezier.constantSpeed(self.cpts)
+        table = bezier.arcLengthFor(self.cpts)
+        self.assertEqual(afn(0., 0., -1.), 0.)
+        self.assertEqual(afn(0., 0., 2.), 1.)
+        self.failUnless(allclose(afn(0., .5, .5), table.uAt(.5)))
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Unittest Main 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -0,0 +1,81 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+import numpy
+from numpy import allclose
+from TG.geomath.data import bicubic
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestCatmullRom(unittest.TestCase):
+    avData = [0, 0, 1, 0, 2, 0, 1, 0, 4, 0, 2, 0, 8, 0, 0]
+    t = numpy.arange(0., 1.01, .1)
+
+    def loopSpline(self, av, t):
+        return numpy.concatenate([bicubic.p(t, av[i:i+4]) for i in xrange(len(av)-3)], 0)
+
+    def testScalarMatchesLoop(self):
+        self.failUnless(allclose(bicubic.spline(self.avData, self.t), self.loopSpline(self.avData, self.t)))
+        self.assertEqual(bicubic.splineSegments(self.avData, self.t).shape, (12, 11))
+
+    def testInterpolatesControlPoints(self):
+        pts = numpy.random.uniform(0, 10, (9, 3))
+        r = bicubic.splineSegments(pts, [0., 1.])
+        self.failUnless(allclose(r[:, 0], pts[1:-2]))
+        self.failUnless(allclose(r[:, 1], pts[2:-1]))
+
+    def testBatch(self):
+        pts = numpy.random.uniform(0, 10, (4, 3, 8, 2))
+        r = bicubic.spline(pts, self.t)
+        self.assertEqual(r.shape, (4, 3, 5*len(self.t), 2))
+        for i in xrange(4):
+            for j in xrange(3):
+                self.failUnless(allclose(r[i, j], self.loopSpline(pts[i, j], self.t)))
+
+    def testTangents(self):
+        pts = numpy.random.uniform(0, 10, (7, 2))
+        h = 1e-6
+        p, dp = bicubic.splineSegments(pts, [.3], True)
+        p1 = bicubic.splineSegments(pts, [.3+h])
+        self.failUnless(allclose(dp, (p1-p)/h, atol=1e-4))
+        p, dp = bicubic.spline(self.avData, self.t, True)
+        self.assertEqual(dp.shape, p.shape)
+
+    def testSplineAt(self):
+        pts = numpy.random.uniform(0, 10, (7, 2))
+        s = numpy.array([[0., 1.25], [3.5, 4.]])
+        p, dp = bicubic.splineAt(pts, s, True)
+        self.assertEqual(p.shape, (2, 2, 2))
+        self.failUnless(allclose(p[1, 0], bicubic.splineSegments(pts, [.5])[3, 0]))
+        self.failUnless(allclose(p[1, 1], pts[-2]))
+        self.failUnless(allclose(dp[0, 1], bicubic.splineSegments(pts, [.25], True)[1][1, 0]))
+        self.failUnless(allclose(bicubic.splineAt(self.avData, 1.5), bicubic.p(.5, self.avData[1:5])))
+
+    def testWindowsShareMemory(self):
+        pts = numpy.arange(12.).reshape(6, 2)
+        w = bicubic.segmentWindows(pts)
+        self.assertEqual(w.shape, (3, 4, 2))
+        self.failUnless(allclose(w[2], pts[2:]))
+        self.failUnless(numpy.may_share_memory(w, pts))
+        self.assertRaises(ValueError, bicubic.segmentWindows, pts[:3])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
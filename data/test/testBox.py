@@ -10,11 +10,16 @@
 #~ Imports 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+import gc
+import weakref
 import unittest
+import ctypes
 
+import numpy
 from numpy import allclose
 
-from TG.geomath.data.box import Box
+from TG.geomath.data.box import Box, geoXfrmInto, xfrmTable, XfrmGather, toAspect, toAspectArray
+from TG.geomath.data.box import asBlend, computeBlend, blendCache
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -60,7 +65,133 @@ class TestBox(unittest.TestCase):
     def testFromCorners(self):
         self.doVTest(self.Box.fromCorners((2.5, 1.5), (5.75, 6.75)), [[2.5, 1.5], [3.25, 5.25]])
         self.doVTest(self.Box.fromCorners((2.5, 1.5), (5.75, 6.75), dtype='b'), [[2, 1], [3, 5]])
-    
+
+    def testFromArrays(self):
+        pos = [[2.3, 4.8], [1., 2.], [0., 0.]]
+        size = [[3.125, 6.25], [4., 2.], [0., 5.]]
+        b = self.Box.fromPosSize(pos, size)
+        self.assertEqual(b.shape, (3, 2, 2))
+        self.failUnless(allclose(b.pos, pos))
+        self.failUnless(allclose(b.size, size))
+
+        b = self.Box.fromPosSize(pos, size, 1.5)
+        for i in xrange(3):
+            self.doVTest(b[i], [pos[i], self.Box.fromPosSize(pos[i], size[i], 1.5).size])
+
+        b = self.Box.fromSize(size, dtype='b')
+        self.failUnless(allclose(b.size, [[3, 6], [4, 2], [0, 5]]))
+        b = self.Box.fromCorners(pos, (10., 10.))
+        self.failUnless(allclose(b.p1, [[10., 10.]]*3))
+
+    def testSyntax(self):
+        b = self.Box.fromCorners((1., 2.), (4., 8.))
+        self.failUnless(allclose(b.at[.5], [2.5, 5.]))
+        self.failUnless(allclose(b.at[(0, 1)], [1., 8.]))
+        b.at[.5] = [0., 0.]
+        self.failUnless(allclose(b.pv, [[-1.5, -3.], [1.5, 3.]]))
+
+        bv = self.Box([[[0., 0.], [2., 2.]], [[2., 2.], [6., 4.]]])
+        self.failUnless(allclose(bv.blendAt[.5].pv, [[1., 1.], [4., 3.]]))
+        self.assertRaises(ValueError, getattr, b, 'blendAt')
+
+    def testSyntaxNoCycle(self):
+        # syntax helpers must not keep the box alive past its last reference
+        gc.disable()
+        try:
+            b = self.Box.fromCorners((1., 2.), (4., 8.))
+            b.at[.5]; b.atAspect[1.]
+            bref = weakref.ref(b)
+            del b
+            self.failUnless(bref() is None)
+        finally:
+            gc.enable()
+
+    def testBlendCache(self):
+        for rel in [0, .5, 1, (0, 1), (.5, .5), (1, 0, .5)]:
+            ar = asBlend(None, rel)
+            self.failUnless(ar is blendCache[rel])
+            self.failIf(ar.flags.writeable)
+            self.failUnless(allclose(ar, computeBlend(rel)))
+            self.assertEqual(ar.dtype, computeBlend(rel).dtype)
+        self.failUnless(allclose(asBlend(None, [.25, .75]), computeBlend([.25, .75])))
+
+    def testToAspectArray(self):
+        sizes = [(3.125, 6.25), (4., 2.), (2., 2.), (0., 5.), (1., 3.)]
+        aspects = [1.5, (4, 3), (16, 9, True), 0, (0, 0), (1, 0), (2., False), (.5, True)]
+        for aspect in aspects:
+            result = toAspectArray(sizes, aspect)
+            for size, r in zip(sizes, result):
+                self.failUnless(allclose(r, toAspect(size, aspect)), (size, aspect, r))
+
+        grow = numpy.array([True, False, True, False, True])
+        ratios = numpy.array([1.5, .5, 2., 1., 3.])
+        result = toAspectArray(sizes, ratios, grow=grow)
+        for size, aspect, g, r in zip(sizes, ratios, grow, result):
+            self.failUnless(allclose(r, toAspect(size, aspect, grow=g)))
+
+        pairs = numpy.array([(4, 3), (1, 0), (0, 0), (16, 9), (1, 2)])
+        result = toAspectArray(sizes, pairs)
+        for size, aspect, r in zip(sizes, pairs, result):
+            self.failUnless(allclose(r, toAspect(size, tuple(aspect))))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBoxGeoXfrm(unittest.TestCase):
+    Box = Box
+    xfrmKeys = ['quads', 'quads-flip', 'tristrip']
+
+    def setUp(self):
+        self.box = self.Box.fromCorners((1., 2.), (4., 8.))
+        self.box3d = self.Box.fromCorners((1., 2., 3.), (4., 8., 5.))
+        self.boxes = self.Box([[[0., 0.], [1., 1.]], [[2., 3.], [5., 7.]], [[-1., -2.], [0., 4.]]])
+
+    def testOut(self):
+        for box in [self.box, self.box3d, self.boxes]:
+            for key in self.xfrmKeys:
+                answer = box.geoXfrm(key)
+                out = numpy.zeros(answer.shape, 'f')
+                result = box.geoXfrm(key, out=out)
+                self.failUnless(result is out)
+                self.failUnless(allclose(out, answer))
+
+    def testInto(self):
+        answer = self.boxes.geoXfrm('tristrip').reshape(-1, 2)
+        vtx = numpy.zeros((20, 2), 'f')
+        end = geoXfrmInto(self.boxes, vtx, 3, 'tristrip')
+        self.assertEqual(end, 15)
+        self.failUnless(allclose(vtx[3:15], answer))
+        self.failIf(vtx[:3].any() or vtx[15:].any())
+
+        end = self.box.geoXfrmInto(vtx, end, 'tristrip')
+        self.assertEqual(end, 19)
+        self.failUnless(allclose(vtx[15:19], self.box.geoXfrm('tristrip')))
+
+    def testIntoCtypes(self):
+        vtx = (ctypes.c_float * 24)()
+        end = geoXfrmInto(self.boxes, vtx, 0, 'quads')
+        self.assertEqual(end, 12)
+        self.failUnless(allclose(list(vtx), self.boxes.geoXfrm('quads').ravel()))
+
+    def testGatherMatchesWeights(self):
+        for (key, dim), weights in xfrmTable.items():
+            box = [self.box, self.box3d][dim-2]
+            gather = XfrmGather(weights)
+            for data in [box.pv, box.pv.astype('f'), numpy.array([box.pv]*5)]:
+                answer = (weights * data[..., None, :, :]).sum(-2)
+                self.assertEqual(gather(data).tolist(), answer.tolist())
+
+                out = numpy.zeros(answer.shape, data.dtype)
+                self.failUnless(gather(data, out) is out)
+                self.assertEqual(out.tolist(), answer.tolist())
+
+    def testGatherRejectsBlends(self):
+        self.assertRaises(ValueError, XfrmGather, [[[.5, .5], [.5, .5]]])
+        self.assertRaises(ValueError, XfrmGather, [[[1, 1], [1, 0]]])
+
+    def testIntoOverflow(self):
+        vtx = numpy.zeros((6, 2), 'f')
+        self.assertRaises(ValueError, geoXfrmInto, self.boxes, vtx, 0)
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Unittest Main 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -0,0 +1,137 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+import numpy
+from numpy import allclose
+
+from TG.geomath.data.box import Box
+from TG.geomath.data.boxArray import BoxArray
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBoxArray(unittest.TestCase):
+    BoxArray = BoxArray
+
+    def setUp(self):
+        self.boxes = [
+            Box.fromPosSize((0., 0.), (10., 20.)),
+            Box.fromPosSize((5., 5.), (2., 4.)),
+            Box.fromPosSize((-3., 1.), (6., 6.))]
+        self.ba = self.BoxArray.fromBoxes(self.boxes)
+
+    def doBoxesTest(self, method, *args):
+        getattr(self.ba, method)(*args)
+        for b in self.boxes:
+            getattr(b, method)(*args)
+        for b, bv in zip(self.boxes, self.ba):
+            self.failUnless(allclose(b.pv, bv.pv), (b.pv.tolist(), bv.pv.tolist()))
+
+    def testShape(self):
+        self.assertEqual(len(self.ba), 3)
+        self.assertEqual(self.ba.shape, (3, 2, 2))
+        self.assertEqual(self.BoxArray.fromCount(5, 3).shape, (5, 2, 3))
+        self.assertEqual(self.BoxArray.fromSize((1., 2.)).shape, (1, 2, 2))
+
+    def testFromPosSize(self):
+        ba = self.BoxArray.fromPosSize(self.ba.pos, self.ba.size)
+        self.failUnless(isinstance(ba, self.BoxArray))
+        self.failUnless(allclose(ba, self.ba))
+
+        ba = self.BoxArray.fromSize(self.ba.size, (1, 1))
+        self.failUnless(allclose(ba.size, [[10., 10.], [2., 2.], [6., 6.]]))
+
+    def testViews(self):
+        b1 = self.ba[1]
+        self.failUnless(isinstance(b1, Box))
+        self.failIf(isinstance(b1, BoxArray))
+        b1.offset(1.)
+        self.failUnless(allclose(self.ba.p0[1], [6., 6.]))
+
+    def testSize(self):
+        self.failUnless(allclose(self.ba.size, [b.size for b in self.boxes]))
+        self.ba.size = [4., 4.]
+        self.failUnless(allclose(self.ba.size, [4., 4.]))
+
+    def testSizePerBox(self):
+        sizes = [[1., 2.], [3., 4.], [5., 6.]]
+        self.ba.setSize(sizes, .5)
+        for b, s in zip(self.boxes, sizes):
+            b.setSize(s, .5)
+        self.failUnless(allclose(self.ba.pv, [b.pv for b in self.boxes]))
+
+    def testAt(self):
+        for rel in [0, .5, 1, (0, 1), (.25, .75)]:
+            self.failUnless(allclose(self.ba.at[rel], [b.at[rel] for b in self.boxes]))
+
+    def testAtPerBox(self):
+        rel = [[0., 0.], [.5, .5], [1., 0.]]
+        self.failUnless(allclose(self.ba.at[rel], [b.at[r] for b, r in zip(self.boxes, rel)]))
+
+    def testInset(self):
+        self.doBoxesTest('inset', 1.)
+        self.doBoxesTest('inset', (1., .5))
+
+    def testOffset(self):
+        self.doBoxesTest('offset', (2., -1.))
+
+    def testScaleAt(self):
+        self.doBoxesTest('scaleAt', 2., .5)
+
+    def testSetAspect(self):
+        self.doBoxesTest('setAspect', 1.5)
+        self.doBoxesTest('setAspectWith', (4, 3), (8., 8.))
+
+    def testFitAspect(self):
+        aspects = numpy.array([1.5, .5, 2.])
+        for mode, grow in [('letterbox', False), ('cover', True)]:
+            ba = self.ba.fittedToAspect(aspects, mode)
+            for b, a, bv in zip(self.boxes, aspects, ba):
+                b = b.copy()
+                b.setAspect((a, grow))
+                self.failUnless(allclose(b.pv, bv.pv), (mode, b.pv.tolist(), bv.pv.tolist()))
+
+        grow = numpy.array([False, True, False])
+        self.ba.fitAspect(numpy.array([(4, 3), (16, 9), (1, 1)]), grow)
+        for b, a, g, bv in zip(self.boxes, [(4, 3), (16, 9), (1, 1)], grow, self.ba):
+            b.setAspectWith((a[0]/float(a[1]), bool(g)), b)
+            self.failUnless(allclose(b.pv, bv.pv))
+
+    def testScaleToFit(self):
+        ba = self.ba.copy()
+        ba.scaleToFit((5., 5.), 'cover')
+        self.failUnless((ba.size >= 5.-1e-6).all())
+        self.failUnless(allclose(ba.size.min(-1), 5.))
+        self.ba.scaleToFit((5., 5.))
+        self.failUnless(allclose(self.ba.size.max(-1), 5.))
+
+    def testMerge(self):
+        other = Box.fromPosSize((1., 1.), (1., 1.))
+        self.doBoxesTest('merge', other)
+
+    def testGeoXfrm(self):
+        self.failUnless(allclose(self.ba.geoXfrm(), [b.geoXfrm() for b in self.boxes]))
+
+    def testInside(self):
+        self.assertEqual(self.ba.inside((6., 6.)).tolist(), [True, True, False])
+        self.assertEqual(self.ba.outside((6., 6.)).tolist(), [False, False, True])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,99 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+from TG.geomath.data.box import BoxChangeBatch
+from TG.geomath.data.kvBox import KVBox
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBoxChangeBatch(unittest.TestCase):
+    Box = KVBox
+
+    def setUp(self):
+        self.kvoCounts = {}
+        self.boxes = [self.Box([1., 1.]) for i in xrange(3)]
+        for b in self.boxes:
+            b.kvpub.add('*', self.onBoxChange)
+
+    def onBoxChange(self, box, key):
+        self.kvoCounts[id(box)] = self.kvoCounts.get(id(box), 0) + 1
+
+    def kvoCount(self, box):
+        return self.kvoCounts.get(id(box), 0)
+
+    def nudge(self, box, count=10):
+        for i in xrange(count):
+            box.offset(1.)
+            box += 1.
+
+    def testUnbatched(self):
+        b = self.boxes[0]
+        self.nudge(b)
+        self.assertEqual(self.kvoCount(b), 20)
+
+    def testBoxBatch(self):
+        b0, b1 = self.boxes[:2]
+        with b0.batchChanges() as batch:
+            self.nudge(b0)
+            self.nudge(b1)
+            self.assertEqual(self.kvoCount(b0), 0)
+            self.assertEqual(self.kvoCount(b1), 20)
+            self.failUnless(batch.isDirty(b0))
+        self.assertEqual(self.kvoCount(b0), 1)
+        self.assertEqual(batch.stats(), dict(deferred=20, published=1, suppressed=19))
+
+    def testGlobalBatch(self):
+        with BoxChangeBatch() as batch:
+            for b in self.boxes:
+                self.nudge(b)
+            self.assertEqual(sum(self.kvoCounts.values()), 0)
+            self.assertEqual(batch.dirtyBoxes(), self.boxes)
+        for b in self.boxes:
+            self.assertEqual(self.kvoCount(b), 1)
+        self.assertEqual(batch.suppressed, 57)
+
+    def testPublishOncePerBatch(self):
+        published = []
+        with BoxChangeBatch(publish=lambda boxes: published.append(boxes) or 0) as batch:
+            for b in self.boxes:
+                self.nudge(b)
+        self.assertEqual(published, [self.boxes])
+        self.assertEqual(sum(self.kvoCounts.values()), 0)
+        self.assertEqual(batch.suppressed, 60)
+
+    def testNested(self):
+        b0 = self.boxes[0]
+        with BoxChangeBatch() as outer:
+            with b0.batchChanges() as inner:
+                self.nudge(b0)
+            self.assertEqual(self.kvoCount(b0), 0)
+            self.nudge(b0)
+        self.assertEqual(self.kvoCount(b0), 1)
+        self.assertEqual(inner.suppressed, 19)
+        self.assertEqual(outer.deferred, 21)
+        self.assertEqual(outer.suppressed, 20)
+
+    def testNoChanges(self):
+        with BoxChangeBatch() as batch:
+            pass
+        self.assertEqual(batch.stats(), dict(deferred=0, published=0, suppressed=0))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
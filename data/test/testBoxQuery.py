@@ -0,0 +1,102 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+import numpy
+
+from TG.geomath.data.box import Box
+from TG.geomath.data.boxArray import BoxArray
+from TG.geomath.data import boxQuery
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBoxQuery(unittest.TestCase):
+    def setUp(self):
+        rs = numpy.random.RandomState(42)
+        pos = rs.uniform(0, 100, (50, 2))
+        size = rs.uniform(0, 20, (50, 2))
+        self.boxes = numpy.array([pos, pos+size]).transpose(1, 0, 2)
+        self.pts = rs.uniform(-10, 130, (70, 2))
+
+    def bruteInside(self):
+        return numpy.array([[Box(b).inside(p) for b in self.boxes] for p in self.pts])
+
+    def bruteOverlap(self, boxesA, boxesB):
+        return numpy.array([[(a[0] <= b[1]).all() and (b[0] <= a[1]).all() 
+                for b in boxesB] for a in boxesA])
+
+    def testPointsInBoxesMask(self):
+        answer = self.bruteInside()
+        for chunkSize in [1, 7, 100, None]:
+            mask = boxQuery.pointsInBoxesMask(self.pts, self.boxes, chunkSize)
+            self.assertEqual(mask.tolist(), answer.tolist())
+
+    def testPointsInBoxes(self):
+        answer = self.bruteInside().nonzero()
+        for chunkSize in [1, 7, 100, None]:
+            ptIdx, boxIdx = boxQuery.pointsInBoxes(self.pts, self.boxes, chunkSize)
+            self.assertEqual(ptIdx.tolist(), answer[0].tolist())
+            self.assertEqual(boxIdx.tolist(), answer[1].tolist())
+
+    def testPointsInAnyBox(self):
+        answer = self.bruteInside().any(-1)
+        self.assertEqual(boxQuery.pointsInAnyBox(self.pts, self.boxes, 7).tolist(), answer.tolist())
+
+    def testPickBoxes(self):
+        answer = self.bruteInside()
+        top = [(m.nonzero()[0][-1] if m.any() else -1) for m in answer]
+        bottom = [(m.nonzero()[0][0] if m.any() else -1) for m in answer]
+        self.assertEqual(boxQuery.pickBoxes(self.pts, self.boxes, 7).tolist(), top)
+        self.assertEqual(boxQuery.pickBoxes(self.pts, self.boxes, 7, False).tolist(), bottom)
+
+    def testBoxesOverlap(self):
+        answer = self.bruteOverlap(self.boxes[:20], self.boxes)
+        for chunkSize in [1, 7, 100, None]:
+            mask = boxQuery.boxesOverlapMask(self.boxes[:20], self.boxes, chunkSize)
+            self.assertEqual(mask.tolist(), answer.tolist())
+            aIdx, bIdx = boxQuery.boxesOverlap(self.boxes[:20], self.boxes, chunkSize)
+            self.assertEqual(zip(aIdx, bIdx), zip(*answer.nonzero()))
+        anyMask = boxQuery.boxesOverlapAny(self.boxes[:20], self.boxes, 7)
+        self.assertEqual(anyMask.tolist(), answer.any(0).tolist())
+
+    def testBoxesOverlapOpen(self):
+        a = [[[0., 0.], [1., 1.]]]
+        b = [[[1., 0.], [2., 1.]]]
+        self.assertEqual(boxQuery.boxesOverlapMask(a, b).tolist(), [[True]])
+        self.assertEqual(boxQuery.boxesOverlapMask(a, b, closed=False).tolist(), [[False]])
+
+    def testEmpty(self):
+        ptIdx, boxIdx = boxQuery.pointsInBoxes([[1000., 1000.]], self.boxes)
+        self.assertEqual(len(ptIdx), 0)
+        self.assertEqual(len(boxIdx), 0)
+
+    def testPickEmpty(self):
+        self.assertEqual(boxQuery.pickBoxes(self.pts[:3], numpy.zeros((0, 2, 2))).tolist(), [-1, -1, -1])
+        self.assertEqual(BoxArray().pick(self.pts[:3]).tolist(), [-1, -1, -1])
+        self.assertEqual(BoxArray(self.boxes).pick(numpy.zeros((0, 2))).tolist(), [])
+
+    def testBoxArray(self):
+        ba = BoxArray(self.boxes)
+        self.assertEqual(ba.insideMask(self.pts).tolist(), self.bruteInside().tolist())
+        self.assertEqual(ba.pick(self.pts).tolist(), 
+                boxQuery.pickBoxes(self.pts, self.boxes).tolist())
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
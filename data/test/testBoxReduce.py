@@ -0,0 +1,106 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+import numpy
+from numpy import allclose
+
+from TG.geomath.data.boxArray import BoxArray
+from TG.geomath.data import boxReduce
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBoxReduce(unittest.TestCase):
+    def setUp(self):
+        #   0
+        #   +-- 1
+        #   |   +-- 3
+        #   |   +-- 4
+        #   +-- 2
+        #       +-- 5
+        self.parentIdx = numpy.array([-1, 0, 0, 1, 1, 2])
+        self.ba = BoxArray.fromPosSize(
+            [[0., 0.], [1., 1.], [50., 0.], [-5., 2.], [2., 2.], [55., 90.]],
+            [[100., 100.], [40., 40.], [40., 40.], [10., 10.], [5., 5.], [20., 20.]])
+
+    def mergeAll(self, idxs, op='merge'):
+        boxes = [self.ba.box(i).copy() for i in idxs]
+        result = boxes[0]
+        for b in boxes[1:]:
+            if op == 'merge':
+                result.merge(b)
+            else:
+                result.p0 = numpy.maximum(result.p0, b.p0)
+                result.p1 = numpy.minimum(result.p1, b.p1)
+        return result
+
+    def testUnionAll(self):
+        self.failUnless(allclose(self.ba.union(), self.mergeAll(range(6))))
+        self.failUnless(allclose(self.ba.union(), [[-5., 0.], [100., 110.]]))
+
+    def testIntersectAll(self):
+        self.failUnless(allclose(self.ba[0:2].intersection(), [[1., 1.], [41., 41.]]))
+        self.failUnless(boxReduce.isEmpty(self.ba.intersection()))
+
+    def testEmpty(self):
+        empty = BoxArray.fromCount(0)
+        self.failUnless(boxReduce.isEmpty(empty.union()))
+        self.failIf(boxReduce.isEmpty(empty.intersection()))
+
+    def testSegments(self):
+        segIds = [1, 0, 1, -1, 0, 3]
+        result = self.ba.unionBy(segIds)
+        self.assertEqual(len(result), 4)
+        self.failUnless(allclose(result[0], self.mergeAll([1, 4])))
+        self.failUnless(allclose(result[1], self.mergeAll([0, 2])))
+        self.failUnless(allclose(result[3], self.ba[5]))
+        self.failUnless(result.emptyMask().tolist() == [False, False, True, False])
+
+        result = self.ba.intersectionBy(segIds, 5)
+        self.assertEqual(len(result), 5)
+        self.failUnless(allclose(result[0], self.mergeAll([1, 4], 'intersect')))
+        self.failUnless(allclose(result[1], self.mergeAll([0, 2], 'intersect')))
+
+    def testSegmentsInt(self):
+        ba = self.ba.astype('i')
+        result = boxReduce.segmentUnion(ba, [0, 0, 1, 1, 1, 1], 3)
+        self.assertEqual(result.dtype, numpy.dtype('i'))
+        self.failUnless(boxReduce.isEmpty(result[2]))
+
+    def testTreeLevels(self):
+        levels = boxReduce.treeLevels(self.parentIdx)
+        self.assertEqual([l.tolist() for l in levels], [[0], [1, 2], [3, 4, 5]])
+        self.assertRaises(ValueError, boxReduce.treeDepths, [1, 0])
+
+    def testSubtreeUnion(self):
+        result = self.ba.subtreeUnion(self.parentIdx)
+        self.failUnless(allclose(result[0], self.mergeAll(range(6))))
+        self.failUnless(allclose(result[1], self.mergeAll([1, 3, 4])))
+        self.failUnless(allclose(result[2], self.mergeAll([2, 5])))
+        self.failUnless(allclose(result[3], self.ba[3]))
+
+    def testClipToAncestors(self):
+        result = self.ba.clipToAncestors(self.parentIdx)
+        self.failUnless(allclose(result[0], self.ba[0]))
+        self.failUnless(allclose(result[3], self.mergeAll([3, 1, 0], 'intersect')))
+        self.failUnless(allclose(result[5], self.mergeAll([5, 2, 0], 'intersect')))
+        self.failUnless(result.emptyMask()[5])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import gc
+import unittest
+
+from numpy import allclose
+
+from TG.geomath.data.box import Box
+from TG.geomath.data.vector import Vector, DataHostObject, SlotDataHostObject
+from TG.geomath.data.dataArena import DataArena
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class ArenaHost(DataHostObject):
+    box = Box.property([1., 2.], dtype='f')
+    weight = Vector.property([0, 0], 'f')
+
+class SlotArenaHost(SlotDataHostObject):
+    box = Box.property([1., 2.], dtype='f')
+    weight = Vector.property([0, 0], 'f')
+
+class NotifyBox(Box):
+    changes = 0
+    @property
+    def _data_changed_(self):
+        NotifyBox.changes += 1
+
+class NotifyHost(DataHostObject):
+    box = NotifyBox.property([1., 2.], dtype='f')
+
+class TestDataArena(unittest.TestCase):
+    HostKlass = ArenaHost
+
+    def setUp(self):
+        self.arena = DataArena.install(self.HostKlass)
+
+    def tearDown(self):
+        del self.HostKlass._data_arena_
+
+    def testFields(self):
+        self.assertEqual(sorted(self.arena.dtype.names), ['box', 'weight'])
+        self.assertEqual(self.arena.dtype['box'].shape, (2, 2))
+
+    def testHostViewsRow(self):
+        a = self.HostKlass(); b = self.HostKlass()
+        a.box.size = [5., 6.]
+        b.weight = [3., 4.]
+        self.failUnless(allclose(self.arena.field('box')[self.arena.rowOf(a)], [[0,0], [5,6]]))
+        self.failUnless(allclose(self.arena.field('weight')[self.arena.rowOf(b)], [3., 4.]))
+        self.failUnless(allclose(b.box.size, [1., 2.]))
+        self.assertEqual(len(self.arena), 2)
+
+    def testPopulationUpdate(self):
+        hosts = [self.HostKlass() for i in xrange(5)]
+        for h in hosts: h.weight
+        self.arena.field('weight')[:] += [1., 2.]
+        self.arena.field('box')[:] += 10.
+        for h in hosts:
+            self.failUnless(allclose(h.weight, [1., 2.]))
+            self.failUnless(allclose(h.box.p0, [10., 10.]))
+
+    def testAssignInstanceKeepsRow(self):
+        h = self.HostKlass()
+        h.box = Box([7., 8.], dtype='f')
+        self.failUnless(allclose(self.arena.field('box')[self.arena.rowOf(h)][1], [7., 8.]))
+
+    def testGrowthRebinds(self):
+        hosts = [self.HostKlass() for i in xrange(3)]
+        for i, h in enumerate(hosts):
+            h.box.p0 = [i, i]
+            h.weight[:] = i
+        box0 = hosts[0].box
+        more = [self.HostKlass() for i in xrange(100)]
+        for h in more: h.weight
+        self.failUnless(self.arena.capacity >= 103)
+        for i, h in enumerate(hosts):
+            self.failUnless(allclose(h.box.p0, [i, i]))
+            self.failUnless(allclose(h.weight, [i, i]))
+        self.arena.field('box')[self.arena.rowOf(hosts[0])] = 42.
+        self.failUnless(allclose(box0.p0, [42., 42.]))
+
+    def testGrowthPublishesNothing(self):
+        arena = DataArena.install(NotifyHost)
+        try:
+            hosts = [NotifyHost() for i in xrange(3)]
+            for h in hosts: h.box
+            NotifyBox.changes = 0
+            more = [NotifyHost() for i in xrange(100)]
+            for h in more: h.box
+            self.failUnless(arena.capacity >= 103)
+            self.assertEqual(NotifyBox.changes, 0)
+            hosts[0].box.size = [3., 4.]
+            self.assertEqual(NotifyBox.changes, 1)
+            self.failUnless(allclose(arena.field('box')[arena.rowOf(hosts[0])][1], [3., 4.]))
+        finally:
+            del NotifyHost._data_arena_
+
+    def testRowsReleased(self):
+        h = self.HostKlass(); h.box
+        row = self.arena.rowOf(h)
+        del h; gc.collect()
+        self.assertEqual(len(self.arena), 0)
+        self.failIf(self.arena.aliveMask().any())
+        h2 = self.HostKlass(); h2.box
+        self.assertNotEqual(self.arena.rowOf(h2), row)
+        self.failUnless(allclose(h2.box.size, [1., 2.]))
+
+    def testDeadHostViewsNotAliased(self):
+        a = self.HostKlass()
+        kept = a.box; keptWeight = a.weight
+        kept.size = [3., 4.]
+        del a; gc.collect()
+        b = self.HostKlass()
+        b.box.pv[:] = 9.
+        b.weight[:] = 9.
+        self.failUnless(allclose(kept.pv, [[0., 0.], [3., 4.]]))
+        self.failUnless(allclose(keptWeight, [0., 0.]))
+
+        self.arena.compact()
+        b.box.pv[:] = 7.
+        self.failUnless(allclose(kept.pv, [[0., 0.], [3., 4.]]))
+
+    def testCompact(self):
+        hosts = [self.HostKlass() for i in xrange(10)]
+        for i, h in enumerate(hosts):
+            h.box.p0 = [i, i]
+            h.weight[:] = i
+        del hosts[::2]; gc.collect()
+        self.assertEqual(len(self.arena), 5)
+        self.assertEqual(len(self.arena.field('box')), 10)
+
+        box1 = hosts[0].box
+        self.arena.compact()
+        self.assertEqual(len(self.arena.field('box')), 5)
+        self.failUnless(self.arena.aliveMask().all())
+        self.assertEqual([r for r, h in self.arena.hosts()], range(5))
+        for i, h in zip(xrange(1, 10, 2), hosts):
+            self.failUnless(allclose(h.box.p0, [i, i]))
+            self.failUnless(allclose(h.weight, [i, i]))
+
+        # Box values are rebound in place and keep viewing their host's row
+        self.arena.field('box')[self.arena.rowOf(hosts[0])] = 42.
+        self.failUnless(allclose(box1.p0, [42., 42.]))
+
+        h = self.HostKlass(); h.box
+        self.assertEqual(self.arena.rowOf(h), 5)
+
+class TestSlotDataArena(TestDataArena):
+    HostKlass = SlotArenaHost
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2010  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the MIT style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+import numpy
+from numpy import allclose
+from TG.geomath.data.matrix import MatrixStack
+from TG.geomath.data.box import Box
+from TG.geomath.data.boxArray import BoxArray
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def translation(tx, ty, tz=0.):
+    m = numpy.identity(4)
+    m[:3, 3] = [tx, ty, tz]
+    return m
+
+def rotationZ(a):
+    c = numpy.cos(numpy.radians(a)); s = numpy.sin(numpy.radians(a))
+    m = numpy.identity(4)
+    m[:2, :2] = [[c, -s], [s, c]]
+    return m
+
+class TestMatrixStack(unittest.TestCase):
+    def testStorage(self):
+        ms = MatrixStack()
+        self.assertEqual(ms.topArray.dtype, numpy.float32)
+        self.failUnless(allclose(ms.top, numpy.identity(4)))
+        top = ms.topArray
+        ms.translate(1., 2.).scale(2., 3.)
+        self.failUnless(ms.topArray is not top and numpy.may_share_memory(ms.topArray, top))
+        self.failUnless(allclose(top, numpy.dot(translation(1., 2.), numpy.diag([2., 3., 1., 1.]))))
+
+    def testCompose(self):
+        ms = MatrixStack()
+        ms.translate(5., 1.).rotate(30).scale(2., 2., 2.).translate(0., 0., 1.)
+        expected = translation(5., 1.)
+        expected = numpy.dot(expected, rotationZ(30))
+        expected = numpy.dot(expected, numpy.diag([2., 2., 2., 1.]))
+        expected = numpy.dot(expected, translation(0., 0., 1.))
+        self.failUnless(allclose(ms.top, expected, atol=1e-6))
+
+    def testMatrixCompatible(self):
+        ms = MatrixStack()
+        ms.top *= translation(1., 2.)
+        ms.top *= rotationZ(90)
+        self.failUnless(allclose(ms.topArray, numpy.dot(translation(1., 2.), rotationZ(90)), atol=1e-6))
+        self.failUnless(allclose(ms.top * numpy.matrix([[1.], [0.], [0.], [1.]]), [[1.], [3.], [0.], [1.]], atol=1e-6))
+
+    def testPushPop(self):
+        ms = MatrixStack()
+        ms.translate(1., 1.)
+        for i in xrange(100):
+            ms.push().translate(1., 0.)
+        self.failUnless(allclose(ms.top, translation(101., 1.)))
+        for i in xrange(100):
+            ms.pop()
+        self.failUnless(allclose(ms.top, translation(1., 1.)))
+        self.assertRaises(IndexError, ms.pop)
+
+    def testChangeStack(self):
+        ms = MatrixStack()
+        ms.translate(1., 0.)
+        ms.changeStack('proj')
+        self.failUnless(allclose(ms.top, numpy.identity(4)))
+        ms.ortho(0., 10., 0., 10., -1., 1.)
+        ms.changeStack(None)
+        self.failUnless(allclose(ms.top, translation(1., 0.)))
+
+    def testTransformPoints(self):
+        ms = MatrixStack()
+        ms.translate(1., 2., 3.).rotate(90)
+        pts = numpy.array([[1., 0.], [0., 1.], [2., 2.]])
+        self.failUnless(allclose(ms.transformPoints(pts), [[1., 3.], [0., 2.], [-1., 4.]], atol=1e-6))
+        pts3 = numpy.array([[1., 0., 1.], [0., 1., -1.]])
+        self.failUnless(allclose(ms.transformPoints(pts3), [[1., 3., 4.], [0., 2., 2.]], atol=1e-6))
+
+        out = numpy.zeros((3, 2), 'f')
+        r = ms.transformPoints(pts, out)
+        self.failUnless(r is out)
+        self.failUnless(allclose(out, [[1., 3.], [0., 2.], [-1., 4.]], atol=1e-6))
+
+        ms.transformPoints(pts, pts)
+        self.failUnless(allclose(pts, [[1., 3.], [0., 2.], [-1., 4.]], atol=1e-6))
+
+    def testTransformPointsProjective(self):
+        ms = MatrixStack()
+        m = numpy.identity(4); m[3, 0] = 1.
+        ms.top = m
+        self.failUnless(allclose(ms.transformPoints([[1., 2.], [3., 4.]]), [[.5, 1.], [.75, 1.]]))
+
+    def testTransformBoxes(self):
+        ms = MatrixStack()
+        boxes = BoxArray.fromArray(numpy.array([[[0., 0.], [2., 1.]], [[1., 1.], [3., 4.]]]))
+        ms.translate(10., 0.).scale(-1., 2.)
+        r = ms.transformBoxes(boxes)
+        self.failUnless(isinstance(r, BoxArray))
+        self.failUnless(allclose(r.getDataRef(), [[[8., 0.], [10., 2.]], [[7., 2.], [9., 8.]]]))
+
+        ms.identity().rotate(90)
+        r = ms.transformBoxes(Box([1., 1.], [3., 2.]))
+        self.failUnless(isinstance(r, Box))
+        self.failUnless(allclose(r.getDataRef(), [[-2., 1.], [-1., 3.]], atol=1e-6))
+
+        out = numpy.zeros((2, 2, 2), 'f')
+        ms.identity().rotate(45)
+        ms.transformBoxes(boxes.getDataRef(), out)
+        d = numpy.sqrt(.5)
+        self.failUnless(allclose(out[0], [[-d, 0.], [2*d, 3*d]], atol=1e-6))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
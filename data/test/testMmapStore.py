@@ -0,0 +1,137 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import os
+import sys
+import json
+import struct
+import shutil
+import tempfile
+import unittest
+
+import numpy
+from numpy import allclose
+
+from TG.geomath.data.box import Box, CenterBox
+from TG.geomath.data.boxArray import BoxArray
+from TG.geomath.data.vector import Vector
+from TG.geomath.data.color import ColorVector
+from TG.geomath.data import mmapStore
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestMmapStore(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def filename(self, name):
+        return os.path.join(self.path, name)
+
+    def testVector(self):
+        v = Vector(numpy.random.uniform(0, 1, (100, 3)), 'f')
+        header = mmapStore.save(self.filename('v.geo'), v)
+        self.assertEqual(header['offset'] % mmapStore.payloadAlignment, 0)
+
+        r = mmapStore.load(self.filename('v.geo'))
+        self.failUnless(isinstance(r, Vector))
+        self.assertEqual(r.dtype, numpy.dtype('f'))
+        self.failUnless((r == v).all())
+        self.failIf(r.flags.writeable)
+
+    def testColor(self):
+        c = ColorVector.fromHex('#ff8000; #00ff00')
+        mmapStore.save(self.filename('c.geo'), c)
+        r = mmapStore.load(self.filename('c.geo'))
+        self.failUnless(isinstance(r, ColorVector))
+        self.assertEqual(r.tohex().tolist(), c.tohex().tolist())
+
+    def testBoxes(self):
+        mmapStore.save(self.filename('b.geo'), CenterBox.fromSize((4., 2.)))
+        r = mmapStore.load(self.filename('b.geo'))
+        self.failUnless(isinstance(r, CenterBox))
+        self.failUnless(allclose(r.size, [4., 2.]))
+
+        boxes = [Box.fromPosSize((i, i), (1., 2.)) for i in xrange(5)]
+        mmapStore.save(self.filename('ba.geo'), boxes)
+        r = mmapStore.load(self.filename('ba.geo'))
+        self.failUnless(isinstance(r, BoxArray))
+        self.assertEqual(len(r), 5)
+        self.failUnless(allclose(r.p0[:, 0], range(5)))
+
+    def testWriteThrough(self):
+        fn = self.filename('w.geo')
+        ba = mmapStore.create(fn, BoxArray, (10, 2, 2), 'f')
+        ba.p1 = [3., 4.]
+        ba.offset(numpy.arange(20).reshape(10, 2))
+        mmapStore.flush(ba)
+        del ba
+
+        r = mmapStore.load(fn)
+        self.failUnless(allclose(r.size, [3., 4.]))
+        self.failUnless(allclose(r.p0, numpy.arange(20).reshape(10, 2)))
+
+        c = mmapStore.load(fn, 'c')
+        c.offset(1.)
+        self.failUnless(allclose(mmapStore.load(fn).p0, r.p0))
+
+    def testEmpty(self):
+        mmapStore.save(self.filename('e.geo'), Vector.fromShape((0, 2)))
+        r = mmapStore.load(self.filename('e.geo'))
+        self.assertEqual(r.shape, (0, 2))
+
+    def testBadFile(self):
+        f = open(self.filename('bad.geo'), 'wb')
+        f.write('not geometry')
+        f.close()
+        self.assertRaises(ValueError, mmapStore.load, self.filename('bad.geo'))
+
+    def writeClassHeader(self, name, klassName):
+        header = json.dumps({'class': klassName, 'dtype': '<f8', 'shape': [0, 2], 'offset': 64})
+        f = open(self.filename(name), 'wb')
+        f.write(mmapStore.magic)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        f.close()
+        return self.filename(name)
+
+    def testUntrustedClass(self):
+        self.failIf('this' in sys.modules)
+        fn = self.writeClassHeader('this.geo', 'this:s')
+        self.assertRaises(TypeError, mmapStore.load, fn)
+        self.failIf('this' in sys.modules)
+
+        for name in ['os:system', 'TG.geomath.data.box:asBlend', 'TG.geomath.data.box', 'TG.geomathx:Box']:
+            self.assertRaises(TypeError, mmapStore.classFromName, name)
+        self.failUnless(mmapStore.classFromName('TG.geomath.data.box:CenterBox') is CenterBox)
+        self.failUnless(mmapStore.classFromName('numpy:ndarray') is numpy.ndarray)
+
+    def testRegisterStorable(self):
+        self.assertRaises(TypeError, mmapStore.registerStorable, dict)
+        name = mmapStore.className(numpy.matrix)
+        self.assertRaises(TypeError, mmapStore.classFromName, name)
+        mmapStore.registerStorable(numpy.matrix)
+        try:
+            self.failUnless(mmapStore.classFromName(name) is numpy.matrix)
+        finally:
+            del mmapStore.storableClasses[name]
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
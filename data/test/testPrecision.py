@@ -0,0 +1,95 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+import numpy
+from numpy import allclose
+
+from TG.geomath.data.box import Box
+from TG.geomath.data.boxArray import BoxArray
+from TG.geomath.data.vector import Vector, DataHostObject
+from TG.geomath.data.color import ColorVector
+from TG.geomath.data import precision
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Box32(Box):
+    precision = 'float32'
+
+class Vector16(Vector):
+    precision = 'float16'
+
+class Host(DataHostObject):
+    box = Box.property([1., 2.])
+    weight = Vector.property([0., 0.])
+    count = Vector.property([0, 0], 'i')
+    exact = Vector.property([0., 0.], 'd')
+    exactBox = Box.property([1., 2.], dtype='d')
+    fromArray = Vector.property(numpy.zeros(2, 'd'))
+
+class Host32(Host):
+    precision = 'float32'
+
+class TestPrecision(unittest.TestCase):
+    def tearDown(self):
+        precision.setPrecision('float64')
+
+    def testDefault(self):
+        self.assertEqual(Vector([1., 2.]).dtype, numpy.dtype('d'))
+        self.assertEqual(Box([1., 2.]).dtype, numpy.dtype('d'))
+        self.assertEqual(Vector.default_dtype, numpy.dtype('d'))
+
+    def testGlobal(self):
+        previous = precision.setPrecision('float32')
+        self.assertEqual(previous.name, 'float64')
+        self.assertEqual(Vector([1., 2.]).dtype, numpy.dtype('f'))
+        self.assertEqual(Vector.fromShape((3,)).dtype, numpy.dtype('f'))
+        self.assertEqual(Box.fromSize((1., 2.)).dtype, numpy.dtype('f'))
+        self.assertEqual(BoxArray.fromCount(4).dtype, numpy.dtype('f'))
+        self.assertEqual(ColorVector([1., 0., 0., 1.]).dtype, numpy.dtype('f'))
+
+    def testExplicitWins(self):
+        precision.setPrecision('float16')
+        self.assertEqual(Vector([1., 2.], 'd').dtype, numpy.dtype('d'))
+        self.assertEqual(Vector(numpy.zeros(2, 'd')).dtype, numpy.dtype('d'))
+        self.assertEqual(Box([1., 2.], dtype='b').dtype, numpy.dtype('b'))
+        self.assertEqual(Vector([1, 2]).dtype.kind, 'i')
+
+    def testPerClass(self):
+        self.assertEqual(Box32.fromPosSize((0., 0.), (1., 2.)).dtype, numpy.dtype('f'))
+        self.assertEqual(Box.fromPosSize((0., 0.), (1., 2.)).dtype, numpy.dtype('d'))
+        v = Vector16([1., 2.5])
+        self.assertEqual(v.dtype, numpy.dtype('e'))
+        self.assertEqual(v.asCompute().dtype, numpy.dtype('f'))
+        self.failUnless(isinstance(v.asCompute(), Vector16))
+        self.assertEqual(Box32([1., 2.]).computeData().dtype, numpy.dtype('f'))
+
+    def testHostTemplates(self):
+        h = Host(); h32 = Host32()
+        self.assertEqual(h.box.dtype, numpy.dtype('d'))
+        self.assertEqual(h32.box.dtype, numpy.dtype('f'))
+        self.assertEqual(h32.weight.dtype, numpy.dtype('f'))
+        self.assertEqual(h32.count.dtype, numpy.dtype('i'))
+        self.assertEqual(h32.exact.dtype, numpy.dtype('d'))
+        self.assertEqual(h32.exactBox.dtype, numpy.dtype('d'))
+        self.assertEqual(h32.fromArray.dtype, numpy.dtype('d'))
+        self.failUnless(allclose(h32.box.size, [1., 2.]))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
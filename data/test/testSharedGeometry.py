@@ -0,0 +1,90 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import os
+import pickle
+import unittest
+import multiprocessing
+
+import numpy
+from numpy import allclose
+
+from TG.geomath.data.box import Box
+from TG.geomath.data.boxArray import BoxArray
+from TG.geomath.data.vector import Vector
+from TG.geomath.data import sharedGeometry
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def layoutWorker(args):
+    handle, i = args
+    boxes = handle.attach()
+    boxes.box(i).pv = [[i, i], [i+1, i+2]]
+    return i
+
+class TestSharedGeometry(unittest.TestCase):
+    def setUp(self):
+        self.handles = []
+
+    def tearDown(self):
+        for h in self.handles:
+            h.unlink()
+
+    def share(self, obj):
+        h = sharedGeometry.sharedHandleOf(obj)
+        self.handles.append(h)
+        return h
+
+    def testVector(self):
+        v = Vector.fromShape((4, 3), 'f', shared=True)
+        h = self.share(v)
+        self.failUnless(h.filename.startswith(sharedGeometry.sharedDir))
+        self.failUnless((v == 0).all())
+
+        h = pickle.loads(pickle.dumps(h))
+        other = Vector.fromShared(h)
+        other[1] = [1., 2., 3.]
+        self.failUnless(allclose(v[1], [1., 2., 3.]))
+        self.assertEqual(sharedGeometry.sharedHandleOf(v[1:]), h)
+
+    def testShareCopy(self):
+        b = sharedGeometry.shareCopy(Box.fromPosSize((1., 2.), (3., 4.)))
+        h = self.share(b)
+        self.failUnless(isinstance(b, Box))
+        self.failUnless(allclose(Box.fromShared(h).size, [3., 4.]))
+        self.assertRaises(ValueError, sharedGeometry.sharedHandleOf, Box())
+
+    def testUnlink(self):
+        h = self.share(Vector.fromShape((2,), shared=True))
+        h.unlink()
+        self.failIf(os.path.exists(h.filename))
+
+    def testPool(self):
+        boxes = BoxArray.fromCount(8, 2, 'f', shared=True)
+        h = self.share(boxes)
+        pool = multiprocessing.Pool(2)
+        try:
+            pool.map(layoutWorker, [(h, i) for i in xrange(8)])
+        finally:
+            pool.close()
+            pool.join()
+        self.failUnless(allclose(boxes.p0[:, 0], range(8)))
+        self.failUnless(allclose(boxes.size, [1., 2.]))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+from numpy import allclose
+
+from TG.geomath.data.box import Box, SlotBox, SlotCenterBox
+from TG.geomath.data.vector import Vector, SlotDataHostObject
+import testBox
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestSlotBox(testBox.TestBox):
+    Box = SlotBox
+
+    def testNoDict(self):
+        self.failIf(hasattr(self.Box(), '__dict__'))
+        self.failIf(hasattr(SlotCenterBox(), '__dict__'))
+
+    def testCenter(self):
+        b = SlotCenterBox.fromSize((4., 2.))
+        self.failUnless(allclose(b.at[None], [2., 1.]))
+
+class TestSlotBoxGeoXfrm(testBox.TestBoxGeoXfrm):
+    Box = SlotBox
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class SlotHost(SlotDataHostObject):
+    __slots__ = ('name',)
+    box = Box.property([1., 2.], dtype='f')
+    weight = Vector.property([0, 0], 'f')
+
+class SlotHostChild(SlotHost):
+    minSize = Vector.property([3, 4], 'f')
+
+class TestSlotDataHost(unittest.TestCase):
+    def testNoDict(self):
+        self.failIf(hasattr(SlotHost(), '__dict__'))
+        self.failIf(hasattr(SlotHostChild(), '__dict__'))
+
+    def testProperties(self):
+        host = SlotHost()
+        self.failUnless(allclose(host.box.size, [1., 2.]))
+        host.weight = [2., 3.]
+        self.failUnless(allclose(host.weight, [2., 3.]))
+        host.name = 'slotted'
+        self.assertEqual(host.name, 'slotted')
+        self.assertRaises(AttributeError, setattr, host, 'undeclared', 1)
+
+    def testIndependentInstances(self):
+        a = SlotHostChild(); b = SlotHostChild()
+        a.box.size = [5., 5.]
+        a.minSize[:] = 0
+        self.failUnless(allclose(b.box.size, [1., 2.]))
+        self.failUnless(allclose(b.minSize, [3., 4.]))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,135 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+import numpy
+
+from TG.geomath.data import boxQuery
+from TG.geomath.data.spatialIndex import BoxGridIndex, boxDistance
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBoxGridIndex(unittest.TestCase):
+    def setUp(self):
+        rs = numpy.random.RandomState(7)
+        pos = rs.uniform(0, 200, (300, 2))
+        size = rs.uniform(0, 15, (300, 2))
+        self.boxes = numpy.array([pos, pos+size]).transpose(1, 0, 2)
+        self.pts = rs.uniform(-10, 220, (200, 2))
+        self.index = BoxGridIndex.fromBoxes(self.boxes, items=range(300))
+
+    def bruteRect(self, rect, ids=None):
+        if ids is None: ids = numpy.arange(len(self.boxes))
+        mask = boxQuery.boxesOverlapMask([rect], self.boxes[ids])[0]
+        return sorted(ids[mask].tolist())
+
+    def testLen(self):
+        self.assertEqual(len(self.index), 300)
+        self.assertEqual(self.index.itemOf(42), 42)
+
+    def testQueryPoint(self):
+        mask = boxQuery.pointsInBoxesMask(self.pts, self.boxes)
+        for pt, m in zip(self.pts, mask):
+            self.assertEqual(self.index.queryPoint(pt).tolist(), m.nonzero()[0].tolist())
+
+    def testQueryPoints(self):
+        answer = zip(*boxQuery.pointsInBoxes(self.pts, self.boxes))
+        result = zip(*self.index.queryPoints(self.pts))
+        self.assertEqual(sorted(result), sorted(answer))
+
+    def testQueryRect(self):
+        for rect in [[[10., 10.], [30., 50.]], [[-50., -50.], [500., 500.]], [[100., 100.], [100., 100.]]]:
+            self.assertEqual(self.index.queryRect(rect).tolist(), self.bruteRect(rect))
+
+    def testRemoveUpdateInsert(self):
+        index = self.index
+        for boxId in xrange(0, 300, 3):
+            index.remove(boxId)
+        self.assertEqual(len(index), 200)
+        self.assertEqual(index.itemOf(3), None)
+
+        alive = numpy.array([i for i in xrange(300) if i % 3])
+        rect = [[50., 50.], [120., 90.]]
+        self.assertEqual(index.queryRect(rect).tolist(), self.bruteRect(rect, alive))
+
+        self.boxes[1] += 60.
+        index.update(1, self.boxes[1])
+        self.assertEqual(index.queryRect(rect).tolist(), self.bruteRect(rect, alive))
+
+        newId = index.insert([[55., 55.], [56., 56.]], 'new')
+        self.failUnless(newId % 3 == 0)
+        self.failUnless(newId in index.queryPoint([55.5, 55.5]).tolist())
+        self.assertEqual(index.itemOf(newId), 'new')
+
+    def testNearest(self):
+        for pt in self.pts[:50]:
+            dist = boxDistance(pt, self.boxes)
+            boxId, d = self.index.nearest(pt)
+            self.assertAlmostEqual(d, dist.min())
+            self.assertAlmostEqual(dist[boxId], dist.min())
+
+        far = numpy.array([1000., -1000.])
+        boxId, d = self.index.nearest(far)
+        self.assertAlmostEqual(d, boxDistance(far, self.boxes).min())
+
+    def testNearestAfterRemove(self):
+        index = self.index
+        for boxId in xrange(0, 300, 2):
+            index.remove(boxId)
+        alive = numpy.arange(1, 300, 2)
+        for pt in list(self.pts[:20]) + [numpy.array([-500., 800.])]:
+            dist = boxDistance(pt, self.boxes[alive])
+            boxId, d = index.nearest(pt)
+            self.assertAlmostEqual(d, dist.min())
+            self.failUnless(boxId in alive)
+
+    def testLargeBoxes(self):
+        root = [[[-10., -10.], [1000., 1000.]]]
+        boxes = numpy.concatenate([root, self.boxes])
+        index = BoxGridIndex.fromBoxes(boxes)
+        self.assertEqual(index._large, set([0]))
+        self.failIf(any(0 in entry for entry in index._cells.values()))
+
+        mask = boxQuery.pointsInBoxesMask(self.pts, boxes)
+        for pt, m in zip(self.pts[:50], mask):
+            self.assertEqual(index.queryPoint(pt).tolist(), m.nonzero()[0].tolist())
+        answer = zip(*boxQuery.pointsInBoxes(self.pts, boxes))
+        self.assertEqual(sorted(zip(*index.queryPoints(self.pts))), sorted(answer))
+        rect = [[10., 10.], [30., 50.]]
+        self.assertEqual(index.queryRect(rect).tolist(), 
+                sorted(boxQuery.boxesOverlapMask([rect], boxes)[0].nonzero()[0].tolist()))
+        self.assertEqual(index.nearest([2000., 2000.])[0], 0)
+
+        index.update(0, [[0., 0.], [1., 1.]])
+        self.assertEqual(index._large, set())
+        self.failUnless(0 in index.queryPoint([.5, .5]).tolist())
+        index.update(0, root[0])
+        index.remove(0)
+        self.assertEqual(index._large, set())
+        self.failIf(0 in index.queryRect(rect).tolist())
+
+    def testEmpty(self):
+        index = BoxGridIndex(10.)
+        self.assertEqual(index.nearest([0., 0.]), (None, numpy.inf))
+        self.assertEqual(index.queryPoint([0., 0.]).tolist(), [])
+        self.assertEqual(index.queryRect([[0., 0.], [5., 5.]]).tolist(), [])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
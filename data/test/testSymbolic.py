@@ -0,0 +1,270 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+import numpy
+from numpy import allclose
+from TG.geomath.data.box import Box
+from TG.geomath.data.symbolic import sym, Symbol, Operator, evalExpr, compileExpr
+from TG.geomath.data.symbolic import ExprEvaluator, ExprSimplifier, simplifyExpr, exprNodeCounts
+from TG.geomath.data.symbolic import evalExprBatch, IncrementalEvaluator
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def symbolicBox():
+    return Box(numpy.array([[sym.l, sym.b], [sym.r, sym.t]]))
+
+boxValues = dict(l=1., b=2., r=5., t=10.)
+
+class TestExprCompiler(unittest.TestCase):
+    def testOperators(self):
+        x = sym.x; y = sym.y
+        values = dict(x=7, y=3)
+        for expr in [x+y, x-y, x*y, x%y, x/y, x//y, x**y, -x, +x, abs(-x),
+                Operator('/!', x, y), Operator('pow', x, y, 5), (x+y)*(x-2)/y + 1.5]:
+            self.assertEqual(compileExpr(expr)(values), evalExpr(expr, values))
+
+    def testSharedOperators(self):
+        s = sym.x + sym.y
+        expr = s*s + s
+        compiled = compileExpr(expr)
+        self.assertEqual(compiled.source.count('(x + y)'), 1)
+        self.assertEqual(compiled(x=2, y=3), 30)
+        self.assertEqual(compiled.fn(2, 3), 30)
+        self.assertEqual(compiled.fn(y=3, x=2), 30)
+
+    def testUnbound(self):
+        expr = sym.x*sym.y + 2
+        self.assertEqual(repr(compileExpr(expr)(x=3)), repr(evalExpr(expr, x=3)))
+
+    def testCached(self):
+        expr = sym.x*sym.y
+        self.failUnless(compileExpr(expr) is compileExpr(expr))
+        self.failUnless(expr.compile() is compileExpr(expr))
+        self.failIf(compileExpr(sym.x*sym.y) is compileExpr(expr))
+
+    def testSymbolNames(self):
+        expr = Symbol('a b') + Symbol('if')*sym.abs
+        compiled = compileExpr(expr)
+        self.assertEqual(compiled.symbols, ('a b', 'if', 'abs'))
+        self.assertEqual(compiled({'a b': 1, 'if': 2, 'abs': 3}), 7)
+
+        expr = Symbol('None') + 2*Symbol('True') + 3*Symbol('False')
+        compiled = compileExpr(expr)
+        self.assertEqual(compiled.symbols, ('None', 'True', 'False'))
+        self.assertEqual(compiled({'None': 1, 'True': 2, 'False': 3}), 14)
+        self.assertEqual(Symbol('None').compile()({'None': 5}), 5)
+
+    def testBoxExpressions(self):
+        box = symbolicBox()
+        compiled = compileExpr(box.at[sym.a])
+        self.failUnless(allclose(compiled(boxValues, a=.5), [3., 6.]))
+        self.failUnless(allclose(compileExpr(box.size)(boxValues), [4., 8.]))
+        self.failUnless(allclose(compileExpr(box.pv)(boxValues), [[1., 2.], [5., 10.]]))
+
+    def testArrayBindings(self):
+        compiled = compileExpr(sym.x*2 + sym.y)
+        self.failUnless(allclose(compiled(x=numpy.arange(3.), y=1.), [1., 3., 5.]))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestExprSimplifier(unittest.TestCase):
+    def testHashConsing(self):
+        a = (sym.x + sym.y) * 2
+        b = (sym.x + sym.y) * 2
+        r = simplifyExpr([a, b, a + b])
+        self.failUnless(r[0] is r[1])
+        self.failUnless(r[2].operands[0] is r[0] and r[2].operands[1] is r[0])
+        self.assertEqual(exprNodeCounts([a, b, a + b]), (9, 5))
+        self.assertEqual(exprNodeCounts(r), (9, 3))
+
+    def testConstantFolding(self):
+        x = sym.x
+        self.assertEqual(simplifyExpr(Operator('+', 2, 3) * Operator('*', 4, .5)), 10.)
+        self.assertEqual(repr(simplifyExpr(Operator('*', Operator('-', 3, 2), x))), 'x')
+        self.assertEqual(repr(simplifyExpr(Operator('+', x, Operator('-', 1, 1)))), 'x')
+        self.assertEqual(repr(simplifyExpr(Operator('**', x, Operator('-', 2, 2)))), '1')
+        self.assertEqual(repr(simplifyExpr(-(-x))), 'x')
+        # errors are left for evaluation time
+        self.assertEqual(repr(simplifyExpr(Operator('/', 1, 0) + x)), '((1 / 0) + x)')
+
+    def testStats(self):
+        box = symbolicBox()
+        box.setWidth(sym.w, sym.p)
+        expr = list(box.pv.flat) + list(box.at[sym.a]) + [Operator('+', sym.w, 0) * (sym.h * Operator('+', 1, 1))]
+        simplifier = ExprSimplifier()
+        r = simplifier.simplify(expr)
+        stats = simplifier.stats
+        self.failUnless(stats['sharedNodes'] < stats['uniqueNodes'] <= stats['nodes'])
+        self.assertEqual(stats['folded'], 2)
+        self.assertEqual((stats['simplifiedNodes'], stats['sharedNodes']), exprNodeCounts(r))
+
+        values = dict(boxValues, w=3., p=.25, a=.5, h=2.)
+        self.failUnless(allclose(evalExpr(r, values), evalExpr(expr, values)))
+        self.failUnless(allclose(compileExpr(expr)(values), evalExpr(expr, values)))
+
+    def testSymbolicArray(self):
+        box = symbolicBox()
+        r = simplifyExpr(box.size)
+        self.assertEqual(r.shape, box.size.shape)
+        self.assertEqual(repr(r), repr(box.size))
+
+    def testEvaluatorSharing(self):
+        calls = []
+        class CountingEvaluator(ExprEvaluator):
+            def visitOperator(self, operator):
+                calls.append(operator)
+                return ExprEvaluator.visitOperator(self, operator)
+        s = simplifyExpr(sym.x + sym.y)
+        expr = s * s * s
+        self.assertEqual(CountingEvaluator.evaluate(expr, x=1, y=2), 27)
+        self.assertEqual(len([c for c in calls if c is s]), 3)
+        evaluator = CountingEvaluator(x=1, y=2)
+        self.assertEqual(evaluator(expr), 27)
+        self.assertEqual(evaluator(expr, x=2), 64)
+
+    def testEvaluatorValuesDict(self):
+        e = simplifyExpr(sym.x + 1)
+        evaluator = ExprEvaluator(x=1)
+        self.assertEqual(evaluator(e), 2)
+        evaluator.values['x'] = 5
+        self.assertEqual(evaluator(e), 6)
+        self.assertEqual(evaluator._memo, None)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBatchEval(unittest.TestCase):
+    def testScalar(self):
+        expr = sym.x*2 + sym.y
+        r = evalExprBatch(expr, x=numpy.arange(5.), y=1.)
+        self.failUnless(allclose(r, [1., 3., 5., 7., 9.]))
+        r = evalExprBatch(expr, x=[1., 2.], y=[[0.], [10.]])
+        self.failUnless(allclose(r, [[2., 4.], [12., 14.]]))
+
+    def testBoxSweep(self):
+        box = symbolicBox()
+        box.setWidth(sym.w, .5)
+        compiled = compileExpr(box.pv)
+        w = numpy.linspace(10., 100., 7)
+        r = compiled.batch(boxValues, w=w)
+        self.assertEqual(r.shape, (7, 2, 2))
+        for i, wi in enumerate(w):
+            self.failUnless(allclose(r[i], compiled(boxValues, w=wi)))
+
+    def testConstantElements(self):
+        compiled = compileExpr([sym.x, 2., sym.x*sym.y])
+        r = compiled.batch(x=numpy.arange(3.), y=2.)
+        self.failUnless(allclose(r, [[0., 2., 0.], [1., 2., 2.], [2., 2., 4.]]))
+        r = compiled.batch(x=1., y=2.)
+        self.failUnless(allclose(r, [1., 2., 2.]))
+
+    def testNestedLists(self):
+        x = sym.x
+        compiled = compileExpr([[x, x*2], [x, 1.]])
+        self.assertEqual(compiled.shape, (2, 2))
+        xs = numpy.arange(3.)
+        r = compiled.batch(x=xs)
+        self.assertEqual(r.shape, (3, 2, 2))
+        for i, xi in enumerate(xs):
+            self.failUnless(allclose(r[i], compiled(x=xi)))
+
+        box = symbolicBox()
+        compiled = compileExpr([box.pv, box.pv*2])
+        self.assertEqual(compiled.shape, (2, 2, 2))
+        r = compiled.batch(boxValues, l=numpy.array([0., 3.]))
+        self.assertEqual(r.shape, (2, 2, 2, 2))
+        self.failUnless(allclose(r[1], compiled(boxValues, l=3.)))
+
+    def testRaggedLists(self):
+        compiled = compileExpr([[sym.x, 1.], [sym.x]])
+        self.assertEqual(compiled.shape, None)
+        self.assertEqual(compiled(x=2.), [[2., 1.], [2.]])
+        self.assertRaises(ValueError, compiled.batch, x=numpy.arange(3.))
+
+    def testConstantExpression(self):
+        box = Box(numpy.array([[sym.l, 0.], [sym.r, 5.]], 'object'))
+        r = compileExpr(box.size).batch(l=numpy.zeros(3), r=numpy.arange(3.))
+        self.failUnless(allclose(r, [[0., 5.], [1., 5.], [2., 5.]]))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestIncrementalEvaluator(unittest.TestCase):
+    def layoutExpr(self):
+        box = symbolicBox()
+        box.setWidth(sym.w, sym.p)
+        box.setHeight(sym.h, .5)
+        return box.pv
+
+    def testUpdate(self):
+        expr = self.layoutExpr()
+        values = dict(boxValues, w=3., p=.25, h=2.)
+        compiled = compileExpr(expr)
+        ie = IncrementalEvaluator(expr, values)
+        self.failUnless(allclose(ie.result(), compiled(values)))
+        self.assertEqual(ie.stats, dict(recomputed=len(ie), reused=0))
+
+        for w in [4., 5., 6.]:
+            values['w'] = w
+            self.failUnless(allclose(ie.update(w=w), compiled(values)))
+        values.update(p=.75, t=20.)
+        self.failUnless(allclose(ie.update(p=.75, t=20.), compiled(values)))
+
+    def testRecomputesAffectedOnly(self):
+        w = sym.w; h = sym.h
+        widthTerm = (w*2 + 1)*3
+        heightTerm = (h*2 + 1)*3
+        shared = widthTerm * heightTerm
+        expr = [shared + 1, shared * widthTerm, heightTerm]
+
+        ie = IncrementalEvaluator(expr, w=1., h=2.)
+        self.assertEqual(len(ie), 9)
+        self.assertEqual(ie.dependencies(widthTerm), frozenset(['w']))
+        self.assertEqual(ie.dependencies(shared), frozenset(['w', 'h']))
+
+        self.assertEqual(ie.update(w=2.), [(5*3)*(5*3) + 1, (5*3)*(5*3)*(5*3), 15.])
+        self.assertEqual(ie.stats, dict(recomputed=6, reused=3))
+        ie.update(w=2., h=2.)
+        self.assertEqual(ie.stats, dict(recomputed=0, reused=9))
+        ie.update(h=3.)
+        self.assertEqual(ie.stats, dict(recomputed=6, reused=3))
+        self.assertEqual(ie.totals, dict(recomputed=21, reused=15))
+
+    def testUnbound(self):
+        ie = IncrementalEvaluator(sym.x*sym.y + 1, x=2)
+        self.assertEqual(repr(ie.result()), repr(evalExpr(sym.x*sym.y + 1, x=2)))
+        self.assertEqual(ie.update(y=3), 7)
+
+    def testNumberTypeChange(self):
+        ie = IncrementalEvaluator(sym.x/2, x=3)
+        self.assertEqual(ie.result(), 1)
+        self.assertEqual(ie.update(x=3.0), 1.5)
+        self.assertEqual(ie.stats['recomputed'], 1)
+        self.assertEqual(ie.update(x=3.0), 1.5)
+        self.assertEqual(ie.stats['recomputed'], 0)
+
+    def testInvalidate(self):
+        x = numpy.arange(3.)
+        ie = IncrementalEvaluator(sym.x*2, x=x)
+        x[:] = 1.
+        self.failUnless(allclose(ie.update(x=x), [0., 2., 4.]))
+        self.failUnless(allclose(ie.invalidate('x'), [2., 2., 2.]))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
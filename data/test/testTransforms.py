@@ -0,0 +1,107 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2010  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the MIT style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+import numpy
+from numpy import allclose
+from TG.geomath.data.matrix import MatrixStack
+from TG.geomath.data.transforms import Affine2D, Quaternion, RigidTransform
+from TG.geomath.data.boxArray import BoxArray
+from TG.geomath.data.vector import Vector
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestAffine2D(unittest.TestCase):
+    def build(self, target):
+        return target.translate(3., -1.).rotate(30).scale(2., .5).translate(1., 1.).rotate(-75)
+
+    def testMatchesMatrixStack(self):
+        xf = self.build(Affine2D())
+        ms = self.build(MatrixStack())
+        self.failUnless(allclose(xf.toMatrix(), ms.topArray, atol=1e-5))
+        self.failUnless(allclose(Affine2D.fromMatrix(ms.top).toMatrix(), ms.topArray, atol=1e-5))
+
+    def testComposeInverse(self):
+        a = self.build(Affine2D())
+        b = Affine2D.fromRotate(40).translate(2., 3.)
+        self.failUnless(allclose((a*b).toMatrix('d'), numpy.dot(a.toMatrix('d'), b.toMatrix('d'))))
+        self.failUnless(allclose((a*a.inverse()).toMatrix(), numpy.identity(4), atol=1e-6))
+        self.assertRaises(ZeroDivisionError, Affine2D.fromScale(0., 1.).inverse)
+
+    def testTransformPoints(self):
+        xf = self.build(Affine2D())
+        pts = Vector.fromData(numpy.random.uniform(-10, 10, (50, 2)))
+        ms = self.build(MatrixStack())
+        self.failUnless(allclose(xf.transformPoints(pts), ms.transformPoints(pts), atol=1e-4))
+        out = numpy.empty((50, 2))
+        self.failUnless(xf.transformPoints(pts, out) is out)
+
+    def testTransformBoxes(self):
+        boxes = BoxArray.fromArray(numpy.array([[[0., 0.], [2., 1.]], [[1., 1.], [3., 4.]]]))
+        r = Affine2D.fromRotate(90).transformBoxes(boxes)
+        self.failUnless(isinstance(r, BoxArray))
+        self.failUnless(allclose(r.getDataRef(), [[[-1., 0.], [0., 2.]], [[-4., 1.], [-1., 3.]]], atol=1e-6))
+
+    def testMatrixStackInterop(self):
+        ms = MatrixStack()
+        ms.translate(1., 2., 3.).push()
+        ms.multTransform(Affine2D.fromRotate(90).translate(1., 0.))
+        expected = MatrixStack().translate(1., 2., 3.).rotate(90).translate(1., 0.)
+        self.failUnless(allclose(ms.topArray, expected.topArray, atol=1e-6))
+        ms.pop()
+        self.failUnless(allclose(ms.topArray, MatrixStack().translate(1., 2., 3.).topArray))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestQuaternion(unittest.TestCase):
+    def testMatchesRotate(self):
+        for args in [(30, 0, 0, 1), (45, 0, 1, 0), (60, 1, 0, 0), (-100, .6, .8, 0)]:
+            q = Quaternion.fromRotate(*args)
+            self.failUnless(allclose(q.toMatrix(), MatrixStack().rotate(*args).topArray, atol=1e-6))
+            self.failUnless(allclose(Quaternion.fromMatrix(q.toMatrix('d')).toMatrix(), q.toMatrix(), atol=1e-6))
+
+    def testCompose(self):
+        a = Quaternion.fromRotate(30, 1, 0, 0)
+        b = Quaternion.fromRotate(70, 0, 1, 1)
+        self.failUnless(allclose((a*b).toMatrix('d'), numpy.dot(a.toMatrix('d'), b.toMatrix('d'))))
+        self.failUnless(allclose((a*a.inverse()).coefficients(), [1., 0., 0., 0.]))
+        self.failUnless(allclose(a.copy().rotate(70, 0, 1, 1).coefficients(), (a*b).coefficients()))
+
+    def testSlerp(self):
+        a = Quaternion.fromRotate(0, 0, 0, 1)
+        b = Quaternion.fromRotate(90, 0, 0, 1)
+        self.failUnless(allclose(a.slerp(b, .5).coefficients(), Quaternion.fromRotate(45).coefficients()))
+        self.failUnless(allclose(a.slerp(b, 1.).coefficients(), b.coefficients()))
+
+    def testRigid(self):
+        rt = RigidTransform(Quaternion.fromRotate(90, 0, 0, 1), (1., 2., 3.)).translate(1., 0., 0.).rotate(90, 1, 0, 0)
+        ms = MatrixStack().translate(1., 2., 3.).rotate(90).translate(1., 0., 0.).rotate(90, 1, 0, 0)
+        self.failUnless(allclose(rt.toMatrix(), ms.topArray, atol=1e-6))
+
+        pts = numpy.random.uniform(-5, 5, (20, 3))
+        self.failUnless(allclose(rt.transformPoints(pts), ms.transformPoints(pts), atol=1e-5))
+        self.failUnless(allclose(rt.inverse().transformPoints(rt.transformPoints(pts)), pts, atol=1e-5))
+        self.failUnless(allclose((rt*rt.inverse()).toMatrix(), numpy.identity(4), atol=1e-6))
+
+        ms2 = MatrixStack().multTransform(rt)
+        self.failUnless(allclose(ms2.topArray, ms.topArray, atol=1e-6))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+import numpy
+from TG.geomath.data import bezier
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def timeSingle(order, count=20000, nu=16):
+    bm = bezier.Bezier.order[order]
+    u = numpy.linspace(0, 1, nu)
+    cpts = numpy.random.uniform(0, 100, (count, order+1, 2))
+    t0 = time.time()
+    for c in cpts:
+        bm.at(c, u)
+    t1 = time.time()
+    print '  single  order %d, %2d samples: %1.6fs, %10.0f curves/s' % (order, nu, (t1-t0), count/(t1-t0))
+
+def timeBatched(order, count, nu=16, repeat=5):
+    u = numpy.linspace(0, 1, nu)
+    cpts = numpy.random.uniform(0, 100, (count, order+1, 2))
+    out = numpy.empty((count, nu, 2))
+    t0 = time.time()
+    for x in xrange(repeat):
+        bezier.evalCurves(cpts, u, out)
+    t1 = time.time()
+    dt = (t1-t0)/repeat
+    print '  batched order %d, %2d samples, %7d curves: %1.6fs, %10.0f curves/s' % (order, nu, count, dt, count/dt)
+
+def timeFlatten(order, count, tolerance, size=500., repeat=3):
+    cpts = numpy.random.uniform(0, size, (count, order+1, 2))
+    out = numpy.empty((count*256, 2))
+    t0 = time.time()
+    for x in xrange(repeat):
+        vertices, offsets = bezier.flattenCurves(cpts, tolerance, out=out)
+    t1 = time.time()
+    dt = (t1-t0)/repeat
+    print '  flatten order %d, tolerance %1.2f, %7d curves: %1.6fs, %10.0f curves/s, %6.1f vertices/curve' % (
+            order, tolerance, count, dt, count/dt, len(vertices)/float(count))
+
+def timeArcLength(count, resolution, nq=1000, repeat=3):
+    cpts = numpy.random.uniform(0, 500, (count, 4, 2))
+    t0 = time.time()
+    table = bezier.ArcLengthTable(cpts, resolution)
+    t1 = time.time()
+    s = numpy.random.uniform(0, 1, (count, nq//count or 1))
+    for x in xrange(repeat):
+        table.uAt(s)
+    t2 = time.time()
+    dq = (t2-t1)/repeat
+    print '  arc length %7d curves, resolution %4d: build %1.6fs, %10.0f lookups/s' % (
+            count, resolution, (t1-t0), s.size/dq)
+
+def timeEasing(count=50000):
+    bp = bezier.Bezier('a')
+    uFresh = numpy.random.uniform(0, 1, count).tolist()
+    t0 = time.time()
+    for u in uFresh:
+        bp.atU([u])
+    t1 = time.time()
+    for u in uFresh:
+        bp.atU([.5])
+    t2 = time.time()
+    print '  easing atU([u]) fresh u:    %1.6fs, %8.3f us/op' % ((t1-t0), 1e6*(t1-t0)/count)
+    print '  easing atU([u]) repeated u: %1.6fs, %8.3f us/op' % ((t2-t1), 1e6*(t2-t1)/count)
+
+def timeSampleSet(nu, count=20000):
+    bm = bezier.Bezier.order[3]
+    uFresh = numpy.random.uniform(0, 1, (count, nu))
+    uSame = numpy.linspace(0, 1, nu)
+    t0 = time.time()
+    for u in uFresh:
+        bm.atU(u)
+    t1 = time.time()
+    for x in xrange(count):
+        bm.atU(uSame)
+    t2 = time.time()
+    print '  atU %3d samples, fresh u: %8.3f us/op, repeated u: %8.3f us/op' % (
+            nu, 1e6*(t1-t0)/count, 1e6*(t2-t1)/count)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    print
+    timeEasing()
+    for nu in [1, 4, 16, 64]:
+        timeSampleSet(nu)
+    print
+    for order in [2, 3]:
+        timeSingle(order)
+        for count in [1000, 100000]:
+            timeBatched(order, count)
+        print
+    for order in [2, 3]:
+        for tolerance in [1., .25]:
+            timeFlatten(order, 10000, tolerance)
+        print
+    for count in [1, 10000]:
+        for resolution in [64, 256]:
+            timeArcLength(count, resolution, 100000)
+    print
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+import numpy
+from TG.geomath.data import bicubic
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def loopSpline(av, t):
+    avRes = None
+    for i in xrange(0, len(av)-3):
+        avp = bicubic.p(t, av[i:i+4])
+        if avRes is not None:
+            avRes = numpy.concatenate([avRes, avp], 0)
+        else: avRes = avp
+    return avRes
+
+def timeLoop(n, nt=10):
+    t = numpy.linspace(0, 1, nt)
+    av = numpy.random.uniform(0, 10, (n, 2))
+    t0 = time.time()
+    loopSpline(av, t)
+    t1 = time.time()
+    print '  loop    %7d points: %1.6fs, %10.0f segments/s' % (n, (t1-t0), (n-3)/(t1-t0))
+
+def timeBatched(n, batch=1, nt=10, repeat=5):
+    t = numpy.linspace(0, 1, nt)
+    av = numpy.random.uniform(0, 10, (batch, n, 2))
+    t0 = time.time()
+    for x in xrange(repeat):
+        bicubic.spline(av, t)
+    t1 = time.time()
+    dt = (t1-t0)/repeat
+    print '  batched %7d points x %4d: %1.6fs, %10.0f segments/s' % (n, batch, dt, batch*(n-3)/dt)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    print
+    for n in [100, 2000]:
+        timeLoop(n)
+        timeBatched(n)
+    timeBatched(1000, 100)
+    print
+
+if __name__=='__main__':
+    main()
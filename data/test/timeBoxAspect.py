@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+import numpy
+from TG.geomath.data.box import Box
+from TG.geomath.data.boxArray import BoxArray
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def thumbnailCells(n, cols=200, cellSize=(128., 96.)):
+    idx = numpy.arange(n)
+    pos = numpy.transpose([idx % cols, idx // cols]) * cellSize
+    aspects = numpy.random.uniform(.25, 4., n)
+    return pos, numpy.array(cellSize), aspects
+
+def timeSingle(n, mode):
+    pos, cellSize, aspects = thumbnailCells(n)
+    grow = (mode == 'cover')
+    boxes = [Box.fromPosSize(p, cellSize) for p in pos]
+    t0 = time.time()
+    for box, aspect in zip(boxes, aspects):
+        box.setAspectWith((aspect, grow), box)
+    t1 = time.time()
+    print '  single  %7d %-10s: %1.6fs, %10.0f boxes/s' % (n, mode, (t1-t0), n/(t1-t0))
+
+def timeBatched(n, mode, repeat=5):
+    pos, cellSize, aspects = thumbnailCells(n)
+    cells = BoxArray.fromPosSize(pos, cellSize)
+    t0 = time.time()
+    for x in xrange(repeat):
+        cells.fittedToAspect(aspects, mode)
+    t1 = time.time()
+    dt = (t1-t0)/repeat
+    print '  batched %7d %-10s: %1.6fs, %10.0f boxes/s' % (n, mode, dt, n/dt)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    print
+    print 'Aspect fitting thumbnails into grid cells:'
+    for mode in ['letterbox', 'cover']:
+        timeSingle(20000, mode)
+        for n in [20000, 200000]:
+            timeBatched(n, mode)
+    print
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+import numpy
+from TG.geomath.data.box import Box, SlotBox, AtSyntax, computeBlend
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def timeIt(label, fn, count=50000):
+    t0 = time.time()
+    for x in xrange(count):
+        fn()
+    t1 = time.time()
+    print '  %-36s: %1.6fs, %8.3f us/op' % (label, (t1-t0), 1e6*(t1-t0)/count)
+
+def timeBox(BoxKlass):
+    box = BoxKlass.fromCorners((1., 2.), (4., 8.))
+    bv = BoxKlass(numpy.random.uniform(0, 10, (8, 2, 2)))
+
+    print
+    print '%s:' % (BoxKlass.__name__,)
+    timeIt('fresh AtSyntax [.5]', lambda: AtSyntax(box)[.5])
+    timeIt('at[.5]', lambda: box.at[.5])
+    timeIt('at[(0, 1)]', lambda: box.at[(0, 1)])
+    timeIt('at[(.25, .75)] (uncached rel)', lambda: box.at[(.25, .75)])
+    timeIt('atPos(.5)', lambda: box.atPos(.5))
+    timeIt('computeBlend(.5)', lambda: computeBlend(.5))
+    timeIt('at[.5] = (0, 0)', lambda: box.at.__setitem__(.5, (0., 0.)))
+    timeIt('atAspect[1.5]', lambda: box.atAspect[1.5])
+    timeIt('blendAt[2.5]', lambda: bv.blendAt[2.5])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    for BoxKlass in [Box, SlotBox]:
+        timeBox(BoxKlass)
+    print
+
+if __name__=='__main__':
+    main()
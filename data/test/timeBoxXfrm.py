@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+import numpy
+from TG.geomath.data.box import Box, xfrmTable, xfrmGatherTable
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def timeSingle(key, dim, count=20000):
+    box = Box(numpy.random.uniform(0, 100, (2, dim)))
+    for name, table in [('weighted', xfrmTable), ('gather', xfrmGatherTable)]:
+        t0 = time.time()
+        for x in xrange(count):
+            box.geoXfrm(key, table)
+        t1 = time.time()
+        print '  %-8s single %-10s %dd: %1.6fs, %10.0f boxes/s' % (name, key, dim, (t1-t0), count/(t1-t0))
+
+def timeBatched(key, dim, n, repeat=5):
+    box = Box(numpy.random.uniform(0, 100, (n, 2, dim)).astype('f'))
+    out = numpy.empty((n, 4, dim), 'f')
+    for name, table, kw in [
+            ('weighted', xfrmTable, {}), 
+            ('gather', xfrmGatherTable, {}), 
+            ('weighted', xfrmTable, {'out': out}), 
+            ('gather', xfrmGatherTable, {'out': out})]:
+        t0 = time.time()
+        for x in xrange(repeat):
+            box.geoXfrm(key, table, **kw)
+        t1 = time.time()
+        dt = (t1-t0)/repeat
+        label = name + (kw and ' out' or '')
+        print '  %-12s batch %7d %-10s %dd: %1.6fs, %10.0f boxes/s' % (label, n, key, dim, dt, n/dt)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    print
+    print 'Single box xfrm:'
+    for key, dim in [('quads', 2), ('tristrip', 3)]:
+        timeSingle(key, dim)
+
+    print
+    print 'Batched box xfrm:'
+    for n in [1000, 100000, 1000000]:
+        for key, dim in [('quads', 2), ('tristrip', 3)]:
+            timeBatched(key, dim, n)
+    print
+
+if __name__=='__main__':
+    main()
+
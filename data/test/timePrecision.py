@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+import numpy
+from TG.geomath.data.boxArray import BoxArray
+from TG.geomath.data.vector import Vector
+from TG.geomath.data import precision
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def timeOp(label, policy, n, fn, repeat=5):
+    t0 = time.time()
+    for x in xrange(repeat):
+        fn()
+    t1 = time.time()
+    dt = (t1-t0)/repeat
+    print '  %-8s %-24s: %1.6fs, %10.0f items/s' % (policy, label, dt, n/dt)
+
+def timePolicy(policyName, n):
+    precision.setPrecision(policyName)
+    policy = precision.getPrecision()
+    boxes = BoxArray.fromPosSize(numpy.random.uniform(0, 1000, (n, 2)), numpy.random.uniform(1, 100, (n, 2)))
+    pts = Vector(numpy.random.uniform(0, 1000, (n, 2)).tolist())
+    print '  %-8s storage %-8s: boxes %8.1f MB, points %8.1f MB' % (
+            policyName, policy.storage, boxes._data.nbytes/1e6, pts.nbytes/1e6)
+
+    timeOp('box offset', policyName, n, lambda: boxes.offset((1., 1.)))
+    timeOp('box size', policyName, n, lambda: boxes.size)
+    timeOp('box geoXfrm', policyName, n, lambda: boxes.geoXfrm())
+    timeOp('vector scale+add', policyName, n, lambda: pts*2. + pts)
+    timeOp('vector compute scale+add', policyName, n, lambda: pts.asCompute()*2. + pts.asCompute())
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main(n=1000000):
+    previous = precision.getPrecision()
+    try:
+        for policyName in ['float64', 'float32', 'float16']:
+            print
+            timePolicy(policyName, n)
+    finally:
+        precision.setPrecision(previous)
+    print
+
+if __name__=='__main__':
+    main()
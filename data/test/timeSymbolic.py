@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2007  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+import numpy
+from TG.geomath.data.box import Box
+from TG.geomath.data.symbolic import sym, evalExpr, compileExpr, ExprSimplifier, IncrementalEvaluator
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def layoutExpr():
+    """Symbolic layout of a box inset in a window, sized by w and h and placed at a"""
+    box = Box(numpy.array([[sym.l, sym.b], [sym.r, sym.t]]))
+    box.setWidth(sym.w*.5, sym.ax)
+    box.setHeight(sym.h*.25, sym.ay)
+    return list(box.pv.flat) + list(box.at[sym.a]) + list(box.size)
+
+layoutValues = dict(l=0., b=0., r=800., t=600., w=640., h=480., ax=.5, ay=.5, a=.25)
+
+def report(name, count, dt):
+    print '  %-32s %1.6fs, %10.0f evaluations/s' % (name, dt, count/dt)
+
+def timeEval(expr, count=2000):
+    t0 = time.time()
+    for i in xrange(count):
+        evalExpr(expr, layoutValues)
+    report('evalExpr', count, time.time()-t0)
+
+def timeCompiled(expr, count=20000):
+    t0 = time.time()
+    compiled = compileExpr(expr)
+    print '  %-32s %1.6fs' % ('compile', time.time()-t0)
+
+    t0 = time.time()
+    for i in xrange(count):
+        compiled(layoutValues)
+    report('compiled(values)', count, time.time()-t0)
+
+    args = [layoutValues[name] for name in compiled.symbols]
+    fn = compiled.fn
+    t0 = time.time()
+    for i in xrange(count):
+        fn(*args)
+    report('compiled.fn(*args)', count, time.time()-t0)
+
+def timeSimplified(expr, count=2000):
+    simplifier = ExprSimplifier()
+    t0 = time.time()
+    simplified = simplifier.simplify(expr)
+    print '  %-32s %1.6fs' % ('simplify', time.time()-t0)
+    stats = simplifier.stats
+    print '  %-32s %d tree nodes, %d unique -> %d unique, %d folded' % ('nodes',
+            stats['nodes'], stats['uniqueNodes'], stats['sharedNodes'], stats['folded'])
+
+    t0 = time.time()
+    for i in xrange(count):
+        evalExpr(simplified, layoutValues)
+    report('evalExpr simplified', count, time.time()-t0)
+
+def timeBatch(expr, n=10000):
+    compiled = compileExpr(expr)
+    widths = numpy.linspace(100., 1000., n)
+
+    t0 = time.time()
+    values = dict(layoutValues)
+    for w in widths:
+        values['w'] = w
+        compiled(values)
+    report('compiled loop (%d widths)' % n, n, time.time()-t0)
+
+    t0 = time.time()
+    compiled.batch(layoutValues, w=widths)
+    report('compiled.batch (%d widths)' % n, n, time.time()-t0)
+
+def timeIncremental(expr, count=2000):
+    evaluator = IncrementalEvaluator(expr, layoutValues)
+    widths = numpy.linspace(100., 1000., count).tolist()
+
+    t0 = time.time()
+    for w in widths:
+        evaluator.update(w=w)
+    report('incremental update(w=...)', count, time.time()-t0)
+    stats = evaluator.stats
+    print '  %-32s %d recomputed, %d reused per update' % ('nodes', stats['recomputed'], stats['reused'])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    # two independently built copies, as separate constraints on one layout would be
+    expr = layoutExpr() + layoutExpr()
+    print
+    timeEval(expr)
+    timeSimplified(expr)
+    timeCompiled(expr)
+    print
+    timeBatch(expr)
+    timeBatch(expr, 100000)
+    print
+    timeIncremental(expr)
+    timeIncremental(ExprSimplifier.simplifyExpr(expr))
+    print
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2010  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the MIT style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+import numpy
+from TG.geomath.data.matrix import MatrixStack
+from TG.geomath.data.transforms import Affine2D, Quaternion, RigidTransform
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def report(name, count, dt):
+    print '  %-40s %1.6fs, %10.0f ops/s' % (name, dt, count/dt)
+
+def timeCompose2d(count=20000):
+    ms = MatrixStack()
+    t0 = time.time()
+    for i in xrange(count):
+        ms.identity().translate(1., 2.).rotate(10, .0, 1., 0.).scale(1.01, 1.01)
+    report('4x4 translate, rotate (axis), scale', count, time.time()-t0)
+
+    ms = MatrixStack()
+    t0 = time.time()
+    for i in xrange(count):
+        ms.identity().translate(1., 2.).rotate(10).scale(1.01, 1.01)
+    report('4x4 translate, rotate (z), scale', count, time.time()-t0)
+
+    xf = Affine2D()
+    t0 = time.time()
+    for i in xrange(count):
+        xf.identity().translate(1., 2.).rotate(10).scale(1.01, 1.01)
+    report('Affine2D translate, rotate, scale', count, time.time()-t0)
+
+def timeInvert(count=20000):
+    m = MatrixStack().translate(1., 2.).rotate(30).topArray.astype('d')
+    t0 = time.time()
+    for i in xrange(count):
+        numpy.linalg.inv(m)
+    report('4x4 numpy.linalg.inv', count, time.time()-t0)
+
+    xf = Affine2D().translate(1., 2.).rotate(30)
+    t0 = time.time()
+    for i in xrange(count):
+        xf.inverse()
+    report('Affine2D inverse', count, time.time()-t0)
+
+    rt = RigidTransform(Quaternion.fromRotate(30, 1, 1, 0), (1., 2., 3.))
+    t0 = time.time()
+    for i in xrange(count):
+        rt.inverse()
+    report('RigidTransform inverse', count, time.time()-t0)
+
+def timeCompose3d(count=20000):
+    ms = MatrixStack()
+    t0 = time.time()
+    for i in xrange(count):
+        ms.rotate(10, 1., 1., 0.)
+    report('4x4 rotate (axis)', count, time.time()-t0)
+
+    q = Quaternion()
+    t0 = time.time()
+    for i in xrange(count):
+        q.rotate(10, 1., 1., 0.)
+    report('Quaternion rotate', count, time.time()-t0)
+
+def timeApply(n=1000000, repeat=5):
+    pts = numpy.random.uniform(0, 1000, (n, 2)).astype('f')
+    out = numpy.empty_like(pts)
+    ms = MatrixStack().translate(1., 2.).rotate(30)
+    xf = Affine2D().translate(1., 2.).rotate(30)
+
+    t0 = time.time()
+    for i in xrange(repeat):
+        ms.transformPoints(pts, out)
+    report('4x4 transformPoints (%d pts)' % n, n, (time.time()-t0)/repeat)
+
+    t0 = time.time()
+    for i in xrange(repeat):
+        xf.transformPoints(pts, out)
+    report('Affine2D transformPoints (%d pts)' % n, n, (time.time()-t0)/repeat)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    print
+    timeCompose2d()
+    print
+    timeInvert()
+    print
+    timeCompose3d()
+    print
+    timeApply()
+    print
+
+if __name__=='__main__':
+    main()
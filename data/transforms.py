@@ -0,0 +1,342 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2010  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the MIT style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Compact transforms alongside MatrixStack
+
+Affine2D holds the six coefficients of a 2d affine transform, and
+Quaternion and RigidTransform hold 3d rotations and rotation plus
+translation.  Composing and inverting them is plain float arithmetic on a
+handful of values instead of 4x4 products, which is where UI code spends
+its time.  toMatrix() converts to 4x4 for MatrixStack, and
+MatrixStack.multTransform() composes them onto the stack directly.
+
+Composition follows MatrixStack: a.translate(...) and a * b apply the
+right hand transform first.
+"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from math import cos, sin, radians, sqrt, acos
+
+import numpy
+
+from .matrix import transformBoxes
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def _pointsOut(pts, out, dtype=numpy.float32):
+    pts = numpy.asarray(pts)
+    if out is None:
+        out = numpy.empty(pts.shape, numpy.result_type(pts.dtype, dtype))
+    return pts, out
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Affine2D(object):
+    """2d affine transform: x' = a*x + b*y + tx, y' = c*x + d*y + ty"""
+    __slots__ = ('a', 'b', 'c', 'd', 'tx', 'ty')
+
+    def __init__(self, a=1., b=0., c=0., d=1., tx=0., ty=0.):
+        self.a = a; self.b = b; self.tx = tx
+        self.c = c; self.d = d; self.ty = ty
+
+    def __repr__(self):
+        return '<%s [[%r, %r, %r], [%r, %r, %r]]>' % (
+            self.__class__.__name__, self.a, self.b, self.tx, self.c, self.d, self.ty)
+
+    def copy(self):
+        return self.__class__(self.a, self.b, self.c, self.d, self.tx, self.ty)
+
+    def coefficients(self):
+        return (self.a, self.b, self.c, self.d, self.tx, self.ty)
+
+    #~ construction ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    @classmethod
+    def fromTranslate(klass, tx=0., ty=0.):
+        return klass(1., 0., 0., 1., tx, ty)
+    @classmethod
+    def fromScale(klass, sx=1., sy=1.):
+        return klass(sx, 0., 0., sy)
+    @classmethod
+    def fromRotate(klass, a=0.):
+        a = radians(a); ca = cos(a); sa = sin(a)
+        return klass(ca, -sa, sa, ca)
+
+    @classmethod
+    def fromMatrix(klass, m):
+        """Returns the 2d part of a 4x4 or 3x3 matrix, ignoring z"""
+        m = numpy.asarray(m)
+        t = m.shape[-1]-1
+        return klass(float(m[0, 0]), float(m[0, 1]), float(m[1, 0]), float(m[1, 1]), float(m[0, t]), float(m[1, t]))
+
+    def toMatrix(self, dtype=numpy.float32):
+        m = numpy.identity(4, dtype)
+        m[0, 0] = self.a; m[0, 1] = self.b; m[0, 3] = self.tx
+        m[1, 0] = self.c; m[1, 1] = self.d; m[1, 3] = self.ty
+        return m
+
+    def composeOnto(self, m):
+        """Right multiplies the 4x4 array m by this transform in place, touching only its x, y and w columns"""
+        c0 = m[:, 0].copy(); c1 = m[:, 1]
+        m[:, 3] += c0*self.tx + c1*self.ty
+        m[:, 0] = c0*self.a + c1*self.c
+        m[:, 1] = c0*self.b + c1*self.d
+        return m
+
+    #~ in place composition ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def multTransform(self, a, b, c, d, tx, ty):
+        """Right multiplies by the transform with the given coefficients in place"""
+        sa = self.a; sb = self.b; sc = self.c; sd = self.d
+        self.tx += sa*tx + sb*ty
+        self.ty += sc*tx + sd*ty
+        self.a = sa*a + sb*c; self.b = sa*b + sb*d
+        self.c = sc*a + sd*c; self.d = sc*b + sd*d
+        return self
+
+    def identity(self):
+        self.a = 1.; self.b = 0.; self.tx = 0.
+        self.c = 0.; self.d = 1.; self.ty = 0.
+        return self
+
+    def translate(self, tx=0., ty=0.):
+        self.tx += self.a*tx + self.b*ty
+        self.ty += self.c*tx + self.d*ty
+        return self
+
+    def scale(self, sx=1., sy=1.):
+        self.a *= sx; self.c *= sx
+        self.b *= sy; self.d *= sy
+        return self
+
+    def rotate(self, a=0.):
+        a = radians(a); ca = cos(a); sa = sin(a)
+        return self.multTransform(ca, -sa, sa, ca, 0., 0.)
+
+    #~ composition ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def __mul__(self, other):
+        if not isinstance(other, Affine2D):
+            return NotImplemented
+        return self.copy().multTransform(*other.coefficients())
+
+    def determinant(self):
+        return self.a*self.d - self.b*self.c
+
+    def inverse(self):
+        det = self.a*self.d - self.b*self.c
+        if not det:
+            raise ZeroDivisionError("Affine2D transform is singular")
+        a = self.d/det; b = -self.b/det
+        c = -self.c/det; d = self.a/det
+        return self.__class__(a, b, c, d, -(a*self.tx + b*self.ty), -(c*self.tx + d*self.ty))
+
+    #~ batched application ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def transformPoints(self, pts, out=None):
+        """Applies the transform to (..., 2) points, such as a Vector array"""
+        pts, out = _pointsOut(pts, out)
+        numpy.matmul(pts, numpy.array([[self.a, self.c], [self.b, self.d]], out.dtype), out=out)
+        out += numpy.array([self.tx, self.ty], out.dtype)
+        return out
+
+    def transformBoxes(self, boxes, out=None):
+        """Returns the axis aligned bounds of transformed Box, BoxArray or (..., 2, 2) box data"""
+        return transformBoxes(self.toMatrix(), boxes, out)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class Quaternion(object):
+    """Unit quaternion w + xi + yj + zk representing a 3d rotation"""
+    __slots__ = ('w', 'x', 'y', 'z')
+
+    def __init__(self, w=1., x=0., y=0., z=0.):
+        self.w = w; self.x = x; self.y = y; self.z = z
+
+    def __repr__(self):
+        return '<%s (%r, %r, %r, %r)>' % (self.__class__.__name__, self.w, self.x, self.y, self.z)
+
+    def copy(self):
+        return self.__class__(self.w, self.x, self.y, self.z)
+
+    def coefficients(self):
+        return (self.w, self.x, self.y, self.z)
+
+    @classmethod
+    def fromRotate(klass, a=0., vx=0., vy=0., vz=1.):
+        """Rotation of a degrees about the axis (vx, vy, vz), as MatrixStack.rotate"""
+        n = sqrt(vx*vx + vy*vy + vz*vz)
+        if not n:
+            return klass()
+        a = .5*radians(a); s = sin(a)/n
+        return klass(cos(a), vx*s, vy*s, vz*s)
+
+    @classmethod
+    def fromMatrix(klass, m):
+        """Returns the rotation of an orthonormal 3x3 or 4x4 matrix"""
+        m = numpy.asarray(m, 'd')
+        tr = m[0, 0] + m[1, 1] + m[2, 2]
+        if tr > 0:
+            s = 2.*sqrt(tr + 1.)
+            return klass(.25*s, (m[2, 1]-m[1, 2])/s, (m[0, 2]-m[2, 0])/s, (m[1, 0]-m[0, 1])/s)
+
+        i = int(numpy.argmax([m[0, 0], m[1, 1], m[2, 2]]))
+        j = (i+1) % 3; k = (i+2) % 3
+        s = 2.*sqrt(1. + m[i, i] - m[j, j] - m[k, k])
+        v = [0., 0., 0.]
+        v[i] = .25*s
+        v[j] = (m[j, i]+m[i, j])/s
+        v[k] = (m[k, i]+m[i, k])/s
+        return klass((m[k, j]-m[j, k])/s, *v)
+
+    def toMatrix3(self, dtype=numpy.float32):
+        w, x, y, z = self.w, self.x, self.y, self.z
+        return numpy.array([
+            [1.-2.*(y*y+z*z), 2.*(x*y-w*z), 2.*(x*z+w*y)],
+            [2.*(x*y+w*z), 1.-2.*(x*x+z*z), 2.*(y*z-w*x)],
+            [2.*(x*z-w*y), 2.*(y*z+w*x), 1.-2.*(x*x+y*y)]], dtype)
+
+    def toMatrix(self, dtype=numpy.float32):
+        m = numpy.identity(4, dtype)
+        m[:3, :3] = self.toMatrix3(dtype)
+        return m
+
+    #~ composition ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def __mul__(self, other):
+        if not isinstance(other, Quaternion):
+            return NotImplemented
+        aw, ax, ay, az = self.w, self.x, self.y, self.z
+        bw, bx, by, bz = other.w, other.x, other.y, other.z
+        return self.__class__(
+            aw*bw - ax*bx - ay*by - az*bz,
+            aw*bx + ax*bw + ay*bz - az*by,
+            aw*by - ax*bz + ay*bw + az*bx,
+            aw*bz + ax*by - ay*bx + az*bw)
+
+    def rotate(self, a=0., vx=0., vy=0., vz=1.):
+        """Right multiplies by a rotation in place"""
+        q = self * self.fromRotate(a, vx, vy, vz)
+        self.w, self.x, self.y, self.z = q.w, q.x, q.y, q.z
+        return self
+
+    def norm(self):
+        return sqrt(self.w*self.w + self.x*self.x + self.y*self.y + self.z*self.z)
+
+    def normalize(self):
+        n = self.norm()
+        self.w /= n; self.x /= n; self.y /= n; self.z /= n
+        return self
+
+    def conjugate(self):
+        return self.__class__(self.w, -self.x, -self.y, -self.z)
+
+    def inverse(self):
+        n2 = self.w*self.w + self.x*self.x + self.y*self.y + self.z*self.z
+        return self.__class__(self.w/n2, -self.x/n2, -self.y/n2, -self.z/n2)
+
+    def slerp(self, other, u):
+        """Interpolates from self at u=0 to other at u=1 along the shorter arc"""
+        bw, bx, by, bz = other.w, other.x, other.y, other.z
+        dp = self.w*bw + self.x*bx + self.y*by + self.z*bz
+        if dp < 0:
+            dp = -dp; bw = -bw; bx = -bx; by = -by; bz = -bz
+        if dp > 0.9995:
+            r = self.__class__(self.w + u*(bw-self.w), self.x + u*(bx-self.x), self.y + u*(by-self.y), self.z + u*(bz-self.z))
+            return r.normalize()
+        theta = acos(dp); st = sin(theta)
+        k0 = sin((1.-u)*theta)/st; k1 = sin(u*theta)/st
+        return self.__class__(k0*self.w + k1*bw, k0*self.x + k1*bx, k0*self.y + k1*by, k0*self.z + k1*bz)
+
+    def rotateVector(self, v):
+        """Rotates one 3d vector, returning a tuple"""
+        vx, vy, vz = v
+        w, x, y, z = self.w, self.x, self.y, self.z
+        tx = 2.*(y*vz - z*vy); ty = 2.*(z*vx - x*vz); tz = 2.*(x*vy - y*vx)
+        return (vx + w*tx + y*tz - z*ty, vy + w*ty + z*tx - x*tz, vz + w*tz + x*ty - y*tx)
+
+    #~ batched application ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def transformPoints(self, pts, out=None):
+        """Rotates (..., 3) points; (..., 2) points are taken to lie on z=0 and keep x and y"""
+        pts, out = _pointsOut(pts, out)
+        dim = pts.shape[-1]
+        numpy.matmul(pts, self.toMatrix3(out.dtype)[:dim, :dim].T, out=out)
+        return out
+
+    def transformBoxes(self, boxes, out=None):
+        return transformBoxes(self.toMatrix(), boxes, out)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class RigidTransform(object):
+    """Rotation followed by translation: p' = rotation(p) + translation"""
+    __slots__ = ('rotation', 'translation')
+
+    def __init__(self, rotation=None, translation=(0., 0., 0.)):
+        if rotation is None:
+            rotation = Quaternion()
+        self.rotation = rotation
+        self.translation = tuple(float(e) for e in translation)
+
+    def __repr__(self):
+        return '<%s %r %r>' % (self.__class__.__name__, self.rotation, self.translation)
+
+    def copy(self):
+        return self.__class__(self.rotation.copy(), self.translation)
+
+    @classmethod
+    def fromMatrix(klass, m):
+        m = numpy.asarray(m)
+        return klass(Quaternion.fromMatrix(m), m[:3, 3])
+
+    def toMatrix(self, dtype=numpy.float32):
+        m = self.rotation.toMatrix(dtype)
+        m[:3, 3] = self.translation
+        return m
+
+    def __mul__(self, other):
+        if not isinstance(other, RigidTransform):
+            return NotImplemented
+        t = self.rotation.rotateVector(other.translation)
+        t = [t[i] + self.translation[i] for i in xrange(3)]
+        return self.__class__(self.rotation * other.rotation, t)
+
+    def translate(self, tx=0., ty=0., tz=0.):
+        """Right multiplies by a translation in place"""
+        t = self.rotation.rotateVector((tx, ty, tz))
+        self.translation = tuple(t[i] + self.translation[i] for i in xrange(3))
+        return self
+
+    def rotate(self, a=0., vx=0., vy=0., vz=1.):
+        """Right multiplies by a rotation in place"""
+        self.rotation.rotate(a, vx, vy, vz)
+        return self
+
+    def inverse(self):
+        rInv = self.rotation.inverse()
+        t = rInv.rotateVector(self.translation)
+        return self.__class__(rInv, (-t[0], -t[1], -t[2]))
+
+    def transformPoints(self, pts, out=None):
+        pts, out = _pointsOut(pts, out)
+        dim = pts.shape[-1]
+        self.rotation.transformPoints(pts, out)
+        out += numpy.array(self.translation[:dim], out.dtype)
+        return out
+
+    def transformBoxes(self, boxes, out=None):
+        return transformBoxes(self.toMatrix(), boxes, out)
+
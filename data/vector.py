@@ -13,7 +13,9 @@
 import numpy
 from numpy import ndarray as _ndarray, array as _array
 
+from . import SlotDataHostObject
 from .dataDescriptors import dataProperty, DataHostObject
+from .precision import PrecisionDtype, precisionFor
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -45,7 +47,8 @@ class Vector(_ndarray):
     """Uniform data vector"""
 
     __array_priority__ = 20.0
-    default_dtype = numpy.float
+    precision = None # policy name or PrecisionPolicy; None follows the global policy
+    default_dtype = PrecisionDtype()
 
     v0 = VectorItemProperty(numpy.s_[..., 0:1])
     v1 = VectorItemProperty(numpy.s_[..., 1:2])
@@ -85,17 +88,33 @@ class Vector(_ndarray):
     def fromData(klass, data, dtype=None, copy=True, order='C', subok=True, ndmin=1):
         """Semantics of numpy.array"""
         self = _array(data, dtype=dtype, copy=copy, order=order, subok=subok, ndmin=ndmin)
+        if dtype is None and not isinstance(data, _ndarray):
+            self = precisionFor(klass).asStorage(self)
         self = self.view(klass)
         return self
 
     @classmethod
-    def fromShape(klass, shape, dtype=None):
+    def fromShape(klass, shape, dtype=None, shared=False):
+        """With shared=True the vector is zeroed and backed by shared memory; see sharedGeometry"""
+        if shared:
+            from .sharedGeometry import allocShared
+            return allocShared(klass, shape, dtype)
         return klass.__ndnew__(shape, dtype)
 
+    @classmethod
+    def fromShared(klass, handle, mode='r+'):
+        """Attaches a shared vector from its SharedHandle"""
+        from .sharedGeometry import attachShared
+        return numpy.asarray(attachShared(handle, mode)).view(klass)
+
     @classmethod
     def fromBuffer(klass, buffer, offset=0, shape=-1, dtype=None, strides=None, order='C'):
         return klass.__ndnew__(shape, dtype, buffer, offset, strides, order)
 
+    def asCompute(self):
+        """Returns this vector in the compute dtype of its precision policy"""
+        return precisionFor(self).asCompute(self)
+
     _as_parameter_ = property(lambda self: self.ctypes._data)
 Vector.property = classmethod(dataProperty)
 
@@ -14,8 +14,8 @@ import weakref
 import numpy
 
 from TG.metaObserving import OBFactoryMap
-from TG.geomath.data.vector import Vector, DataHostObject
-from TG.geomath.data.box import Box
+from TG.geomath.data.vector import Vector, DataHostObject, SlotDataHostObject
+from TG.geomath.data.box import Box, geoXfrmInto
 from TG.geomath.data.color import Color
 
 from TG.geomath.layouts import AxisLayoutStrategy
@@ -32,7 +32,9 @@ class TextLayoutStrategy(AxisLayoutStrategy):
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-class TextBlockLine(DataHostObject):
+class TextBlockLine(SlotDataHostObject):
+    __slots__ = ('block', 'align', 'slice', 'text', 'maxSort', 'minSize', '_linearOffsetStart')
+
     tbox = Box.property([0.0, 0.0], dtype='f')
     box = Box.property([0.0, 0.0], dtype='f')
 
@@ -86,18 +88,22 @@ class TextBlockLine(DataHostObject):
             align = self.align
             self.box.at[align] = box.at[align]
 
-    def buildSelectionBoxes(self, sel, sorts, xfrm):
+    def selectionBoxData(self, sel, sorts):
         s0 = max(sel.start, self.slice.start)
         s1 = min(sel.stop, self.slice.stop)
         if s1 > s0:
-            subsel = slice(s0, s1)
             asc, dec = self.maxSort['ascenders']
             off0, off1 = sorts['offset'][[s0,s1]]
             p0 = [off0[0][0], dec[0]]
             p1 = [off1[0][0], asc[0]]
-            b = Box(p0, p1)
-            b += self.getOffset(False)
-            return [b.geoXfrm(xfrm)]
+            data = numpy.array([p0, p1], Box.dtype_default)
+            data += self.getOffset(False)
+            return data
+
+    def buildSelectionBoxes(self, sel, sorts, xfrm):
+        data = self.selectionBoxData(sel, sorts)
+        if data is not None:
+            return [Box.fromArray(data).geoXfrm(xfrm)]
         else: return []
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -118,11 +124,26 @@ class TextBlock(DataHostObject):
         self.init(fit, clip)
         self.createArena(pageSize)
 
-    def buildSelectionBoxes(self, sel, xfrm):
+    def selectionBoxData(self, sel):
         sorts = self._sorts
-        r = sum((l.buildSelectionBoxes(sel, sorts, xfrm) for l in self.lines), [])
-        if r: r = numpy.concatenate(r)
-        return r
+        boxData = [l.selectionBoxData(sel, sorts) for l in self.lines]
+        boxData = [bd for bd in boxData if bd is not None]
+        if boxData: 
+            return numpy.array(boxData)
+
+    def buildSelectionBoxes(self, sel, xfrm):
+        boxData = self.selectionBoxData(sel)
+        if boxData is None: 
+            return []
+        r = Box.fromArray(boxData).geoXfrm(xfrm)
+        return r.reshape(-1, r.shape[-1])
+
+    def buildSelectionBoxesInto(self, sel, xfrm, buffer, offset=0):
+        """Writes selection geometry into buffer at vertex offset; returns the next free vertex offset"""
+        boxData = self.selectionBoxData(sel)
+        if boxData is None: 
+            return offset
+        return geoXfrmInto(boxData, buffer, offset, xfrm)
 
     def init(self, fit, clip):
         self.clear()